@@ -1,9 +1,108 @@
 
+import os
+import sys
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
+import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 
+# FileManager (import CSV/TXT) ada di folder NOTHING
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "NOTHING"))
+from filemanager import FileManager
+
+# Label nama hanya digambar di plot jika jumlah titik <= batas ini
+LABEL_THRESHOLD = 200
+
+
+class PointStore:
+    """
+    Penyimpanan titik 2D berbasis array numpy.
+
+    Setiap titik punya id tetap (int) yang juga dipakai sebagai iid baris
+    Treeview. Koordinat disimpan rapat di array (kapasitas tumbuh 2x), dan
+    dict id -> baris membuat tambah/ubah/hapus O(1): hapus memindahkan titik
+    terakhir ke baris yang kosong (swap-remove), sehingga array tidak pernah
+    digeser.
+    """
+
+    def __init__(self, capacity=1024):
+        self.xy = np.empty((capacity, 2), dtype=float)
+        self.ids = np.empty(capacity, dtype=np.int64)
+        self.names = []
+        self.row_of = {}
+        self.count = 0
+        self.next_id = 0
+
+    def __len__(self):
+        return self.count
+
+    def __contains__(self, point_id):
+        return point_id in self.row_of
+
+    @property
+    def coords(self):
+        """View (N, 2) koordinat semua titik (urutan baris internal)."""
+        return self.xy[:self.count]
+
+    def add(self, name, x, y):
+        """Menambah titik; mengembalikan id-nya."""
+        if self.count == len(self.xy):
+            self.xy = np.concatenate((self.xy, np.empty_like(self.xy)))
+            self.ids = np.concatenate((self.ids, np.empty_like(self.ids)))
+        point_id = self.next_id
+        self.next_id += 1
+        row = self.count
+        self.xy[row] = (x, y)
+        self.ids[row] = point_id
+        self.names.append(name)
+        self.row_of[point_id] = row
+        self.count += 1
+        return point_id
+
+    def extend(self, names, xy):
+        """Menambah banyak titik sekaligus (xy: array (m, 2)); mengembalikan array id-nya."""
+        m = len(xy)
+        if self.count + m > len(self.xy):
+            capacity = max(self.count + m, 2 * len(self.xy))
+            self.xy = np.concatenate((self.xy[:self.count], np.empty((capacity - self.count, 2))))
+            self.ids = np.concatenate((self.ids[:self.count], np.empty(capacity - self.count, dtype=np.int64)))
+        rows = np.arange(self.count, self.count + m)
+        ids = np.arange(self.next_id, self.next_id + m)
+        self.xy[rows] = xy
+        self.ids[rows] = ids
+        self.names.extend(names)
+        self.row_of.update(zip(ids.tolist(), rows.tolist()))
+        self.next_id += m
+        self.count += m
+        return ids
+
+    def update(self, point_id, name, x, y):
+        row = self.row_of[point_id]
+        self.xy[row] = (x, y)
+        self.names[row] = name
+
+    def delete(self, point_id):
+        """Menghapus titik dengan swap-remove."""
+        row = self.row_of.pop(point_id)
+        last = self.count - 1
+        if row != last:
+            self.xy[row] = self.xy[last]
+            self.ids[row] = self.ids[last]
+            self.names[row] = self.names[last]
+            self.row_of[int(self.ids[row])] = row
+        self.names.pop()
+        self.count = last
+
+    def get(self, point_id):
+        """(nama, x, y) untuk id."""
+        row = self.row_of[point_id]
+        return self.names[row], float(self.xy[row, 0]), float(self.xy[row, 1])
+
+    def rows_for(self, point_ids):
+        """Array baris untuk daftar id (misalnya urutan baris Treeview)."""
+        return np.fromiter((self.row_of[i] for i in point_ids), dtype=np.int64, count=len(point_ids))
+
 
 class PointApp:
     def __init__(self, master):
@@ -11,16 +110,17 @@ class PointApp:
         master.title("Point Generator (2D)")
         master.geometry("950x650")
 
-        # Data internal: list of tuples (nama, x, y)
-        self.points = []
+        # Data internal: PointStore (id titik = iid baris Treeview)
+        self.points = PointStore()
 
-        # Untuk operasi edit/update
-        self.edit_index = None
-        self.editing_item_id = None
+        # Untuk operasi edit/update: id titik yang sedang diedit
+        self.editing_id = None
 
-        # Menyimpan figure yang sedang ditampilkan (jika ada)
+        # Figure yang sedang ditampilkan (dibuat sekali, lalu diperbarui in place)
         self.current_fig = None
         self.canvas_plot = None
+        self.scatter = None
+        self.texts = {}     # id -> Text label nama (hanya jika titik sedikit)
 
         # -----------------------
         # FRAME INPUT & BUTTONS
@@ -47,6 +147,7 @@ class PointApp:
         self.btn_delete = tk.Button(frame_input, text="Hapus Titik", width=12, command=self.delete_point)
         self.btn_plot = tk.Button(frame_input, text="Tampilkan Grafik", width=14, command=self.plot_points)
         self.btn_save_data = tk.Button(frame_input, text="Save Data", width=10, command=self.save_points)
+        self.btn_load_data = tk.Button(frame_input, text="Load Data", width=10, command=self.load_points)
         self.btn_save_plot = tk.Button(frame_input, text="Save Grafik", width=12, command=self.save_plot)
 
         # Letakkan tombol
@@ -57,6 +158,7 @@ class PointApp:
         self.btn_plot.grid(row=0, column=10, padx=6)
         self.btn_save_data.grid(row=0, column=11, padx=6)
         self.btn_save_plot.grid(row=0, column=12, padx=6)
+        self.btn_load_data.grid(row=0, column=13, padx=6)
 
         # -----------------------
         # FRAME TABEL (TREEVIEW)
@@ -116,13 +218,12 @@ class PointApp:
             messagebox.showerror("Error", "X dan Y harus berupa angka.")
             return
 
-        # Tambah ke data internal
-        self.points.append((nama, x, y))
-
-        # Tambah ke treeview
-        self.tree.insert("", "end", values=(nama, x, y))
+        # Tambah ke data internal dan ke treeview (iid = id titik)
+        point_id = self.points.add(nama, x, y)
+        self.tree.insert("", "end", iid=str(point_id), values=(nama, x, y))
 
-        # Bersihkan entry
+        # Perbarui plot (jika tampil) dan bersihkan entry
+        self.update_plot(changed=point_id)
         self.clear_entries()
 
     # -----------------------
@@ -139,9 +240,8 @@ class PointApp:
             messagebox.showerror("Error", "Baris yang dipilih tidak valid.")
             return
 
-        # Simpan indeks dan item id agar update bisa dilakukan
-        self.edit_index = self.tree.index(selected)
-        self.editing_item_id = selected
+        # Simpan id titik agar update bisa dilakukan
+        self.editing_id = int(selected)
 
         # Isi entries
         self.entry_nama.delete(0, tk.END)
@@ -159,7 +259,7 @@ class PointApp:
     # Fungsi Update Titik
     # -----------------------
     def update_point(self):
-        if self.edit_index is None or self.editing_item_id is None:
+        if self.editing_id is None or self.editing_id not in self.points:
             messagebox.showerror("Error", "Tidak ada titik yang sedang diedit.")
             return
 
@@ -178,16 +278,14 @@ class PointApp:
             messagebox.showerror("Error", "X dan Y harus berupa angka.")
             return
 
-        # Update data internal
-        self.points[self.edit_index] = (nama, x, y)
-
-        # Refresh treeview (lebih sederhana untuk re-render)
-        self.refresh_treeview()
+        # Update data internal, lalu hanya baris itu di treeview dan plot
+        self.points.update(self.editing_id, nama, x, y)
+        self.tree.item(str(self.editing_id), values=(nama, x, y))
+        self.update_plot(changed=self.editing_id)
 
         # Bersihkan entry & reset edit state
         self.clear_entries()
-        self.edit_index = None
-        self.editing_item_id = None
+        self.editing_id = None
         self.btn_update.config(state="disabled")
 
     # -----------------------
@@ -199,21 +297,16 @@ class PointApp:
             messagebox.showerror("Error", "Pilih titik yang ingin dihapus.")
             return
 
-        idx = self.tree.index(selected)
-
-        # Hapus dari internal list
-        try:
-            del self.points[idx]
-        except IndexError:
-            pass
+        point_id = int(selected)
 
-        # Hapus dari treeview
+        # Hapus dari data internal, treeview dan plot
+        self.points.delete(point_id)
         self.tree.delete(selected)
+        self.update_plot(removed=point_id)
 
         # Jika sedang mengedit baris yang sama, batalkan edit
-        if self.editing_item_id == selected:
-            self.edit_index = None
-            self.editing_item_id = None
+        if self.editing_id == point_id:
+            self.editing_id = None
             self.clear_entries()
             self.btn_update.config(state="disabled")
 
@@ -225,30 +318,15 @@ class PointApp:
             messagebox.showerror("Error", "Belum ada titik untuk ditampilkan.")
             return
 
-        # Hapus placeholder atau canvas lama
-        if self.canvas_plot:
-            self.canvas_plot.get_tk_widget().destroy()
-            self.canvas_plot = None
-        else:
-            self.plot_placeholder.destroy()
-
-        # Ambil data
-        x_vals = [p[1] for p in self.points]
-        y_vals = [p[2] for p in self.points]
+        # Figure dibuat sekali; tampil ulang cukup memperbarui scatter yang ada
+        if self.canvas_plot is not None:
+            self.update_plot()
+            return
+        self.plot_placeholder.destroy()
 
-        # Buat figure untuk ditampilkan
         fig, ax = plt.subplots(figsize=(6, 5))
-        ax.scatter(x_vals, y_vals, s=40)
-
-        # Tambahkan label (nama) di tiap titik
-        for nama, x, y in self.points:
-            ax.text(x, y, f" {nama}", fontsize=9, va="bottom", ha="left")
-
-        ax.set_xlabel("X")
-        ax.set_ylabel("Y")
-        ax.set_title("Plot Titik Koordinat 2D")
-        ax.grid(True)
-        ax.axis('equal')  # agar skala X dan Y lebih seragam
+        self.scatter = self.draw_points(ax)
+        self.texts = self.draw_labels(ax)
 
         # Tampilkan di tkinter
         self.current_fig = fig
@@ -256,6 +334,67 @@ class PointApp:
         self.canvas_plot.draw()
         self.canvas_plot.get_tk_widget().pack(fill="both", expand=True)
 
+    def update_plot(self, changed=None, removed=None):
+        """
+        Memperbarui plot yang sudah tampil tanpa membuat figure baru:
+        offset scatter diganti dari array koordinat (tanpa loop Python), dan
+        hanya label titik yang berubah/dihapus yang disentuh.
+        """
+        if self.canvas_plot is None:
+            return
+        ax = self.scatter.axes
+        coords = self.points.coords
+        self.scatter.set_offsets(coords)
+
+        if len(self.points) > LABEL_THRESHOLD:
+            # Terlalu banyak titik untuk label: hapus semua label
+            for text in self.texts.values():
+                text.remove()
+            self.texts = {}
+        elif len(self.texts) < len(self.points) - 1:
+            # Baru kembali di bawah batas: gambar ulang semua label (paling banyak LABEL_THRESHOLD)
+            for text in self.texts.values():
+                text.remove()
+            self.texts = self.draw_labels(ax)
+        else:
+            if removed is not None and removed in self.texts:
+                self.texts.pop(removed).remove()
+            if changed is not None:
+                nama, x, y = self.points.get(changed)
+                if changed in self.texts:
+                    self.texts[changed].set_position((x, y))
+                    self.texts[changed].set_text(f" {nama}")
+                else:
+                    self.texts[changed] = ax.text(x, y, f" {nama}", fontsize=9, va="bottom", ha="left")
+
+        # Batas sumbu dihitung ulang dari koordinat (vektor)
+        ax.ignore_existing_data_limits = True
+        if len(coords):
+            ax.update_datalim(coords)
+        ax.autoscale_view()
+        self.canvas_plot.draw_idle()
+
+    def draw_points(self, ax):
+        """Scatter semua titik + pengaturan sumbu; mengembalikan artist scatter."""
+        scatter = ax.scatter(self.points.coords[:, 0], self.points.coords[:, 1], s=40)
+        ax.set_xlabel("X")
+        ax.set_ylabel("Y")
+        ax.set_title("Plot Titik Koordinat 2D")
+        ax.grid(True)
+        ax.set_aspect('equal', adjustable='datalim')  # agar skala X dan Y lebih seragam
+        return scatter
+
+    def draw_labels(self, ax):
+        """Label nama tiap titik (jika jumlahnya <= LABEL_THRESHOLD); dict id -> Text."""
+        texts = {}
+        if len(self.points) > LABEL_THRESHOLD:
+            return texts
+        for point_id, row in self.points.row_of.items():
+            x, y = self.points.xy[row]
+            texts[point_id] = ax.text(x, y, f" {self.points.names[row]}",
+                                      fontsize=9, va="bottom", ha="left")
+        return texts
+
     # -----------------------
     # Fungsi Save Data (txt/csv)
     # -----------------------
@@ -273,21 +412,44 @@ class PointApp:
             return
 
         try:
-            if file_path.endswith(".csv"):
-                with open(file_path, "w", encoding="utf-8") as f:
-                    f.write("Nama,X,Y\n")
-                    for p in self.points:
-                        f.write(f"{p[0]},{p[1]},{p[2]}\n")
-            else:
-                # txt
-                with open(file_path, "w", encoding="utf-8") as f:
-                    f.write("Nama\tX\tY\n")
-                    for p in self.points:
-                        f.write(f"{p[0]}\t{p[1]}\t{p[2]}\n")
+            sep = "," if file_path.endswith(".csv") else "\t"
+            # Urutan sesuai tabel (urutan baris internal berubah karena swap-remove)
+            rows = self.points.rows_for([int(iid) for iid in self.tree.get_children()])
+            names = [self.points.names[r] for r in rows]
+            xy = self.points.xy[rows].tolist()
+            with open(file_path, "w", encoding="utf-8") as f:
+                f.write(f"Nama{sep}X{sep}Y\n")
+                f.writelines(f"{n}{sep}{x}{sep}{y}\n" for n, (x, y) in zip(names, xy))
             messagebox.showinfo("Sukses", f"Data berhasil disimpan ke {file_path}")
         except Exception as e:
             messagebox.showerror("Error", f"Gagal menyimpan data: {e}")
 
+    # -----------------------
+    # Fungsi Load Data (csv/txt)
+    # -----------------------
+    def load_points(self):
+        file_path = filedialog.askopenfilename(
+            filetypes=[("CSV File", "*.csv"), ("Text File", "*.txt"), ("Semua File", "*.*")]
+        )
+
+        if not file_path:
+            return
+
+        try:
+            # Parser per blok FileManager (header dan pemisah dideteksi otomatis); Z diabaikan
+            points, labels = FileManager.load_csv(file_path)
+        except Exception as e:
+            messagebox.showerror("Error", f"Gagal membaca data: {e}")
+            return
+
+        names = labels.strings(0, len(labels))
+        ids = self.points.extend(names, points[:, :2])
+        for point_id, nama, (x, y) in zip(ids.tolist(), names, points[:, :2].tolist()):
+            self.tree.insert("", "end", iid=str(point_id), values=(nama, x, y))
+
+        self.update_plot()
+        messagebox.showinfo("Sukses", f"{len(names)} titik dimuat dari {file_path}")
+
     # -----------------------
     # Fungsi Save Plot (png/jpg/pdf)
     # -----------------------
@@ -307,18 +469,9 @@ class PointApp:
 
         try:
             # Buat figure baru agar tidak terpengaruh oleh canvas yang sedang di-embed
-            x_vals = [p[1] for p in self.points]
-            y_vals = [p[2] for p in self.points]
-
             fig, ax = plt.subplots(figsize=(6, 5))
-            ax.scatter(x_vals, y_vals, s=40)
-            for nama, x, y in self.points:
-                ax.text(x, y, f" {nama}", fontsize=9, va="bottom", ha="left")
-            ax.set_xlabel("X")
-            ax.set_ylabel("Y")
-            ax.set_title("Plot Titik Koordinat 2D")
-            ax.grid(True)
-            ax.axis('equal')
+            self.draw_points(ax)
+            self.draw_labels(ax)
 
             fig.savefig(file_path, bbox_inches="tight")
             plt.close(fig)
@@ -326,17 +479,6 @@ class PointApp:
         except Exception as e:
             messagebox.showerror("Error", f"Gagal menyimpan grafik: {e}")
 
-    # -----------------------
-    # Utility: refresh treeview dari self.points
-    # -----------------------
-    def refresh_treeview(self):
-        # Hapus semua
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        # Insert ulang
-        for p in self.points:
-            self.tree.insert("", "end", values=p)
-
     # -----------------------
     # Utility: clear entries
     # -----------------------
@@ -0,0 +1,425 @@
+# benchmark.py
+"""
+Benchmark jalur utama: generator, ekspor dan visualisasi.
+
+Setiap pengukuran (stage x N) dijalankan di proses baru, sehingga peak RSS
+tidak tercampur antar stage. Hasil disimpan sebagai JSON dan bisa
+dibandingkan dengan hasil sebelumnya (baseline).
+
+Contoh (dari folder NOTHING):
+    python benchmark.py                              # N = 1e3 .. 1e6
+    python benchmark.py --max-n 1e8 -o hasil.json    # sweep penuh
+    python benchmark.py --stages csv_pandas csv_stream -n 1e5
+    python benchmark.py --stages csv_stream parquet arrow read_csv read_parquet read_arrow -n 1e6
+    python benchmark.py --stages export_serial export_pipeline -n 1e6
+    python benchmark.py --stages random sobol halton -n 1e6 --discrepancy
+    python benchmark.py --baseline lama.json -o baru.json
+"""
+
+import argparse
+import json
+import math
+import os
+import platform
+import tempfile
+import time
+import tracemalloc
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from datetime import datetime
+from io import StringIO
+from multiprocessing import get_context
+
+from instrument import peak_rss_bytes
+
+
+# -----------------------
+# Stage: setup(n, tmp) -> fungsi tanpa argumen yang diukur
+# -----------------------
+def _points(n, seed=0):
+    from generator import PointGenerator
+    return PointGenerator(0, 1000, 0, 1000, 0, 100, num_points=n, mode='random', seed=seed).generate()
+
+
+def _setup_grid(n, tmp):
+    from generator import PointGenerator
+    side = math.ceil(n ** (1 / 3))
+    gen = PointGenerator(0, side - 1, 0, side - 1, 0, side - 1, num_points=n, mode='grid', spacing=1)
+    return gen.generate
+
+
+def _setup_grid_chunks(n, tmp):
+    from generator import PointGenerator
+    side = math.ceil(n ** (1 / 3))
+    gen = PointGenerator(0, side - 1, 0, side - 1, 0, side - 1, num_points=n, mode='grid', spacing=1)
+    return lambda: sum(len(c) for c in gen.iter_chunks(1_000_000))
+
+
+def _setup_random(n, tmp):
+    from generator import PointGenerator
+    gen = PointGenerator(0, 1000, 0, 1000, 0, 100, num_points=n, mode='random', seed=0)
+    return gen.generate
+
+
+def _setup_random_float32(n, tmp):
+    from generator import PointGenerator
+    gen = PointGenerator(0, 1000, 0, 1000, 0, 100, num_points=n, mode='random', seed=0,
+                         dtype='float32')
+    return gen.generate
+
+
+def _setup_random_int32(n, tmp):
+    from generator import PointGenerator
+    gen = PointGenerator(0, 1000, 0, 1000, 0, 100, num_points=n, mode='random', seed=0,
+                         dtype='int32')
+    return gen.generate
+
+
+def _setup_las_int32(n, tmp):
+    from filemanager import FileManager
+    from quantized import QuantizedPoints
+    fm = FileManager(QuantizedPoints.from_points(_points(n), 0.001, 0.0))
+    return lambda: fm.save_las(os.path.join(tmp, "out.las"))
+
+
+def _setup_sobol(n, tmp):
+    from generator import PointGenerator
+    gen = PointGenerator(0, 1000, 0, 1000, 0, 100, num_points=n, mode='sobol', seed=0)
+    return gen.generate
+
+
+def _setup_halton(n, tmp):
+    from generator import PointGenerator
+    gen = PointGenerator(0, 1000, 0, 1000, 0, 100, num_points=n, mode='halton', seed=0)
+    return gen.generate
+
+
+def _setup_poisson(n, tmp):
+    from generator import PointGenerator
+    # Kepadatan Bridson ~0.59 titik per spacing^3: kubus dipilih agar hasil ~n titik
+    side = (n / 0.59) ** (1 / 3)
+    gen = PointGenerator(0, side, 0, side, 0, side, num_points=0, mode='poisson', spacing=1, seed=0)
+    return gen.generate
+
+
+def _setup_poisson_2d(n, tmp):
+    from generator import PointGenerator
+    # Kepadatan 2D ~0.62 titik per spacing^2
+    side = (n / 0.62) ** 0.5
+    gen = PointGenerator(0, side, 0, side, 0, 0, num_points=0, mode='poisson', spacing=1, seed=0)
+    return gen.generate
+
+
+def _setup_random_polygon(n, tmp):
+    import numpy as np
+    from generator import PointGenerator
+    from polygon import Polygon
+    # Poligon bergerigi 5000 vertex (~50% kotak): mask raster + uji tepi tepat
+    t = np.linspace(0, 2 * np.pi, 5001)[:-1]
+    r = 400 + 80 * np.sin(9 * t)
+    polygon = Polygon([np.column_stack((500 + r * np.cos(t), 500 + r * np.sin(t)))])
+    gen = PointGenerator(0, 1000, 0, 1000, 0, 50, num_points=n, seed=0, polygon=polygon)
+    return gen.generate
+
+
+def _setup_utm_to_wgs84(n, tmp):
+    import numpy as np
+    from crs import UTMToWGS84
+    rng = np.random.default_rng(0)
+    points = np.empty((n, 3))
+    points[:, 0] = rng.uniform(166_000, 834_000, n)
+    points[:, 1] = rng.uniform(0, 9_300_000, n)
+    points[:, 2] = 0.0
+    transform = UTMToWGS84("48S")
+    return lambda: transform.apply(points)
+
+
+def _setup_csv_pandas(n, tmp):
+    from filemanager import FileManager
+    fm = FileManager(_points(n))
+    return lambda: fm.save_to_csv(os.path.join(tmp, "out.csv"))
+
+
+def _setup_csv_stream(n, tmp):
+    from filemanager import FileManager
+    fm = FileManager(_points(n))
+    return lambda: fm.save_csv_stream(os.path.join(tmp, "out.csv"))
+
+
+def _setup_npy(n, tmp):
+    from filemanager import FileManager
+    fm = FileManager(_points(n))
+    return lambda: fm.save_npy(os.path.join(tmp, "out.npy"))
+
+
+def _setup_parquet(n, tmp):
+    from filemanager import FileManager, _require_pyarrow
+    _require_pyarrow()
+    fm = FileManager(_points(n))
+    return lambda: fm.save_parquet(os.path.join(tmp, "out.parquet"))
+
+
+def _setup_arrow(n, tmp):
+    from filemanager import FileManager, _require_pyarrow
+    _require_pyarrow()
+    fm = FileManager(_points(n))
+    return lambda: fm.save_arrow(os.path.join(tmp, "out.arrow"))
+
+
+def _setup_read_csv(n, tmp):
+    from filemanager import FileManager
+    path = os.path.join(tmp, "in.csv")
+    FileManager(_points(n)).save_csv_stream(path)
+    return lambda: FileManager.load_csv(path)
+
+
+def _setup_read_parquet(n, tmp):
+    from filemanager import FileManager, _require_pyarrow
+    _require_pyarrow()
+    path = os.path.join(tmp, "in.parquet")
+    FileManager(_points(n)).save_parquet(path)
+    return lambda: FileManager.load_parquet(path)
+
+
+def _setup_read_arrow(n, tmp):
+    from filemanager import FileManager, _require_pyarrow
+    _require_pyarrow()
+    path = os.path.join(tmp, "in.arrow")
+    FileManager(_points(n)).save_arrow(path)
+    return lambda: FileManager.load_arrow(path)
+
+
+def _export_job(n, tmp):
+    """Generate -> UTM ke WGS84 -> CSV + NPY; dipakai stage serial dan pipeline."""
+    from crs import LocalOffset, UTMToWGS84
+    from filemanager import FileManager
+    from generator import PointGenerator
+    gen = PointGenerator(0, 1000, 0, 1000, 0, 100, num_points=n, mode='random', seed=0)
+    transform = LocalOffset((700_000, 9_300_000, 0)).then(UTMToWGS84("48S"))
+    fm = FileManager(None)
+    writers = [lambda chunks: fm.save(os.path.join(tmp, "out.csv"), chunks=chunks),
+               lambda chunks: fm.save(os.path.join(tmp, "out.npy"), chunks=chunks)]
+    return gen, transform, writers
+
+
+def _setup_export_serial(n, tmp):
+    gen, transform, writers = _export_job(n, tmp)
+
+    def run():
+        points = transform.apply(gen.generate())
+        for write in writers:
+            write([points])
+    return run
+
+
+def _setup_export_pipeline(n, tmp):
+    from pipeline import Pipeline
+    gen, transform, writers = _export_job(n, tmp)
+    return lambda: Pipeline(gen.iter_chunks(1_000_000), stages=[transform.apply],
+                            writers=writers).run()
+
+
+def _setup_show_3d(n, tmp):
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    from visualizer import PointVisualizer
+    vis = PointVisualizer(_points(n))
+
+    def run():
+        vis.show_3d()
+        plt.gcf().canvas.draw()
+        plt.close("all")
+    return run
+
+
+def _setup_render(n, tmp):
+    from renderer import HeadlessRenderer
+    points = _points(n)
+    renderer = HeadlessRenderer()
+    return lambda: renderer.render(points, os.path.join(tmp, "out.png"))
+
+
+# name -> (setup, N maksimum default atau None)
+STAGES = {
+    "grid": (_setup_grid, None),
+    "grid_chunks": (_setup_grid_chunks, None),
+    "random": (_setup_random, None),
+    "random_float32": (_setup_random_float32, None),
+    "random_int32": (_setup_random_int32, None),
+    "sobol": (_setup_sobol, None),
+    "halton": (_setup_halton, None),
+    "poisson": (_setup_poisson, None),
+    "poisson_2d": (_setup_poisson_2d, None),
+    "random_polygon": (_setup_random_polygon, None),
+    "utm_to_wgs84": (_setup_utm_to_wgs84, None),
+    "csv_pandas": (_setup_csv_pandas, 10_000_000),
+    "csv_stream": (_setup_csv_stream, None),
+    "npy": (_setup_npy, None),
+    "las_int32": (_setup_las_int32, None),
+    "parquet": (_setup_parquet, None),
+    "arrow": (_setup_arrow, None),
+    "read_csv": (_setup_read_csv, None),
+    "read_parquet": (_setup_read_parquet, None),
+    "read_arrow": (_setup_read_arrow, None),
+    "export_serial": (_setup_export_serial, None),
+    "export_pipeline": (_setup_export_pipeline, None),
+    "show_3d": (_setup_show_3d, None),
+    "render": (_setup_render, None),
+}
+
+
+def _max_rss_mb():
+    """Peak RSS proses ini dalam MB, atau None jika tidak bisa diukur (lihat instrument)."""
+    rss = peak_rss_bytes()
+    return None if rss is None else rss / (1024 * 1024)
+
+
+def _measure(stage, n, trace_alloc):
+    """Dijalankan di proses pekerja: setup, lalu ukur satu kali pemanggilan stage."""
+    warnings.simplefilter("ignore")
+    setup, _ = STAGES[stage]
+    with tempfile.TemporaryDirectory() as tmp, redirect_stdout(StringIO()):
+        run = setup(n, tmp)
+        rss_setup = _max_rss_mb()
+
+        if trace_alloc:
+            tracemalloc.start()
+        start = time.perf_counter()
+        run()
+        seconds = time.perf_counter() - start
+        alloc_peak = None
+        if trace_alloc:
+            alloc_peak = tracemalloc.get_traced_memory()[1] / 1e6
+            tracemalloc.stop()
+        # Ukuran file yang ada di folder sementara (stage ekspor/baca)
+        output_bytes = sum(os.path.getsize(os.path.join(tmp, f)) for f in os.listdir(tmp))
+
+    return {
+        "stage": stage,
+        "n": n,
+        "seconds": seconds,
+        "points_per_sec": n / seconds if seconds > 0 else None,
+        "rss_setup_mb": rss_setup,
+        "peak_rss_mb": _max_rss_mb(),
+        "alloc_peak_mb": alloc_peak,
+        "output_mb": output_bytes / 1e6 if output_bytes else None,
+    }
+
+
+def run_suite(stages, sizes, trace_alloc=True, log=print):
+    """Menjalankan setiap stage untuk setiap N di proses terpisah."""
+    ctx = get_context("spawn")
+    results = []
+    for stage in stages:
+        _, limit = STAGES[stage]
+        for n in sizes:
+            if limit is not None and n > limit:
+                log(f"{stage:>12} {n:>12,}  dilewati (> {limit:,})")
+                continue
+            with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as pool:
+                # Waktu & RSS diukur tanpa tracemalloc (tracemalloc memperlambat)
+                try:
+                    res = pool.submit(_measure, stage, n, False).result()
+                except ImportError as e:
+                    # Stage dengan dependensi opsional (mis. pyarrow) yang tidak terpasang
+                    log(f"{stage:>12} {n:>12,}  dilewati ({e})")
+                    continue
+            if trace_alloc:
+                with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as pool:
+                    res["alloc_peak_mb"] = pool.submit(_measure, stage, n, True).result()["alloc_peak_mb"]
+            results.append(res)
+            alloc = "-" if res["alloc_peak_mb"] is None else f"{res['alloc_peak_mb']:.1f}"
+            rss = "-" if res["peak_rss_mb"] is None else f"{res['peak_rss_mb']:.1f}"
+            size = "" if res["output_mb"] is None else f"  file {res['output_mb']:>8.1f} MB"
+            log(f"{stage:>12} {n:>12,} {res['seconds']:>9.3f}s "
+                f"rss {rss:>8} MB  alloc {alloc:>8} MB{size}")
+    return results
+
+
+def discrepancy(sizes=(256, 1024, 4096, 8192), modes=("random", "sobol", "halton"),
+                seeds=(0, 1, 2), log=print):
+    """
+    Centered L2 discrepancy (kuadrat, lihat quasirandom.centered_discrepancy)
+    titik di kubus satuan per mode dan N, rata-rata beberapa seed. Makin kecil
+    makin merata; untuk 'random' turun ~1/N, untuk sobol/halton mendekati 1/N^2.
+    """
+    from generator import PointGenerator
+    from quasirandom import centered_discrepancy
+    results = []
+    log(f"\n{'mode':>12} {'N':>12} {'discrepancy':>14} {'vs random':>10}")
+    for n in sizes:
+        base = None
+        for mode in modes:
+            values = [centered_discrepancy(PointGenerator(num_points=n, mode=mode, seed=s).generate())
+                      for s in seeds]
+            value = sum(values) / len(values)
+            base = value if mode == "random" else base
+            ratio = f"{base / value:>9.1f}x" if base is not None and mode != "random" else ""
+            log(f"{mode:>12} {n:>12,} {value:>14.3e} {ratio:>10}")
+            results.append({"mode": mode, "n": n, "discrepancy": value})
+    return results
+
+
+def compare(results, baseline, log=print):
+    """Mencetak rasio waktu dan RSS terhadap hasil baseline (stage, n yang sama)."""
+    old = {(r["stage"], r["n"]): r for r in baseline["results"]}
+    log(f"\n{'stage':>12} {'N':>12} {'waktu':>8} {'rss':>8}   (baru / baseline)")
+    for r in results:
+        b = old.get((r["stage"], r["n"]))
+        if b is None:
+            continue
+        rss = ("-" if not (r["peak_rss_mb"] and b["peak_rss_mb"])
+               else f"{r['peak_rss_mb'] / b['peak_rss_mb']:.2f}x")
+        log(f"{r['stage']:>12} {r['n']:>12,} {r['seconds'] / b['seconds']:>7.2f}x {rss:>8}")
+
+
+def _metadata():
+    import numpy as np
+    return {
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark generator, ekspor dan visualisasi")
+    parser.add_argument("--stages", nargs="+", choices=list(STAGES), default=list(STAGES),
+                        help="stage yang diukur (default: semua)")
+    parser.add_argument("-n", type=float, nargs="+", default=None,
+                        help="daftar N eksplisit (menggantikan --min-n/--max-n)")
+    parser.add_argument("--min-n", type=float, default=1e3, help="N terkecil (default 1e3)")
+    parser.add_argument("--max-n", type=float, default=1e6, help="N terbesar (default 1e6, maks 1e8)")
+    parser.add_argument("--no-alloc", action="store_true", help="lewati pengukuran tracemalloc")
+    parser.add_argument("-o", "--output", default="benchmark_results.json", help="file JSON hasil")
+    parser.add_argument("--baseline", default=None, help="file JSON hasil sebelumnya untuk dibandingkan")
+    parser.add_argument("--discrepancy", action="store_true",
+                        help="juga ukur discrepancy random vs sobol/halton (N = 256 .. 8192)")
+    args = parser.parse_args(argv)
+
+    if args.n:
+        sizes = [int(n) for n in args.n]
+    else:
+        lo, hi = int(round(math.log10(args.min_n))), int(round(math.log10(args.max_n)))
+        sizes = [10 ** k for k in range(lo, hi + 1)]
+
+    results = run_suite(args.stages, sizes, trace_alloc=not args.no_alloc)
+    output = {"meta": _metadata(), "results": results}
+    if args.discrepancy:
+        output["discrepancy"] = discrepancy()
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(output, f, indent=2)
+    print(f"\nHasil disimpan: {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            compare(results, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
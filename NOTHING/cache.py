@@ -0,0 +1,193 @@
+# cache.py
+
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from filemanager import FileManager
+
+# Anggaran memori default LRU (byte)
+_DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+# Batas default jumlah entri LRU (termasuk memmap, yang masing-masing memegang file terbuka)
+_DEFAULT_MAX_ENTRIES = 32
+
+
+class PointCache:
+    """
+    Cache hasil PointGenerator yang dialamati isi (content-addressed).
+
+    Kunci adalah hash SHA-256 parameter generator yang dinormalisasi
+    (PointGenerator.cache_key()), jadi parameter yang sama selalu memberi
+    kunci yang sama, antar proses maupun antar sesi.
+
+    Dua tingkat:
+    - LRU di memori dengan anggaran byte (max_bytes) dan jumlah entri
+      (max_entries); entri paling lama tidak dipakai dibuang lebih dulu.
+      Memmap dari disk tidak dihitung ke max_bytes tetapi tetap dihitung
+      ke max_entries (setiap memmap memegang mapping dan file descriptor)
+    - opsional, direktori di disk berisi <kunci>.npy; dibaca kembali sebagai
+      memmap read-only sehingga hasil besar tidak perlu dimuat ke RAM
+
+    Array disimpan dengan dtype aslinya (float64, float32 atau kode int32
+    QuantizedPoints.data), tanpa konversi. Array yang dikembalikan selalu
+    read-only (dipakai bersama antar pemanggil); array milik pemanggil yang
+    diberikan ke put() tidak diubah flag-nya.
+    Statistik hit/miss tersedia di stats. Aman dipakai dari beberapa thread.
+    """
+
+    def __init__(self, max_bytes=_DEFAULT_MAX_BYTES, directory=None, max_entries=_DEFAULT_MAX_ENTRIES):
+        """
+        Parameters:
+        - max_bytes: batas total ukuran array di memori
+        - directory: folder penyimpanan .npy; None = hanya memori
+        - max_entries: batas jumlah entri LRU (array maupun memmap)
+        """
+        self.max_bytes = int(max_bytes)
+        self.max_entries = int(max_entries)
+        if self.max_entries < 1:
+            raise ValueError("max_entries harus >= 1")
+        self.directory = directory
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "memory_hits": 0, "disk_hits": 0,
+                      "evictions": 0, "stores": 0}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        path = self._path(key)
+        return key in self._entries or (path is not None and os.path.exists(path))
+
+    @property
+    def nbytes(self):
+        """Total ukuran array yang disimpan di memori."""
+        return self._bytes
+
+    def _path(self, key):
+        return None if self.directory is None else os.path.join(self.directory, key + ".npy")
+
+    def get(self, key):
+        """Array (N,3) read-only untuk key, atau None jika tidak ada (dihitung miss)."""
+        with self._lock:
+            points = self._entries.get(key)
+            if points is not None:
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                self.stats["memory_hits"] += 1
+                return points
+
+        path = self._path(key)
+        if path is not None and os.path.exists(path):
+            points = np.load(path, mmap_mode='r')
+            with self._lock:
+                self.stats["hits"] += 1
+                self.stats["disk_hits"] += 1
+            self._remember(key, points)
+            return points
+
+        with self._lock:
+            self.stats["misses"] += 1
+        return None
+
+    def put(self, key, points, copy=True):
+        """
+        Menyimpan points (N,3) untuk key: ke memori (jika muat anggaran) dan
+        ke disk (jika ada directory). Mengembalikan array read-only yang disimpan.
+
+        copy: array yang masih writeable disalin, sehingga pemanggil tetap bisa
+        mengubah array-nya tanpa merusak isi cache. copy=False menyimpan view
+        read-only tanpa salinan; pemanggil berjanji tidak mengubah array itu lagi.
+        """
+        points = np.asarray(points)
+        if points.flags.writeable:
+            points = points.copy() if copy else points.view()
+            points.flags.writeable = False
+        path = self._path(key)
+        if path is not None and not os.path.exists(path):
+            self._write(path, [points])
+        self._remember(key, points)
+        with self._lock:
+            self.stats["stores"] += 1
+        return points
+
+    def store_chunks(self, key, chunks):
+        """
+        Meneruskan chunks (iterable array (m,3)) apa adanya sambil menuliskannya
+        ke disk sebagai entri key. Entri hanya dibuat jika iterasi selesai;
+        iterasi yang dihentikan di tengah tidak meninggalkan file.
+        Tanpa directory, chunks dikembalikan langsung tanpa disimpan.
+        """
+        path = self._path(key)
+        if path is None or os.path.exists(path):
+            yield from chunks
+            return
+        yield from self._write(path, chunks, passthrough=True)
+        with self._lock:
+            self.stats["stores"] += 1
+
+    def clear(self, disk=False):
+        """Mengosongkan LRU memori (dan file .npy di directory jika disk=True)."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+        if disk and self.directory is not None:
+            for name in os.listdir(self.directory):
+                if name.endswith(".npy"):
+                    os.remove(os.path.join(self.directory, name))
+
+    def _remember(self, key, points):
+        """Memasukkan ke LRU memori dan membuang entri lama sampai muat anggaran."""
+        # memmap tidak memakan RAM proses; hanya array biasa yang dihitung
+        size = 0 if isinstance(points, np.memmap) else points.nbytes
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None and not isinstance(old, np.memmap):
+                self._bytes -= old.nbytes
+            self._entries[key] = points
+            self._bytes += size
+            while self._bytes > self.max_bytes or len(self._entries) > self.max_entries:
+                _, evicted = self._entries.popitem(last=False)
+                if not isinstance(evicted, np.memmap):
+                    self._bytes -= evicted.nbytes
+                self.stats["evictions"] += 1
+
+    def _write(self, path, chunks, passthrough=False):
+        """
+        Menulis chunks ke path sebagai .npy dengan dtype chunk pertama
+        (float64, float32 atau kode int32), via file sementara lalu
+        os.replace, sehingga pembaca tidak pernah melihat file setengah jadi.
+        Dengan passthrough=True berupa generator yang meneruskan setiap chunk.
+        """
+        def write():
+            tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            count = 0
+            dtype = None
+            try:
+                with open(tmp, "wb") as f:
+                    f.write(FileManager._npy_header(np.dtype('<f8'), 0))
+                    for chunk in chunks:
+                        if dtype is None:
+                            dtype = np.asarray(chunk).dtype.newbyteorder('<')
+                        f.write(np.ascontiguousarray(chunk, dtype=dtype).data)
+                        count += len(chunk)
+                        if passthrough:
+                            yield chunk
+                    f.seek(0)
+                    f.write(FileManager._npy_header(dtype if dtype is not None else np.dtype('<f8'), count))
+                os.replace(tmp, path)
+            finally:
+                if os.path.exists(tmp):
+                    os.remove(tmp)
+
+        if passthrough:
+            return write()
+        for _ in write():
+            pass
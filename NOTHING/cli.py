@@ -0,0 +1,376 @@
+# cli.py
+"""
+CLI non-interaktif untuk Koordinat Point Generator.
+
+Contoh (dari folder NOTHING):
+    python -m cli --bounds 0 100 0 100 0 10 --mode grid --spacing 5 -o grid.csv
+    python -m cli --bounds 0 1000 0 1000 0 50 -n 1000000 --seed 7 -o acak.npy
+    python -m cli --bounds 0 500 0 500 0 0 --mode poisson --spacing 10 -n 0 -o sensor.csv
+    python -m cli --bounds 0 1000 0 1000 0 50 --mode sobol -n 1048576 --seed 7 -o mc.npy
+    python -m cli --bounds 0 100 0 100 0 0 --polygon area.geojson --dem dem.npy -n 5000 -o a.csv
+    python -m cli --bounds 0 100 0 100 0 0 --origin 700000 9300000 0 --to-wgs84 48S -o geo.csv
+    python -m cli --bounds 0 1e4 0 1e4 0 50 -n 1000000000 --seed 7 --shards 64 -o survei_shards
+    python -m cli --bounds 0 100 0 100 0 10 -n 1000000 -o a.csv --trace trace.json --profile
+    python -m cli --jobs survei.json --processes 4
+
+File job (JSON atau YAML) berisi list job, atau dict dengan key "jobs".
+Setiap job memakai nama parameter yang sama dengan flag, misalnya:
+    {"jobs": [{"bounds": [0, 10, 0, 10, 0, 5], "mode": "grid", "spacing": 1,
+               "output": "a.csv"}, ...]}
+
+pandas, matplotlib dan tkinter tidak diimpor kecuali benar-benar dibutuhkan
+(--preview / --plot), sehingga startup tetap cepat.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from generator import MODES, PointGenerator
+from quasirandom import SEQUENCES
+from filemanager import FileManager, WRITERS
+
+# Batas titik yang dibaca kembali dari CSV untuk preview/plot; renderer dan
+# visualizer tetap mendesimasi ke max_points masing-masing
+_READ_BACK_POINTS = 1_000_000
+
+# Nilai default setiap parameter job (juga dipakai untuk flag CLI)
+JOB_DEFAULTS = {
+    "bounds": [0.0, 1.0, 0.0, 1.0, 0.0, 1.0],
+    "mode": "random",
+    "scramble": True,
+    "spacing": 1.0,
+    "num_points": 0,
+    "seed": None,
+    "output": "koordinat_output.csv",
+    "format": None,
+    "precision": None,
+    "chunk_size": 1_000_000,
+    "preview": None,
+    "polygon": None,
+    "dem": None,
+    "dem_bounds": None,
+    "origin": None,
+    "to_wgs84": None,
+    "cache_dir": None,
+    "dtype": "float64",
+    "resolution": None,
+    "compression": "zstd",
+    "shards": None,
+    "shard_ids": None,
+}
+
+# Mode yang jumlah titiknya harus diberikan (-n / num_points > 0)
+COUNTED_MODES = ('random',) + tuple(SEQUENCES)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m cli",
+        description="Generate koordinat titik 3D (grid/random) dan simpan ke file.",
+    )
+    parser.add_argument("--bounds", type=float, nargs=6,
+                        metavar=("XMIN", "XMAX", "YMIN", "YMAX", "ZMIN", "ZMAX"),
+                        default=JOB_DEFAULTS["bounds"], help="batas koordinat")
+    parser.add_argument("--mode", choices=MODES, default=JOB_DEFAULTS["mode"],
+                        help="mode generate (default: random)")
+    parser.add_argument("--spacing", type=float, default=JOB_DEFAULTS["spacing"],
+                        help="jarak antar titik (mode grid) / jarak minimum (mode poisson)")
+    parser.add_argument("-n", "--num-points", type=int, default=JOB_DEFAULTS["num_points"],
+                        help="jumlah titik (wajib untuk mode random/sobol/halton; batas atas untuk "
+                             "grid/poisson, default 0 = tanpa batas)")
+    parser.add_argument("--seed", type=int, default=None, help="seed untuk hasil yang bisa diulang")
+    parser.add_argument("--no-scramble", action="store_true",
+                        help="mode sobol/halton tanpa scramble (barisan klasik, tidak bergantung seed)")
+    parser.add_argument("-o", "--output", default=JOB_DEFAULTS["output"], help="file keluaran")
+    parser.add_argument("-f", "--format", choices=sorted(WRITERS), default=None,
+                        help="format keluaran (default: dari ekstensi --output)")
+    parser.add_argument("--precision", type=int, default=None, help="digit desimal CSV")
+    parser.add_argument("--dtype", choices=["float64", "float32", "int32"], default=JOB_DEFAULTS["dtype"],
+                        help="tipe penyimpanan titik; int32 = fixed-point (LAS/Parquet/Arrow ditulis sebagai int32)")
+    parser.add_argument("--resolution", type=float, default=None,
+                        help="resolusi --dtype int32 (default: spacing untuk grid, selain itu 0.001)")
+    parser.add_argument("--compression", default=JOB_DEFAULTS["compression"],
+                        help="codec Parquet/Arrow: zstd, snappy (Parquet), lz4 atau none")
+    parser.add_argument("--chunk-size", type=int, default=JOB_DEFAULTS["chunk_size"],
+                        help="jumlah titik per chunk saat streaming")
+    parser.add_argument("--polygon", default=None,
+                        help="batasi titik ke poligon dari file GeoJSON atau CSV vertex")
+    parser.add_argument("--dem", default=None,
+                        help="ambil Z dari raster ketinggian .npy (baris pertama = utara)")
+    parser.add_argument("--dem-bounds", type=float, nargs=4, default=None,
+                        metavar=("XMIN", "XMAX", "YMIN", "YMAX"),
+                        help="cakupan raster DEM (default: batas X/Y dari --bounds)")
+    parser.add_argument("--origin", type=float, nargs=3, default=None, metavar=("X0", "Y0", "Z0"),
+                        help="geser koordinat lokal ke koordinat peta saat menyimpan")
+    parser.add_argument("--to-wgs84", default=None, metavar="ZONA",
+                        help="simpan sebagai bujur/lintang WGS84 dari zona UTM, misalnya 48S")
+    parser.add_argument("--cache-dir", default=None,
+                        help="folder cache hasil generate (.npy); parameter + seed sama = tanpa hitung ulang")
+    parser.add_argument("--shards", type=int, default=None,
+                        help="bagi hasil menjadi N shard; --output menjadi folder berisi file shard + manifest.json")
+    parser.add_argument("--shard-ids", type=int, nargs="+", default=None,
+                        help="hanya jalankan shard ini (node lain menjalankan sisanya ke folder yang sama)")
+    parser.add_argument("--preview", default=None,
+                        help="simpan gambar preview (PNG/PDF) tanpa layar")
+    parser.add_argument("--plot", action="store_true",
+                        help="tampilkan plot 3D interaktif setelah selesai")
+    parser.add_argument("--trace", default=None, metavar="FILE",
+                        help="catat waktu/memori per tahap ke FILE (.jsonl = JSON lines, selain itu Chrome trace)")
+    parser.add_argument("--profile", action="store_true",
+                        help="tampilkan ringkasan waktu per tahap dan tabel cProfile")
+    parser.add_argument("--jobs", default=None,
+                        help="file job JSON/YAML berisi banyak job (flag parameter diabaikan)")
+    parser.add_argument("--processes", type=int, default=None,
+                        help="jumlah proses untuk --jobs (default: jumlah CPU)")
+    return parser
+
+
+def load_jobs(path):
+    """Membaca file job JSON atau YAML; mengembalikan list dict job."""
+    with open(path, encoding="utf-8") as f:
+        if path.lower().endswith((".yaml", ".yml")):
+            try:
+                import yaml
+            except ImportError:
+                raise SystemExit("File job YAML membutuhkan paket PyYAML (pip install pyyaml)")
+            data = yaml.safe_load(f)
+        else:
+            data = json.load(f)
+
+    jobs = data.get("jobs") if isinstance(data, dict) else data
+    if not isinstance(jobs, list):
+        raise SystemExit("File job harus berisi list job atau dict dengan key 'jobs'")
+    return jobs
+
+
+def normalize_job(job):
+    """Melengkapi job dengan nilai default dan memeriksa key yang tidak dikenal."""
+    unknown = set(job) - set(JOB_DEFAULTS)
+    if unknown:
+        raise ValueError(f"Parameter job tidak dikenal: {', '.join(sorted(unknown))}")
+    full = dict(JOB_DEFAULTS)
+    full.update(job)
+    if len(full["bounds"]) != 6:
+        raise ValueError("bounds harus berisi 6 angka: xmin xmax ymin ymax zmin zmax")
+    if full["dem_bounds"] is not None and len(full["dem_bounds"]) != 4:
+        raise ValueError("dem_bounds harus berisi 4 angka: xmin xmax ymin ymax")
+    full["mode"] = str(full["mode"]).lower()
+    if full["mode"] not in MODES:
+        raise ValueError(f"mode harus salah satu dari {', '.join(MODES)}")
+    full["num_points"] = int(full["num_points"] or 0)
+    if full["mode"] in COUNTED_MODES and full["num_points"] <= 0:
+        raise ValueError(f"num_points (-n) harus > 0 untuk mode {full['mode']}")
+    return full
+
+
+def make_generator(job):
+    """PointGenerator untuk job yang sudah dinormalisasi (poligon/DEM dibaca dari file)."""
+    polygon = dem = None
+    if job["polygon"]:
+        from polygon import Polygon
+        polygon = Polygon.from_file(job["polygon"])
+    if job["dem"]:
+        from dem import DEM
+        dem = DEM.from_npy(job["dem"], *(job["dem_bounds"] or job["bounds"][:4]))
+    return PointGenerator(*job["bounds"], num_points=job["num_points"], mode=job["mode"],
+                          spacing=job["spacing"], seed=job["seed"], polygon=polygon, dem=dem,
+                          dtype=job["dtype"], resolution=job["resolution"],
+                          scramble=job["scramble"])
+
+
+def make_transform(job):
+    """Transformasi CRS saat menyimpan (LocalOffset lalu UTM -> WGS84), atau None."""
+    if not job["origin"] and not job["to_wgs84"]:
+        return None
+    from crs import Chain, LocalOffset, UTMToWGS84
+    stages = []
+    if job["origin"]:
+        stages.append(LocalOffset(job["origin"]))
+    if job["to_wgs84"]:
+        stages.append(UTMToWGS84(job["to_wgs84"]))
+    return Chain(*stages)
+
+
+def run_job(job):
+    """
+    Menjalankan satu job: generate per chunk dan langsung streaming ke file.
+    Mengembalikan ringkasan (dict).
+    """
+    job = normalize_job(job)
+    start = time.perf_counter()
+
+    # Tanpa seed: pilih seed acak dan catat di ringkasan agar run dapat diulang
+    if job["seed"] is None:
+        job["seed"] = np.random.SeedSequence().entropy
+
+    gen = make_generator(job)
+    if job["cache_dir"]:
+        from cache import PointCache
+        gen.cache = PointCache(directory=job["cache_dir"])
+
+    kwargs = {}
+    fmt = job["format"] or os.path.splitext(job["output"])[1].lstrip(".").lower()
+    if fmt == "csv":
+        kwargs["precision"] = job["precision"]
+    elif fmt in ("parquet", "arrow", "feather"):
+        kwargs["compression"] = None if str(job["compression"]).lower() == "none" else job["compression"]
+    elif fmt == "las" and job["to_wgs84"]:
+        # Derajat butuh resolusi lebih halus dari milimeter (1e-7 derajat ~ 1 cm)
+        kwargs["scale"] = (1e-7, 1e-7, 0.001)
+
+    if job["shards"]:
+        return _run_sharded(job, gen, fmt or "npy", kwargs, start)
+
+    fm = FileManager(None)
+    count = fm.save(job["output"], fmt=fmt, chunks=gen.iter_chunks(job["chunk_size"]),
+                    transform=make_transform(job), **kwargs)
+
+    if job["preview"]:
+        # matplotlib (backend Agg) hanya diimpor jika preview diminta
+        from renderer import HeadlessRenderer
+        HeadlessRenderer().render(_read_back(job["output"], fmt, count), job["preview"])
+
+    return {
+        "output": job["output"],
+        "format": fmt,
+        "count": count,
+        "seed": job["seed"],
+        "cache": None if gen.cache is None else ("hit" if gen.cache.stats["hits"] else "miss"),
+        "seconds": round(time.perf_counter() - start, 3),
+    }
+
+
+def _run_sharded(job, gen, fmt, kwargs, start):
+    """run_job untuk --shards: satu file per shard di folder job["output"] + manifest."""
+    from shard import ShardedDataset, run_shards
+    manifest = run_shards(gen, job["shards"], job["output"], fmt=fmt, shard_ids=job["shard_ids"],
+                          chunk_size=job["chunk_size"],
+                          transform=make_transform(job), **kwargs)
+    dataset = ShardedDataset(manifest) if manifest else None
+    if dataset is not None and job["preview"]:
+        from renderer import HeadlessRenderer
+        HeadlessRenderer().render(np.asarray(dataset), job["preview"])
+
+    return {
+        "output": job["output"],
+        "format": fmt,
+        # Node yang belum melihat semua shard hanya tahu shard miliknya sendiri
+        "count": len(dataset) if dataset is not None else sum(
+            len(range(*gen.shard_range(i, job["shards"]))) for i in job["shard_ids"] or ()),
+        "seed": job["seed"],
+        "cache": None,
+        "manifest": manifest,
+        "seconds": round(time.perf_counter() - start, 3),
+    }
+
+
+def _read_back(path, fmt, count):
+    """
+    Titik untuk preview/plot, dibaca kembali dari file yang baru ditulis
+    (koordinat sudah ditransformasi), tanpa menggenerate ulang dataset:
+    - npy/ply/parquet/arrow: memmap atau tabel Arrow
+    - las: kode int32 dari memmap sebagai QuantizedPoints (tanpa salinan)
+    - csv: dibaca per blok, hanya setiap baris ke-k yang disimpan sehingga
+      memori paling banyak sekitar _READ_BACK_POINTS titik
+    """
+    if fmt == "npy":
+        return FileManager.load_npy(path)
+    if fmt == "ply":
+        return FileManager.load_ply(path)
+    if fmt == "parquet":
+        return FileManager.load_parquet(path)[0]
+    if fmt in ("arrow", "feather"):
+        return FileManager.load_arrow(path)[0]
+    if fmt == "las":
+        from numpy.lib.recfunctions import structured_to_unstructured
+        from quantized import QuantizedPoints
+        records, header = FileManager.load_las(path)
+        codes = structured_to_unstructured(records[["X", "Y", "Z"]])
+        return QuantizedPoints(codes, header["scale"], header["offset"])
+
+    step = max(1, -(-count // _READ_BACK_POINTS))
+    blocks, seen = [], 0
+    for points, _ in FileManager.iter_csv(path):
+        # Indeks global kelipatan step, dilanjutkan antar blok
+        blocks.append(points[-seen % step::step])
+        seen += len(points)
+    return np.concatenate(blocks) if blocks else np.empty((0, 3))
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if not args.jobs and args.mode in COUNTED_MODES and args.num_points <= 0:
+        parser.error(f"-n/--num-points harus > 0 untuk mode {args.mode}")
+
+    # Instrumentasi hanya mencatat proses ini (tidak termasuk proses --jobs/--shards)
+    recorder = None
+    if args.trace or args.profile:
+        import instrument
+        recorder = instrument.enable(profile=args.profile)
+
+    if args.jobs:
+        jobs = load_jobs(args.jobs)
+        with ProcessPoolExecutor(max_workers=args.processes) as pool:
+            summaries = list(pool.map(run_job, jobs))
+    else:
+        job = {
+            "bounds": args.bounds,
+            "mode": args.mode,
+            "scramble": not args.no_scramble,
+            "spacing": args.spacing,
+            "num_points": args.num_points,
+            "seed": args.seed,
+            "output": args.output,
+            "format": args.format,
+            "precision": args.precision,
+            "chunk_size": args.chunk_size,
+            "preview": args.preview,
+            "polygon": args.polygon,
+            "dem": args.dem,
+            "dem_bounds": args.dem_bounds,
+            "origin": args.origin,
+            "to_wgs84": args.to_wgs84,
+            "cache_dir": args.cache_dir,
+            "dtype": args.dtype,
+            "resolution": args.resolution,
+            "compression": args.compression,
+            "shards": args.shards,
+            "shard_ids": args.shard_ids,
+        }
+        summaries = [run_job(job)]
+
+    for s in summaries:
+        cache = f", cache {s['cache']}" if s["cache"] else ""
+        if "manifest" in s and not s["manifest"]:
+            cache += ", menunggu shard lain untuk manifest"
+        print(f"{s['output']}: {s['count']:,} titik ({s['format']}) dalam {s['seconds']} detik{cache}")
+
+    if recorder is not None:
+        instrument.disable()
+        print(recorder.format_summary())
+        if args.profile:
+            print(recorder.profile_text())
+        if args.trace:
+            recorder.save(args.trace)
+            print(f"Trace disimpan: {args.trace}")
+
+    if args.plot and not args.jobs:
+        from visualizer import PointVisualizer
+        s = summaries[0]
+        if s.get("manifest"):
+            from shard import ShardedDataset
+            PointVisualizer(np.asarray(ShardedDataset(s["manifest"]))).show_3d()
+            return 0
+        PointVisualizer(_read_back(s["output"], s["format"], s["count"])).show_3d()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
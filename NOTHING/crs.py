@@ -0,0 +1,274 @@
+# crs.py
+"""
+Transformasi sistem koordinat (CRS) untuk array titik (N, 3), murni numpy.
+
+- LocalOffset: koordinat lokal survei -> koordinat peta (geser, rotasi, skala)
+- UTMToWGS84 / WGS84ToUTM: UTM <-> lintang/bujur WGS84 (derajat)
+- Chain: beberapa transformasi berurutan
+
+Semua transformasi bekerja in place pada kolom X, Y (Z tidak diubah, kecuali
+geseran Z di LocalOffset), per potongan _CHUNK baris: array sementara hanya
+sebesar satu potongan, jadi 100 juta titik tidak butuh salinan tambahan.
+Urutan kolom hasil geografis mengikuti konvensi GIS: X = bujur, Y = lintang.
+
+Proyeksi UTM memakai deret Krüger orde n^6 (Karney 2011), akurat sampai
+orde nanometer di dalam zona.
+"""
+
+import math
+
+import numpy as np
+
+# Jumlah baris per potongan saat transformasi (membatasi array sementara)
+_CHUNK = 1 << 16
+
+# Elipsoid WGS84 dan parameter UTM
+_A = 6378137.0
+_F = 1 / 298.257223563
+_K0 = 0.9996
+_FALSE_EASTING = 500000.0
+_FALSE_NORTHING_SOUTH = 10000000.0
+
+
+def _krueger_coefficients():
+    """Koefisien deret Krüger alpha (maju) dan beta (balik), serta A (rectifying radius)."""
+    n = _F / (2 - _F)
+    n2, n3, n4, n5, n6 = n ** 2, n ** 3, n ** 4, n ** 5, n ** 6
+    A = _A / (1 + n) * (1 + n2 / 4 + n4 / 64 + n6 / 256)
+    alpha = np.array([
+        n / 2 - 2 * n2 / 3 + 5 * n3 / 16 + 41 * n4 / 180 - 127 * n5 / 288 + 7891 * n6 / 37800,
+        13 * n2 / 48 - 3 * n3 / 5 + 557 * n4 / 1440 + 281 * n5 / 630 - 1983433 * n6 / 1935360,
+        61 * n3 / 240 - 103 * n4 / 140 + 15061 * n5 / 26880 + 167603 * n6 / 181440,
+        49561 * n4 / 161280 - 179 * n5 / 168 + 6601661 * n6 / 7257600,
+        34729 * n5 / 80640 - 3418889 * n6 / 1995840,
+        212378941 * n6 / 319334400,
+    ])
+    beta = np.array([
+        n / 2 - 2 * n2 / 3 + 37 * n3 / 96 - n4 / 360 - 81 * n5 / 512 + 96199 * n6 / 604800,
+        n2 / 48 + n3 / 15 - 437 * n4 / 1440 + 46 * n5 / 105 - 1118711 * n6 / 3870720,
+        17 * n3 / 480 - 37 * n4 / 840 - 209 * n5 / 4480 + 5569 * n6 / 90720,
+        4397 * n4 / 161280 - 11 * n5 / 504 - 830251 * n6 / 7257600,
+        4583 * n5 / 161280 - 108847 * n6 / 3991680,
+        20648693 * n6 / 638668800,
+    ])
+    return A, alpha, beta
+
+
+_RECT_A, _ALPHA, _BETA = _krueger_coefficients()
+_E = math.sqrt(_F * (2 - _F))
+
+
+def parse_zone(zone):
+    """
+    Zona UTM dari int (utara) atau string seperti "49S" / "49N" / "49".
+    Mengembalikan (nomor_zona, south).
+    """
+    if isinstance(zone, str):
+        text = zone.strip().upper()
+        south = text.endswith("S")
+        number = int(text.rstrip("NS"))
+    else:
+        number, south = int(zone), False
+    if not 1 <= number <= 60:
+        raise ValueError("Zona UTM harus 1..60")
+    return number, south
+
+
+def utm_zone(lon):
+    """Nomor zona UTM standar untuk bujur (derajat); bisa array."""
+    return (np.floor((np.asarray(lon) + 180.0) / 6.0).astype(int) % 60) + 1
+
+
+class Transform:
+    """
+    Basis transformasi: apply() memotong array per _CHUNK baris lalu memanggil
+    _apply_block() untuk setiap potongan (view, diubah in place).
+    """
+
+    def apply(self, points, chunk_size=_CHUNK):
+        """
+        Mentransformasi points (array float (N, 3), writable) in place.
+        Mengembalikan points.
+        """
+        if not isinstance(points, np.ndarray) or points.ndim != 2 or points.shape[1] < 2:
+            raise ValueError("points harus numpy array shape (N, 3)")
+        if not np.issubdtype(points.dtype, np.floating):
+            raise ValueError("points harus bertipe float")
+        for start in range(0, points.shape[0], int(chunk_size)):
+            self._apply_block(points[start:start + chunk_size])
+        return points
+
+    __call__ = apply
+
+    def then(self, other):
+        """Transformasi ini diikuti other."""
+        return Chain(self, other)
+
+    def inverse(self):
+        raise NotImplementedError
+
+    def _apply_block(self, block):
+        raise NotImplementedError
+
+
+class Chain(Transform):
+    """Beberapa transformasi berurutan; setiap potongan melewati semua tahap sekaligus."""
+
+    def __init__(self, *transforms):
+        self.transforms = []
+        for t in transforms:
+            self.transforms.extend(t.transforms if isinstance(t, Chain) else [t])
+
+    def inverse(self):
+        return Chain(*[t.inverse() for t in reversed(self.transforms)])
+
+    def _apply_block(self, block):
+        for t in self.transforms:
+            t._apply_block(block)
+
+
+class LocalOffset(Transform):
+    """
+    Koordinat lokal -> koordinat peta:
+        XY_peta = origin_xy + scale * R(rotation) @ XY_lokal
+        Z_peta  = origin_z + Z_lokal
+    rotation dalam derajat, berlawanan arah jarum jam.
+    """
+
+    def __init__(self, origin=(0.0, 0.0, 0.0), rotation=0.0, scale=1.0):
+        origin = np.asarray(origin, dtype=float)
+        self.origin = np.zeros(3)
+        self.origin[:len(origin)] = origin
+        self.rotation = float(rotation)
+        self.scale = float(scale)
+        if self.scale == 0:
+            raise ValueError("scale tidak boleh 0")
+
+    def inverse(self):
+        return _InverseLocalOffset(self)
+
+    def _apply_block(self, block):
+        x, y = block[:, 0], block[:, 1]
+        if self.rotation:
+            theta = math.radians(self.rotation)
+            c, s = self.scale * math.cos(theta), self.scale * math.sin(theta)
+            xr = c * x - s * y
+            y *= c
+            y += s * x
+            x[:] = xr
+        elif self.scale != 1.0:
+            x *= self.scale
+            y *= self.scale
+        x += self.origin[0]
+        y += self.origin[1]
+        if block.shape[1] > 2 and self.origin[2]:
+            block[:, 2] += self.origin[2]
+
+
+class _InverseLocalOffset(Transform):
+    """Kebalikan LocalOffset: koordinat peta -> lokal."""
+
+    def __init__(self, forward):
+        self.forward = forward
+
+    def inverse(self):
+        return self.forward
+
+    def _apply_block(self, block):
+        f = self.forward
+        x, y = block[:, 0], block[:, 1]
+        x -= f.origin[0]
+        y -= f.origin[1]
+        if block.shape[1] > 2 and f.origin[2]:
+            block[:, 2] -= f.origin[2]
+        if f.rotation:
+            theta = math.radians(f.rotation)
+            c, s = math.cos(theta) / f.scale, math.sin(theta) / f.scale
+            xr = c * x + s * y
+            y *= c
+            y -= s * x
+            x[:] = xr
+        elif f.scale != 1.0:
+            x /= f.scale
+            y /= f.scale
+
+
+class UTMToWGS84(Transform):
+    """Easting/northing UTM (meter) -> bujur/lintang WGS84 (derajat)."""
+
+    def __init__(self, zone, south=None):
+        """
+        Parameters:
+        - zone: nomor zona (1..60) atau string seperti "49S"
+        - south: True untuk belahan selatan (menimpa huruf di zone jika diberikan)
+        """
+        self.zone, zone_south = parse_zone(zone)
+        self.south = zone_south if south is None else bool(south)
+        self.lon0 = math.radians(6.0 * self.zone - 183.0)
+
+    def inverse(self):
+        return WGS84ToUTM(self.zone, self.south)
+
+    def _apply_block(self, block):
+        x, y = block[:, 0], block[:, 1]
+        scale = _K0 * _RECT_A
+        eta = (x - _FALSE_EASTING) / scale
+        xi = y - (_FALSE_NORTHING_SOUTH if self.south else 0.0)
+        xi /= scale
+
+        # Deret Krüger balik: (xi, eta) -> (xi', eta') pada bola konformal
+        xi_p, eta_p = xi.copy(), eta.copy()
+        for j, b in enumerate(_BETA, start=1):
+            xi_p -= b * np.sin(2 * j * xi) * np.cosh(2 * j * eta)
+            eta_p -= b * np.cos(2 * j * xi) * np.sinh(2 * j * eta)
+
+        sinh_eta = np.sinh(eta_p)
+        cos_xi = np.cos(xi_p)
+        lon = np.arctan2(sinh_eta, cos_xi)
+        tau_p = np.sin(xi_p) / np.hypot(sinh_eta, cos_xi)
+
+        # Lintang konformal -> geodetik: Newton pada tau = tan(lintang)
+        e2m = 1.0 - _E * _E
+        tau = tau_p.copy()
+        for _ in range(3):
+            root = np.sqrt(1.0 + tau * tau)
+            sigma = np.sinh(_E * np.arctanh(_E * tau / root))
+            tau_i = tau * np.sqrt(1.0 + sigma * sigma) - sigma * root
+            tau += ((tau_p - tau_i) / np.sqrt(1.0 + tau_i * tau_i)
+                    * (1.0 + e2m * tau * tau) / (e2m * root))
+
+        x[:] = np.degrees(lon + self.lon0)
+        y[:] = np.degrees(np.arctan(tau))
+
+
+class WGS84ToUTM(Transform):
+    """Bujur/lintang WGS84 (derajat) -> easting/northing UTM (meter)."""
+
+    def __init__(self, zone, south=None):
+        """Parameters sama dengan UTMToWGS84."""
+        self.zone, zone_south = parse_zone(zone)
+        self.south = zone_south if south is None else bool(south)
+        self.lon0 = math.radians(6.0 * self.zone - 183.0)
+
+    def inverse(self):
+        return UTMToWGS84(self.zone, self.south)
+
+    def _apply_block(self, block):
+        x, y = block[:, 0], block[:, 1]
+        lam = np.radians(x) - self.lon0
+        sin_phi = np.sin(np.radians(y))
+
+        # Lintang geodetik -> konformal (tau' = tan lintang konformal)
+        t = np.sinh(np.arctanh(sin_phi) - _E * np.arctanh(_E * sin_phi))
+        xi_p = np.arctan2(t, np.cos(lam))
+        eta_p = np.arctanh(np.sin(lam) / np.sqrt(1.0 + t * t))
+
+        # Deret Krüger maju
+        xi, eta = xi_p.copy(), eta_p.copy()
+        for j, a in enumerate(_ALPHA, start=1):
+            xi += a * np.sin(2 * j * xi_p) * np.cosh(2 * j * eta_p)
+            eta += a * np.cos(2 * j * xi_p) * np.sinh(2 * j * eta_p)
+
+        scale = _K0 * _RECT_A
+        x[:] = _FALSE_EASTING + scale * eta
+        y[:] = scale * xi + (_FALSE_NORTHING_SOUTH if self.south else 0.0)
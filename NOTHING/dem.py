@@ -0,0 +1,73 @@
+# dem.py
+
+import hashlib
+
+import numpy as np
+
+
+class DEM:
+    """
+    Digital Elevation Model: raster ketinggian (numpy array 2D) untuk mengisi
+    nilai Z titik hasil PointGenerator.
+
+    Orientasi seperti GeoTIFF north-up: data[0] adalah baris paling utara
+    (y = ymax) dan data[:, 0] kolom paling barat (x = xmin). Nilai berada di
+    node grid, jadi data[i, j] adalah ketinggian di
+    x = xmin + j * dx, y = ymax - i * dy.
+    """
+
+    def __init__(self, data, xmin, xmax, ymin, ymax):
+        """
+        Parameters:
+        - data: array 2D (baris, kolom) berisi ketinggian, minimal 2 x 2
+        - xmin, xmax, ymin, ymax: koordinat node tepi raster
+        """
+        data = np.asarray(data)
+        if data.ndim != 2 or data.shape[0] < 2 or data.shape[1] < 2:
+            raise ValueError("DEM harus array 2D minimal 2 x 2")
+        if not (xmax > xmin and ymax > ymin):
+            raise ValueError("Batas DEM harus xmax > xmin dan ymax > ymin")
+        self.data = data
+        self.xmin, self.xmax = float(xmin), float(xmax)
+        self.ymin, self.ymax = float(ymin), float(ymax)
+        self.dx = (self.xmax - self.xmin) / (data.shape[1] - 1)
+        self.dy = (self.ymax - self.ymin) / (data.shape[0] - 1)
+
+    @classmethod
+    def from_npy(cls, path, xmin, xmax, ymin, ymax):
+        """Membaca raster dari file .npy (memmap, tidak dimuat penuh ke RAM)."""
+        return cls(np.load(path, mmap_mode='r'), xmin, xmax, ymin, ymax)
+
+    def fingerprint(self):
+        """Hash SHA-256 (hex) dari batas dan isi raster (dibaca per baris), untuk kunci cache."""
+        h = hashlib.sha256(np.array([self.xmin, self.xmax, self.ymin, self.ymax]).tobytes())
+        h.update(repr(self.data.shape).encode())
+        step = max(1, (1 << 22) // max(self.data.shape[1], 1))
+        for start in range(0, self.data.shape[0], step):
+            h.update(np.ascontiguousarray(self.data[start:start + step], dtype='<f8').tobytes())
+        return h.hexdigest()
+
+    def sample(self, x, y):
+        """
+        Ketinggian hasil interpolasi bilinear di (x, y) (array dengan shape sama).
+        Titik di luar raster menghasilkan NaN.
+        """
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        rows, cols = self.data.shape
+
+        fx = (x - self.xmin) / self.dx
+        fy = (self.ymax - y) / self.dy
+        outside = (fx < 0) | (fx > cols - 1) | (fy < 0) | (fy > rows - 1) | np.isnan(fx) | np.isnan(fy)
+
+        # Sel kiri-atas; titik di tepi kanan/bawah memakai sel terakhir
+        j = np.clip(np.floor(np.nan_to_num(fx)), 0, cols - 2).astype(np.int64)
+        i = np.clip(np.floor(np.nan_to_num(fy)), 0, rows - 2).astype(np.int64)
+        tx = fx - j
+        ty = fy - i
+
+        d = self.data
+        top = d[i, j] * (1 - tx) + d[i, j + 1] * tx
+        bottom = d[i + 1, j] * (1 - tx) + d[i + 1, j + 1] * tx
+        z = top * (1 - ty) + bottom * ty
+        return np.where(outside, np.nan, z)
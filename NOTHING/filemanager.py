@@ -1,34 +1,1015 @@
 # filemanager.py
 
-import pandas as pd
+import codecs
+import datetime
+import itertools
+import json
+import os
+import re
+import struct
+
+import numpy as np
+
+import instrument
+from labels import PointLabels
+from quantized import QuantizedPoints
+
+# Panjang header .npy yang dipesan di awal file (kelipatan 64 byte),
+# supaya shape bisa ditulis ulang setelah semua chunk selesai ditulis.
+_NPY_HEADER_LEN = 128
+
+# Header LAS 1.2 (227 byte) dan record point data format 0 (20 byte)
+_LAS_HEADER = struct.Struct('<4sHHIHH8sBB32s32sHHHIIBHI5I3d3d6d')
+_LAS_POINT_DTYPE = np.dtype([
+    ('X', '<i4'), ('Y', '<i4'), ('Z', '<i4'),
+    ('intensity', '<u2'), ('return_flags', 'u1'), ('classification', 'u1'),
+    ('scan_angle', 'i1'), ('user_data', 'u1'), ('point_source_id', '<u2'),
+])
+
+# Lebar kolom jumlah vertex di header PLY, diisi spasi lalu ditimpa di akhir
+_PLY_COUNT_WIDTH = 20
+
+# Ukuran blok teks yang diparse sekaligus saat membaca CSV/TXT
+_CSV_BLOCK_BYTES = 4 * 1024 * 1024
+
+# Nama kolom (huruf kecil) yang dikenali saat membaca CSV/TXT
+_CSV_COLUMNS = {
+    'label': ('label', 'nama', 'name', 'id', 'titik', 'point', 'station', 'stasiun'),
+    'x': ('x', 'easting', 'e', 'lon', 'longitude', 'bujur'),
+    'y': ('y', 'northing', 'n', 'lat', 'latitude', 'lintang'),
+    'z': ('z', 'elevation', 'elevasi', 'elev', 'height', 'h'),
+}
+
+# Format keluaran streaming -> nama method writer
+WRITERS = {
+    'csv': 'save_csv_stream',
+    'npy': 'save_npy',
+    'ply': 'save_ply',
+    'las': 'save_las',
+    'parquet': 'save_parquet',
+    'arrow': 'save_arrow',
+    'feather': 'save_arrow',
+}
+
+# Codec yang didukung per format kolumnar (None = tanpa kompresi)
+_PARQUET_CODECS = ('zstd', 'snappy', 'gzip', 'lz4', 'brotli', None)
+_ARROW_CODECS = ('zstd', 'lz4', None)
 
 class FileManager:
     """
-    Class untuk menyimpan data koordinat ke dalam file CSV.
+    Class untuk menyimpan data koordinat ke file CSV, NPY, PLY, LAS, Parquet
+    atau Arrow/Feather (lihat WRITERS), dan membacanya kembali (load_*).
     """
 
     def __init__(self, points, labels=None):
         """
         Parameters:
-        - points: array numpy (N x 3) berisi X, Y, Z
-        - labels: list opsional berisi nama titik (P1, P2, dst)
+        - points: array numpy (N x 3) berisi X, Y, Z (float64/float32), GridPoints
+          (dihitung per blok) atau QuantizedPoints (kode int32)
+        - labels: list atau PointLabels opsional berisi nama titik (P1, P2, dst)
         """
         self.points = points
         self.labels = labels
 
+    def save(self, filename, fmt=None, **kwargs):
+        """
+        Menyimpan dengan writer streaming sesuai format ('csv', 'npy', 'ply',
+        'las', 'parquet', 'arrow' atau 'feather'; lihat WRITERS).
+        Jika fmt None, format diambil dari ekstensi filename.
+        kwargs diteruskan ke writer (chunks, progress, precision, ...).
+        """
+        if fmt is None:
+            fmt = os.path.splitext(filename)[1].lstrip('.').lower()
+        if fmt not in WRITERS:
+            raise ValueError(f"Format tidak dikenal: {fmt!r}. Pilihan: {', '.join(WRITERS)}")
+        with instrument.span(f"save.{fmt}") as sp:
+            written = getattr(self, WRITERS[fmt])(filename, **kwargs)
+            if instrument.enabled():
+                size = os.path.getsize(filename)
+                sp.set(points=written, bytes=size)
+                instrument.count("save.points", written)
+                instrument.count("save.bytes", size)
+        return written
+
     def save_to_csv(self, filename="koordinat_output.csv"):
         """Menyimpan data ke file CSV dengan header Label, X, Y, Z."""
+        # pandas hanya diimpor saat jalur ini dipakai (startup CLI tetap cepat)
+        import pandas as pd
+
         # Membuat DataFrame dari array numpy
-        df = pd.DataFrame(self.points, columns=['X', 'Y', 'Z'])
+        with instrument.span("csv.dataframe"):
+            df = pd.DataFrame(np.asarray(self.points), columns=['X', 'Y', 'Z'])
 
-        # Tambahkan label jika tersedia
-        if self.labels is not None and len(self.labels) == len(df):
-            df.insert(0, 'Label', self.labels)
-        else:
-            df.insert(0, 'Label', [f'P{i+1}' for i in range(len(df))])
+            # Tambahkan label jika tersedia
+            labels = self.labels
+            if labels is not None and len(labels) != len(df):
+                labels = None
+            df.insert(0, 'Label', np.asarray(PointLabels.coerce(labels, len(df))))
 
         # Simpan ke file CSV
-        df.to_csv(filename, index=False)
+        with instrument.span("csv.write", rows=len(df)):
+            df.to_csv(filename, index=False)
+        if instrument.enabled():
+            instrument.count("save.points", len(df))
+            instrument.count("save.bytes", os.path.getsize(filename))
 
         # Konfirmasi sukses
         print(f"✅ File CSV berhasil disimpan: {filename}")
+
+    def save_csv_stream(self, filename="koordinat_output.csv", chunks=None,
+                        precision=None, chunk_size=100_000, progress=None, transform=None):
+        """
+        Menyimpan data ke CSV (Label, X, Y, Z) secara streaming per blok.
+
+        Parameters:
+        - chunks: iterable opsional berisi array (m x 3), misalnya dari
+          PointGenerator.iter_chunks(). Jika None, self.points dipotong per blok.
+        - precision: jumlah digit desimal; None = representasi float terpendek
+          (sama dengan keluaran save_to_csv; float32 memakai representasi
+          float32 terpendek, QuantizedPoints memakai digit sesuai scale)
+        - chunk_size: jumlah baris per blok saat memotong self.points
+        - progress: callback opsional progress(baris_tertulis, total_atau_None)
+        - transform: transformasi CRS opsional (crs.Transform, misalnya
+          crs.UTMToWGS84) yang diterapkan per blok saat menulis; data sumber
+          tidak diubah
+
+        Setiap blok diformat sekaligus dengan satu operasi string, sehingga
+        memori yang dipakai hanya sebanding dengan ukuran blok.
+        Mengembalikan jumlah baris yang ditulis.
+        """
+        labels = self.labels
+        total = None
+        if chunks is None:
+            # Sama seperti save_to_csv: label dipakai hanya jika jumlahnya cocok
+            if labels is not None and len(labels) != len(self.points):
+                labels = None
+            total = len(self.points)
+            chunks = self._iter_point_blocks(chunk_size)
+        if labels is not None:
+            labels = PointLabels.from_sequence(labels)
+
+        fixed = None if precision is None else f"%.{int(precision)}f"
+        written = 0
+
+        with open(filename, "w", encoding="utf-8", newline="") as f:
+            f.write("Label,X,Y,Z\n")
+            for block in self._checked_blocks(chunks, progress, total, transform, native=True):
+                if isinstance(block, QuantizedPoints):
+                    num_fmt = fixed or f"%.{block.decimals}f"
+                    block = np.asarray(block)
+                elif block.dtype == np.float32 and fixed is None:
+                    num_fmt = "%s"
+                else:
+                    num_fmt = fixed or "%r"
+                m = block.shape[0]
+                if labels is not None and len(labels) < written + m:
+                    raise ValueError("Jumlah label lebih sedikit dari jumlah titik")
+                f.write(self._format_csv_block(block, labels, written, num_fmt))
+                written += m
+
+        print(f"✅ File CSV berhasil disimpan: {filename}")
+        return written
+
+    def _iter_point_blocks(self, chunk_size):
+        """Memotong self.points menjadi blok berukuran maksimal chunk_size baris."""
+        chunk_size = int(chunk_size)
+        if chunk_size <= 0:
+            raise ValueError("chunk_size harus > 0")
+        if isinstance(self.points, QuantizedPoints):
+            # Kode int32 diteruskan apa adanya (writer LAS/Parquet menulisnya langsung)
+            yield from self.points.iter_chunks(chunk_size)
+            return
+        n = len(self.points)
+        for start in range(0, n, chunk_size):
+            yield self.points[start:start + chunk_size]
+
+    @staticmethod
+    def _checked_blocks(chunks, progress=None, total=None, transform=None, native=False):
+        """
+        Memvalidasi setiap chunk (m x 3) dan melewati chunk kosong.
+        progress(selesai, total) dipanggil setelah pemakai selesai memproses
+        sebuah blok (yaitu saat blok berikutnya diminta).
+
+        Dengan transform, setiap blok disalin ke satu buffer float64 yang
+        dipakai ulang lalu ditransformasi in place, sehingga memori tambahan
+        hanya sebesar satu blok dan data sumber tidak berubah.
+
+        Chunk QuantizedPoints dijadikan float64 per blok, kecuali native=True
+        (writer yang menangani kode int32 sendiri) dan tanpa transform.
+        Chunk float32 diteruskan tanpa konversi.
+        """
+        done = 0
+        buffer = None
+        for block in chunks:
+            quantized = isinstance(block, QuantizedPoints)
+            if not quantized:
+                block = np.asarray(block)
+            if block.ndim != 2 or block.shape[1] != 3:
+                raise ValueError("Setiap chunk harus array shape (m,3)")
+            if block.shape[0] == 0:
+                continue
+            if transform is not None:
+                if buffer is None or len(buffer) < block.shape[0]:
+                    buffer = np.empty((block.shape[0], 3), dtype=float)
+                out = buffer[:block.shape[0]]
+                if quantized:
+                    block.block(0, len(block), out=out)
+                else:
+                    np.copyto(out, block, casting='unsafe')
+                block = transform.apply(out)
+            elif quantized and not native:
+                block = np.asarray(block)
+            yield block
+            done += block.shape[0]
+            if progress is not None:
+                progress(done, total)
+
+    @staticmethod
+    def _format_csv_block(block, labels, offset, num_fmt):
+        """
+        Memformat satu blok titik (baris offset..offset+m) menjadi teks CSV.
+
+        Kolom diubah ke list Python sekaligus (tolist, di C) lalu dijalin per
+        baris dengan zip/chain (juga di C) untuk satu operasi % pada pola
+        baris; tanpa array object perantara. Sisa biayanya hampir seluruhnya
+        format angka itu sendiri (repr float untuk %r).
+        """
+        m = block.shape[0]
+        if labels is None or labels.is_default:
+            # Label default cukup ditulis sebagai prefix + nomor (%d)
+            prefix, first = ("P", 1) if labels is None else (labels.prefix, labels.start)
+            names = range(offset + first, offset + first + m)
+            label_fmt = prefix.replace("%", "%%") + "%d"
+        else:
+            names = labels.strings(offset, offset + m)
+            label_fmt = "%s"
+
+        # tolist memberi float Python, sehingga %r menghasilkan angka biasa;
+        # "%s": float32 diubah ke teks terpendek float32 (bukan float64 panjang)
+        columns = (block.astype(str) if num_fmt == "%s" else block).T.tolist()
+        row_fmt = f"{label_fmt},{num_fmt},{num_fmt},{num_fmt}\n"
+        return (row_fmt * m) % tuple(itertools.chain.from_iterable(zip(names, *columns)))
+
+    # -----------------------
+    # Format biner
+    # -----------------------
+    def save_npy(self, filename="koordinat_output.npy", chunks=None, chunk_size=1_000_000,
+                 progress=None, transform=None):
+        """
+        Menyimpan titik sebagai file .npy (array N x 3) tanpa konversi ke teks.
+
+        Data ditulis per blok langsung dari buffer numpy; shape di header
+        ditulis ulang setelah chunk terakhir, sehingga iterator dengan
+        jumlah titik yang belum diketahui juga bisa dipakai.
+        Baca kembali secara zero-copy dengan FileManager.load_npy().
+        dtype file mengikuti chunk (float32 tetap float32); QuantizedPoints
+        ditulis sebagai float64 karena .npy tidak menyimpan scale/offset.
+        progress, transform: opsional, sama seperti save_csv_stream.
+        Mengembalikan jumlah titik yang ditulis.
+        """
+        total = None
+        if chunks is None:
+            total = len(self.points)
+            chunks = self._iter_point_blocks(chunk_size)
+
+        written = 0
+        dtype = None
+        with open(filename, "wb") as f:
+            f.write(b"\0" * _NPY_HEADER_LEN)
+            for block in self._checked_blocks(chunks, progress, total, transform):
+                if dtype is None:
+                    dtype = block.dtype.newbyteorder('<')
+                block = np.ascontiguousarray(block, dtype=dtype)
+                f.write(block.data)
+                written += block.shape[0]
+
+            f.seek(0)
+            f.write(self._npy_header(dtype if dtype is not None else np.dtype('<f8'), written))
+
+        print(f"✅ File NPY berhasil disimpan: {filename}")
+        return written
+
+    def save_ply(self, filename="koordinat_output.ply", chunks=None, chunk_size=1_000_000,
+                 progress=None, transform=None):
+        """
+        Menyimpan titik sebagai PLY biner little-endian (property double x, y, z;
+        property float jika chunk float32).
+        Baca kembali secara zero-copy dengan FileManager.load_ply().
+        progress, transform: opsional, sama seperti save_csv_stream.
+        Mengembalikan jumlah titik yang ditulis.
+        """
+        total = None
+        if chunks is None:
+            total = len(self.points)
+            chunks = self._iter_point_blocks(chunk_size)
+
+        written = 0
+        blocks = self._checked_blocks(chunks, progress, total, transform)
+        # Tipe property ditentukan chunk pertama (header ditulis ulang dengan panjang sama)
+        first = next(blocks, None)
+        dtype = np.dtype('<f4') if first is not None and first.dtype == np.float32 else np.dtype('<f8')
+        with open(filename, "wb") as f:
+            f.write(self._ply_header(0, dtype))
+            for block in itertools.chain(() if first is None else (first,), blocks):
+                block = np.ascontiguousarray(block, dtype=dtype)
+                f.write(block.data)
+                written += block.shape[0]
+
+            f.seek(0)
+            f.write(self._ply_header(written, dtype))
+
+        print(f"✅ File PLY berhasil disimpan: {filename}")
+        return written
+
+    def save_las(self, filename="koordinat_output.las", chunks=None, chunk_size=1_000_000,
+                 scale=None, offset=None, progress=None, transform=None):
+        """
+        Menyimpan titik dalam format LAS 1.2 (point data format 0).
+
+        Koordinat disimpan sebagai int32: nilai = (koordinat - offset) / scale.
+        - scale: resolusi koordinat (default 0.001 = milimeter)
+        - offset: titik acuan (x, y, z); default = minimum chunk pertama
+        Chunk QuantizedPoints (tanpa transform) ditulis langsung sebagai kode
+        int32-nya; scale/offset default mengikuti chunk tersebut.
+        - progress, transform: opsional, sama seperti save_csv_stream
+          (dengan transform ke derajat, scale perlu diperkecil, mis. 1e-7)
+
+        Baca kembali dengan FileManager.load_las().
+        Mengembalikan jumlah titik yang ditulis.
+        """
+        total = None
+        if chunks is None:
+            total = len(self.points)
+            chunks = self._iter_point_blocks(chunk_size)
+
+        if scale is not None:
+            scale = np.broadcast_to(np.asarray(scale, dtype=float), (3,))
+        if offset is not None:
+            offset = np.broadcast_to(np.asarray(offset, dtype=float), (3,))
+
+        written = 0
+        lo = np.full(3, np.inf)
+        hi = np.full(3, -np.inf)
+        int32 = np.iinfo(np.int32)
+
+        with open(filename, "wb") as f:
+            f.write(b"\0" * _LAS_HEADER.size)
+            for block in self._checked_blocks(chunks, progress, total, transform, native=True):
+                if isinstance(block, QuantizedPoints):
+                    if scale is None and offset is None:
+                        scale, offset = block.scale, block.offset
+                    if np.array_equal(block.scale, scale) and np.array_equal(block.offset, offset):
+                        # Kode int32 sudah sesuai header: tanpa konversi float
+                        scaled = block.data
+                        block_lo, block_hi = block.bounds()
+                    else:
+                        block = np.asarray(block)
+                if not isinstance(block, QuantizedPoints):
+                    if scale is None:
+                        scale = np.full(3, 0.001)
+                    if offset is None:
+                        offset = np.floor(block.min(axis=0))
+                    scaled = np.rint((block - offset) / scale)
+                    if scaled.min() < int32.min or scaled.max() > int32.max:
+                        raise ValueError("Koordinat di luar jangkauan int32; perbesar scale atau ubah offset")
+                    block_lo, block_hi = block.min(axis=0), block.max(axis=0)
+
+                rec = np.zeros(block.shape[0], dtype=_LAS_POINT_DTYPE)
+                rec['X'], rec['Y'], rec['Z'] = scaled.T
+                # return number 1 dari 1
+                rec['return_flags'] = 0b001001
+                f.write(rec.data)
+
+                lo = np.minimum(lo, block_lo)
+                hi = np.maximum(hi, block_hi)
+                written += block.shape[0]
+
+            if written > np.iinfo(np.uint32).max:
+                raise ValueError("LAS 1.2 maksimal 4.294.967.295 titik")
+            if scale is None:
+                scale = np.full(3, 0.001)
+            if written == 0:
+                lo = hi = offset = np.zeros(3)
+
+            f.seek(0)
+            f.write(self._las_header(written, scale, offset, lo, hi))
+
+        print(f"✅ File LAS berhasil disimpan: {filename}")
+        return written
+
+    # -----------------------
+    # Format kolumnar (pyarrow opsional)
+    # -----------------------
+    def save_parquet(self, filename="koordinat_output.parquet", chunks=None, chunk_size=1_000_000,
+                     dtype=None, label_mode='auto', compression='zstd',
+                     progress=None, transform=None):
+        """
+        Menyimpan titik sebagai Parquet (kolom X, Y, Z [, Label]).
+        Setiap chunk ditulis sebagai satu row group, jadi tabel penuh tidak
+        pernah ada di memori. Membutuhkan paket pyarrow.
+
+        Parameters:
+        - dtype: 'float64' atau 'float32' untuk kolom X, Y, Z; None = mengikuti
+          chunk (float32 tetap float32; QuantizedPoints ditulis sebagai kolom
+          int32 dengan scale/offset di metadata dan dibaca kembali sebagai
+          QuantizedPoints)
+        - label_mode: 'auto' (label default P1, P2, ... tidak ditulis, cukup
+          prefix/nomor awal di metadata; label kustom ditulis), 'include'
+          (selalu ditulis) atau 'omit'. Di Parquet kolom Label disimpan
+          dictionary-encoded; kolom koordinat tidak (angka unik, hanya memperlambat)
+        - compression: 'zstd', 'snappy', 'gzip', 'lz4', 'brotli' atau None
+        - progress, transform: opsional, sama seperti save_csv_stream
+
+        Baca kembali dengan FileManager.load_parquet().
+        Mengembalikan jumlah titik yang ditulis.
+        """
+        if compression not in _PARQUET_CODECS:
+            raise ValueError(f"Kompresi Parquet tidak dikenal: {compression!r}")
+        pa = _require_pyarrow()
+        import pyarrow.parquet as pq
+
+        def open_writer(schema):
+            use_dictionary = ['Label'] if 'Label' in schema.names else False
+            return pq.ParquetWriter(filename, schema, compression=compression or 'none',
+                                    use_dictionary=use_dictionary)
+
+        written = self._write_columnar(open_writer, pa, chunks, chunk_size, dtype, label_mode,
+                                       progress, transform)
+        print(f"✅ File Parquet berhasil disimpan: {filename}")
+        return written
+
+    def save_arrow(self, filename="koordinat_output.arrow", chunks=None, chunk_size=1_000_000,
+                   dtype=None, label_mode='auto', compression='zstd',
+                   progress=None, transform=None):
+        """
+        Menyimpan titik sebagai file Arrow IPC (Feather v2), satu record batch
+        per chunk. Parameter sama dengan save_parquet; kompresi IPC hanya
+        'zstd', 'lz4' atau None. Kolom Label ditulis sebagai string biasa:
+        file IPC tidak mendukung dictionary yang berganti antar batch.
+        File tanpa kompresi bisa dibaca zero-copy (memory map) dengan
+        FileManager.load_arrow().
+        Mengembalikan jumlah titik yang ditulis.
+        """
+        if compression not in _ARROW_CODECS:
+            raise ValueError(f"Kompresi Arrow IPC harus 'zstd', 'lz4' atau None, bukan {compression!r}")
+        pa = _require_pyarrow()
+        codec = {'lz4': 'lz4_frame'}.get(compression, compression)
+        sink = []
+
+        def open_writer(schema):
+            sink.append(pa.OSFile(filename, 'wb'))
+            options = pa.ipc.IpcWriteOptions(compression=codec)
+            return pa.ipc.new_file(sink[0], schema, options=options)
+
+        try:
+            written = self._write_columnar(open_writer, pa, chunks, chunk_size, dtype, label_mode,
+                                           progress, transform)
+        finally:
+            if sink:
+                sink[0].close()
+        print(f"✅ File Arrow berhasil disimpan: {filename}")
+        return written
+
+    def _write_columnar(self, open_writer, pa, chunks, chunk_size, dtype, label_mode,
+                        progress, transform):
+        """Menulis chunk sebagai record batch lewat writer Parquet/IPC dari open_writer(schema)."""
+        if dtype is not None:
+            dtype = np.dtype(dtype)
+            if dtype not in (np.float32, np.float64):
+                raise ValueError("dtype harus 'float32' atau 'float64'")
+        if label_mode not in ('auto', 'include', 'omit'):
+            raise ValueError("label_mode harus 'auto', 'include' atau 'omit'")
+
+        labels = self.labels
+        total = None
+        if chunks is None:
+            if labels is not None and len(labels) != len(self.points):
+                labels = None
+            total = len(self.points)
+            chunks = self._iter_point_blocks(chunk_size)
+        if labels is not None:
+            labels = PointLabels.from_sequence(labels)
+
+        # Label default cukup dicatat di metadata (prefix + nomor awal)
+        default = labels is None or labels.is_default
+        write_labels = label_mode == 'include' or (label_mode == 'auto' and not default)
+        prefix, start = ("P", 1) if labels is None or not labels.is_default else (labels.prefix, labels.start)
+
+        # Tipe kolom dari dtype, atau dari chunk pertama jika dtype None
+        blocks = self._checked_blocks(chunks, progress, total, transform, native=dtype is None)
+        first = next(blocks, None)
+        quant = None
+        if dtype is None:
+            if isinstance(first, QuantizedPoints):
+                quant = (first.scale, first.offset)
+                dtype = np.dtype(np.int32)
+            else:
+                dtype = np.dtype(np.float32 if first is not None and first.dtype == np.float32
+                                 else np.float64)
+        coord_type = {np.float32: pa.float32(), np.int32: pa.int32()}.get(dtype.type, pa.float64())
+
+        fields = [pa.field(name, coord_type) for name in ('X', 'Y', 'Z')]
+        if write_labels:
+            fields.append(pa.field('Label', pa.string()))
+        metadata = {}
+        if default:
+            metadata.update({b'label_prefix': prefix.encode('utf-8'), b'label_start': str(start).encode()})
+        if quant is not None:
+            metadata.update({b'quant_scale': json.dumps(quant[0].tolist()).encode(),
+                             b'quant_offset': json.dumps(quant[1].tolist()).encode()})
+        schema = pa.schema(fields, metadata=metadata or None)
+
+        written = 0
+        writer = open_writer(schema)
+        try:
+            for block in itertools.chain(() if first is None else (first,), blocks):
+                m = block.shape[0]
+                if quant is not None:
+                    if not (isinstance(block, QuantizedPoints) and np.array_equal(block.scale, quant[0])
+                            and np.array_equal(block.offset, quant[1])):
+                        raise ValueError("Semua chunk harus QuantizedPoints dengan scale/offset yang sama")
+                    block = block.data
+                elif isinstance(block, QuantizedPoints):
+                    block = np.asarray(block)
+                # Satu salinan kolom-mayor (sekaligus konversi dtype), lalu zero-copy ke Arrow
+                cols = np.ascontiguousarray(block.T, dtype=dtype)
+                arrays = [pa.array(cols[i]) for i in range(3)]
+                if write_labels:
+                    if labels is None:
+                        names = np.char.add(prefix, np.arange(start + written, start + written + m).astype(str))
+                    else:
+                        if len(labels) < written + m:
+                            raise ValueError("Jumlah label lebih sedikit dari jumlah titik")
+                        names = labels.block(written, written + m)
+                    arrays.append(pa.array(names, type=pa.string()))
+                writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=schema))
+                written += m
+        finally:
+            writer.close()
+        return written
+
+    @staticmethod
+    def load_parquet(filename):
+        """
+        Membaca file hasil save_parquet. Mengembalikan tuple (points, labels):
+        array (N, 3) dengan dtype seperti di file, dan PointLabels.
+        """
+        _require_pyarrow()
+        import pyarrow.parquet as pq
+        return _table_points(pq.read_table(filename))
+
+    @staticmethod
+    def load_arrow(filename):
+        """
+        Membaca file hasil save_arrow (memory map; tanpa kompresi tidak ada
+        salinan saat membaca kolom). Mengembalikan tuple (points, labels).
+        """
+        pa = _require_pyarrow()
+        with pa.memory_map(filename, 'r') as source:
+            table = pa.ipc.open_file(source).read_all()
+        return _table_points(table)
+
+    @staticmethod
+    def load_npy(filename):
+        """Membuka file .npy sebagai np.memmap read-only (tanpa menyalin data)."""
+        return np.load(filename, mmap_mode='r')
+
+    @staticmethod
+    def load_ply(filename):
+        """
+        Membuka file PLY biner little-endian hasil save_ply sebagai np.memmap
+        read-only shape (N, 3) (float64, atau float32 untuk property float).
+        """
+        count = None
+        dtype = np.dtype('<f8')
+        with open(filename, "rb") as f:
+            if f.readline().strip() != b"ply":
+                raise ValueError("Bukan file PLY")
+            while True:
+                line = f.readline()
+                if not line:
+                    raise ValueError("Header PLY tidak lengkap")
+                words = line.split()
+                if words[:1] == [b"format"] and words[1] != b"binary_little_endian":
+                    raise ValueError("Hanya PLY binary_little_endian yang didukung")
+                if words[:2] == [b"element", b"vertex"]:
+                    count = int(words[2])
+                if words[:2] == [b"property", b"float"]:
+                    dtype = np.dtype('<f4')
+                if words[:1] == [b"end_header"]:
+                    offset = f.tell()
+                    break
+
+        if count is None:
+            raise ValueError("Header PLY tidak memiliki element vertex")
+        if count == 0:
+            return np.empty((0, 3), dtype=dtype)
+        return np.memmap(filename, dtype=dtype, mode='r', offset=offset, shape=(count, 3))
+
+    @staticmethod
+    def load_las(filename):
+        """
+        Membuka file LAS hasil save_las.
+        Mengembalikan tuple (records, header):
+        - records: np.memmap structured (field X, Y, Z int32, dst.) tanpa menyalin data
+        - header: dict berisi count, scale, offset, min, max
+
+        Koordinat asli: records['X'] * header['scale'][0] + header['offset'][0]
+        """
+        with open(filename, "rb") as f:
+            raw = f.read(_LAS_HEADER.size)
+        fields = _LAS_HEADER.unpack(raw)
+        if fields[0] != b"LASF":
+            raise ValueError("Bukan file LAS")
+
+        data_offset, record_len, count = fields[14], fields[17], fields[18]
+        if record_len != _LAS_POINT_DTYPE.itemsize:
+            raise ValueError("Hanya LAS point data format 0 yang didukung")
+
+        bounds = fields[30:36]
+        header = {
+            'count': count,
+            'scale': np.array(fields[24:27]),
+            'offset': np.array(fields[27:30]),
+            'min': np.array(bounds[1::2]),
+            'max': np.array(bounds[0::2]),
+        }
+        if count == 0:
+            return np.zeros(0, dtype=_LAS_POINT_DTYPE), header
+        records = np.memmap(filename, dtype=_LAS_POINT_DTYPE, mode='r',
+                            offset=data_offset, shape=(count,))
+        return records, header
+
+    # -----------------------
+    # Import CSV/TXT
+    # -----------------------
+    @staticmethod
+    def load_csv(filename, progress=None):
+        """
+        Membaca file koordinat teks (Label/Nama, X, Y[, Z]), misalnya hasil
+        save_to_csv / save_csv_stream atau Save Data PointApp.
+
+        Pemisah (koma, titik koma, tab, spasi) dan header dideteksi otomatis;
+        tanpa kolom Z, Z = 0. Label berbentuk prefix + nomor berurutan
+        (P1, P2, ...) dikenali sebagai label default dan tidak disimpan.
+        progress: callback opsional progress(byte_terbaca, total_byte).
+
+        Mengembalikan tuple (points, labels): array float64 (N, 3) yang bisa
+        langsung dipakai PointVisualizer, KDTree dan FileManager, dan PointLabels.
+        """
+        blocks = []
+        label_blocks = []
+        default = None      # (prefix, start) selama label masih berurutan
+        count = 0
+        for points, labels in FileManager.iter_csv(filename, progress=progress):
+            if labels is not None and (count == 0 or default is not None):
+                run = _default_label_run(labels)
+                if count == 0:
+                    default = run
+                elif run != (default[0], default[1] + count):
+                    default = None
+            blocks.append(points)
+            label_blocks.append(labels)
+            count += len(points)
+
+        points = np.concatenate(blocks) if blocks else np.empty((0, 3))
+        if not label_blocks or label_blocks[0] is None:
+            labels = PointLabels(count)
+        elif default is not None:
+            labels = PointLabels(count, prefix=default[0], start=default[1])
+        else:
+            labels = PointLabels.from_sequence(np.concatenate(label_blocks))
+        return points, labels
+
+    @staticmethod
+    def iter_csv(filename, block_bytes=_CSV_BLOCK_BYTES, progress=None):
+        """
+        Membaca file koordinat teks per blok (memori sebanding block_bytes).
+        Menghasilkan tuple (points, labels) per blok: array float64 (m, 3)
+        dan array string label (m,) atau None jika file tanpa kolom label.
+
+        Memakai pyarrow.csv jika terpasang (dan pemisah bukan spasi), selain
+        itu np.loadtxt per blok baris; keduanya tanpa loop Python per baris.
+        """
+        layout = _csv_layout(filename)
+        total = os.path.getsize(filename)
+        try:
+            from pyarrow import csv as pa_csv
+        except ImportError:
+            pa_csv = None
+        if pa_csv is not None and layout['delimiter'] is not None:
+            blocks = _iter_csv_arrow(pa_csv, filename, layout, block_bytes)
+        else:
+            blocks = _iter_csv_numpy(filename, layout, block_bytes)
+        for points, labels, position in blocks:
+            if len(points):
+                yield points, labels
+            if progress is not None:
+                progress(position, total)
+
+    @staticmethod
+    def _npy_header(dtype, count):
+        """Header .npy versi 1.0 dengan panjang tetap _NPY_HEADER_LEN."""
+        info = {
+            'descr': np.lib.format.dtype_to_descr(dtype),
+            'fortran_order': False,
+            'shape': (count, 3),
+        }
+        text = repr(info).ljust(_NPY_HEADER_LEN - 11) + "\n"
+        return b"\x93NUMPY\x01\x00" + struct.pack('<H', len(text)) + text.encode('latin1')
+
+    @staticmethod
+    def _ply_header(count, dtype=np.dtype('<f8')):
+        """Header PLY dengan kolom jumlah vertex selebar _PLY_COUNT_WIDTH."""
+        kind = "float" if dtype == np.float32 else "double"
+        return (
+            "ply\n"
+            "format binary_little_endian 1.0\n"
+            "comment Koordinat Point Generator\n"
+            f"element vertex {count:<{_PLY_COUNT_WIDTH}}\n"
+            f"property {kind} x\n"
+            f"property {kind} y\n"
+            f"property {kind} z\n"
+            "end_header\n"
+        ).encode('ascii')
+
+    @staticmethod
+    def _las_header(count, scale, offset, lo, hi):
+        """Header LAS 1.2 (227 byte) untuk point data format 0."""
+        today = datetime.date.today()
+        return _LAS_HEADER.pack(
+            b"LASF", 0, 0, 0, 0, 0, b"\0" * 8, 1, 2,
+            b"Koordinat Point Generator", b"filemanager.py",
+            today.timetuple().tm_yday, today.year,
+            _LAS_HEADER.size, _LAS_HEADER.size, 0,
+            0, _LAS_POINT_DTYPE.itemsize, count,
+            count, 0, 0, 0, 0,
+            *scale, *offset,
+            hi[0], lo[0], hi[1], lo[1], hi[2], lo[2],
+        )
+
+
+def _require_pyarrow():
+    """Mengimpor pyarrow (dependensi opsional) dengan pesan yang jelas jika tidak ada."""
+    try:
+        import pyarrow as pa
+        import pyarrow.ipc  # noqa: F401  (submodul tidak selalu diimpor otomatis)
+    except ImportError:
+        raise ImportError("Format Parquet/Arrow membutuhkan paket pyarrow (pip install pyarrow)") from None
+    return pa
+
+
+def _table_points(table):
+    """
+    (points (N, 3), PointLabels) dari tabel Arrow dengan kolom X, Y, Z [, Label].
+    Kolom int32 dengan scale/offset di metadata menjadi QuantizedPoints.
+    """
+    n = table.num_rows
+    meta = table.schema.metadata or {}
+    first = table.schema.field('X').type.to_pandas_dtype()
+    points = np.empty((n, 3), dtype=first)
+    for i, name in enumerate(('X', 'Y', 'Z')):
+        points[:, i] = table.column(name).to_numpy()
+    if b'quant_scale' in meta:
+        points = QuantizedPoints(points, json.loads(meta[b'quant_scale']), json.loads(meta[b'quant_offset']))
+
+    if 'Label' in table.column_names:
+        labels = table.column('Label').to_numpy(zero_copy_only=False).astype(str)
+        run = _default_label_run(labels)
+        if run is not None:
+            return points, PointLabels(n, prefix=run[0], start=run[1])
+        return points, PointLabels.from_sequence(labels)
+
+    prefix = meta.get(b'label_prefix', b'P').decode('utf-8')
+    start = int(meta.get(b'label_start', b'1'))
+    return points, PointLabels(n, prefix=prefix, start=start)
+
+
+def _csv_layout(filename):
+    """
+    Deteksi format file koordinat teks dari baris pertama (dan kedua).
+    Mengembalikan dict: delimiter (None = spasi), header (bool), dan indeks
+    kolom label/x/y/z (label dan z boleh None).
+    """
+    with open(filename, encoding='utf-8-sig') as f:
+        first = f.readline()
+        second = f.readline()
+    if not first.strip():
+        raise ValueError("File kosong")
+    delimiter = next((d for d in (',', ';', '\t') if d in first), None)
+
+    def split(line):
+        return [c.strip().strip('"') for c in line.split(delimiter)]
+
+    def numeric(fields):
+        flags = []
+        for c in fields:
+            try:
+                float(c)
+                flags.append(True)
+            except ValueError:
+                flags.append(False)
+        return flags
+
+    fields = split(first)
+    header = sum(numeric(fields)) < 2
+    layout = {'delimiter': delimiter, 'header': header, 'skip_bytes': 0,
+              'label': None, 'x': None, 'y': None, 'z': None}
+
+    if header:
+        names = [c.lower() for c in fields]
+        for key, aliases in _CSV_COLUMNS.items():
+            layout[key] = next((names.index(a) for a in aliases if a in names), None)
+        with open(filename, 'rb') as f:
+            f.readline()
+            layout['skip_bytes'] = f.tell()
+        data = split(second) if second.strip() else None
+    else:
+        data = fields
+
+    if layout['x'] is None or layout['y'] is None:
+        # Tanpa nama kolom: label = kolom teks pertama, X/Y/Z = kolom angka pertama
+        if data is None:
+            raise ValueError("Kolom X dan Y tidak ditemukan")
+        flags = numeric(data)
+        num_cols = [i for i, ok in enumerate(flags) if ok]
+        text_cols = [i for i, ok in enumerate(flags) if not ok]
+        if len(num_cols) < 2:
+            raise ValueError("Kolom X dan Y tidak ditemukan")
+        layout['x'], layout['y'] = num_cols[:2]
+        layout['z'] = num_cols[2] if len(num_cols) > 2 else None
+        layout['label'] = text_cols[0] if text_cols else None
+    return layout
+
+
+def _csv_block_points(columns, layout):
+    """Menyusun array (m, 3) dari kolom x, y, [z] (hasil parse satu blok)."""
+    x = columns[0]
+    points = np.zeros((len(x), 3), dtype=float)
+    points[:, 0] = x
+    points[:, 1] = columns[1]
+    if layout['z'] is not None:
+        points[:, 2] = columns[2]
+    return points
+
+
+def _csv_text_column(data, column, delimiter):
+    """
+    Kolom teks ke-column dari blok bytes CSV tanpa parse ulang: posisi
+    pemisah dan akhir baris dicari sekali (np.flatnonzero), lalu byte kolom
+    diambil per posisi karakter untuk semua baris sekaligus.
+
+    Hanya untuk blok "polos": ASCII, tanpa tanda kutip, komentar atau baris
+    kosong, dan jumlah kolom sama di setiap baris; data diakhiri newline.
+    Selain itu None (pemanggil kembali ke np.loadtxt).
+    """
+    if b'"' in data or b'#' in data:
+        return None
+    buf = np.frombuffer(data, dtype=np.uint8)
+    if buf.max() >= 0x80:
+        return None
+
+    ends = np.flatnonzero(buf == ord('\n'))
+    starts = np.concatenate(([0], ends[:-1] + 1))
+    if (ends - starts - (buf[ends - 1] == ord('\r')) <= 0).any():
+        return None
+    bounds = np.flatnonzero((buf == ord(delimiter)) | (buf == ord('\n')))
+    if len(bounds) % len(ends):
+        return None
+    bounds = bounds.reshape(len(ends), -1)
+    if column >= bounds.shape[1] or (bounds[:, -1] != ends).any():
+        return None
+
+    first = starts if column == 0 else bounds[:, column - 1] + 1
+    last = bounds[:, column]
+    last = last - ((last > first) & (buf[last - 1] == ord('\r')))
+    width = int((last - first).max()) if len(first) else 0
+    field = np.zeros((len(first), max(width, 1)), dtype=np.uint8)
+    for j in range(width):
+        inside = first + j < last
+        field[inside, j] = buf[first[inside] + j]
+    return field.view(f"S{field.shape[1]}").ravel().astype(str)
+
+
+def _csv_byte_blocks(filename, layout, block_bytes):
+    """
+    Isi file setelah header per blok sekitar block_bytes yang dipotong di akhir
+    baris (BOM UTF-8 dibuang). Menghasilkan (bytes_blok, posisi_byte): posisi
+    adalah byte file yang sudah habis diparse setelah blok ini.
+    """
+    with open(filename, 'rb') as f:
+        f.seek(layout['skip_bytes'])
+        rest = b''
+        while True:
+            data = f.read(block_bytes)
+            if data:
+                data = rest + data
+                cut = data.rfind(b'\n') + 1
+                if cut == 0:
+                    rest = data
+                    continue
+                data, rest = data[:cut], data[cut:]
+            elif rest.strip():
+                # Baris terakhir tanpa newline
+                data, rest = rest + b'\n', b''
+            else:
+                break
+            if data.startswith(codecs.BOM_UTF8):
+                data = data[len(codecs.BOM_UTF8):]
+            yield data, f.tell() - len(rest)
+
+
+def _iter_csv_numpy(filename, layout, block_bytes):
+    """
+    Parser numpy: setiap blok baris diparse sekali dengan np.loadtxt (parser C).
+    Kolom label diambil langsung dari bytes blok (_csv_text_column); blok yang
+    tidak polos diparse sekali sebagai array terstruktur (label + angka).
+    Menghasilkan (points, labels, posisi_byte).
+    """
+    usecols = [layout['x'], layout['y']] + ([layout['z']] if layout['z'] is not None else [])
+    delimiter = layout['delimiter']
+    label = layout['label']
+    for data, position in _csv_byte_blocks(filename, layout, block_bytes):
+        labels = None
+        if label is not None and delimiter is not None:
+            labels = _csv_text_column(data, label, delimiter)
+        lines = data.decode('utf-8').splitlines()
+        if label is None or labels is not None:
+            columns = np.loadtxt(lines, delimiter=delimiter, usecols=usecols,
+                                 ndmin=2, dtype=float, quotechar='"').T
+        else:
+            # Label dan angka dalam satu parse; lebar label <= panjang baris
+            width = max(map(len, lines), default=1)
+            dtype = np.dtype([('label', f"U{width}"), ('xyz', float, (len(usecols),))])
+            table = np.loadtxt(lines, delimiter=delimiter, usecols=[label] + usecols,
+                               ndmin=1, dtype=dtype, quotechar='"')
+            labels = table['label']
+            columns = table['xyz'].T
+        yield _csv_block_points(columns, layout), labels, position
+
+
+def _iter_csv_arrow(pa_csv, filename, layout, block_bytes):
+    """
+    Parser pyarrow.csv (multi-thread) per blok baris dari _csv_byte_blocks,
+    sehingga posisi progress adalah byte file yang sudah diparse (reader
+    streaming pyarrow membaca jauh ke depan dan ukuran batch Arrow adalah
+    ukuran hasil decode, keduanya tidak cocok untuk progress).
+    Menghasilkan (points, labels, posisi_byte).
+    """
+    import pyarrow as pa
+
+    wanted = [layout['x'], layout['y']] + ([layout['z']] if layout['z'] is not None else [])
+    names = [f"f{i}" for i in wanted]
+    types = {name: pa.float64() for name in names}
+    if layout['label'] is not None:
+        types[f"f{layout['label']}"] = pa.string()
+
+    read_options = pa_csv.ReadOptions(autogenerate_column_names=True)
+    parse_options = pa_csv.ParseOptions(delimiter=layout['delimiter'])
+    convert_options = pa_csv.ConvertOptions(include_columns=list(types), column_types=types)
+    for data, position in _csv_byte_blocks(filename, layout, block_bytes):
+        table = pa_csv.read_csv(pa.py_buffer(data), read_options=read_options,
+                                parse_options=parse_options, convert_options=convert_options)
+        columns = [table.column(name).to_numpy() for name in names]
+        labels = None
+        if layout['label'] is not None:
+            labels = table.column(f"f{layout['label']}").to_numpy().astype(str)
+        yield _csv_block_points(columns, layout), labels, position
+
+
+def _default_label_run(labels):
+    """
+    Jika labels (array string) berbentuk prefix + nomor berurutan tanpa nol
+    di depan (P1, P2, ...), kembalikan (prefix, nomor_pertama); selain itu None.
+    Dicek secara vektor pada code point array unicode.
+    """
+    if len(labels) == 0:
+        return None
+    match = re.fullmatch(r"(\D*)([1-9]\d*)", str(labels[0]))
+    if match is None:
+        return None
+    prefix, start = match.group(1), int(match.group(2))
+
+    codes = np.ascontiguousarray(labels, dtype=str)
+    codes = codes.view(np.uint32).reshape(len(labels), -1)
+    p = len(prefix)
+    if codes.shape[1] <= p or codes.shape[1] - p > 18:
+        return None
+    if p and not (codes[:, :p] == np.array([ord(c) for c in prefix], dtype=np.uint32)).all():
+        return None
+
+    digits = codes[:, p:].astype(np.int64) - ord('0')
+    valid = (digits >= 0) & (digits <= 9)
+    pad = codes[:, p:] == 0
+    # Digit harus rapat di kiri (sisanya padding nol), minimal satu, tanpa nol di depan
+    if not (valid | pad).all() or (pad[:, :-1] & valid[:, 1:]).any():
+        return None
+    if (~valid[:, 0]).any() or (digits[:, 0] == 0).any():
+        return None
+
+    number = np.zeros(len(labels), dtype=np.int64)
+    for j in range(digits.shape[1]):
+        number = np.where(valid[:, j], number * 10 + digits[:, j], number)
+    if not np.array_equal(number, np.arange(start, start + len(labels))):
+        return None
+    return prefix, start
@@ -1,17 +1,82 @@
 # generator.py
+import hashlib
+import json
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
 
+import instrument
+from gridpoints import GridPoints
+from labels import PointLabels
+from poisson import poisson_disk
+from quantized import QuantizedPoints, check_range, quantize
+from quasirandom import SEQUENCES
+
+# Jumlah titik per sub-stream acak. Tetap (tidak bergantung jumlah worker),
+# sehingga hasil untuk seed yang sama selalu identik.
+_RANDOM_BLOCK = 1 << 18
+# Batas jumlah kandidat per batch rejection sampling (mode random + poligon)
+_REJECTION_BATCH = 1 << 20
+# Tipe penyimpanan yang didukung dan resolusi default dtype 'int32' (milimeter)
+DTYPES = ('float64', 'float32', 'int32')
+_DEFAULT_RESOLUTION = 0.001
+# Mode yang dikenal generate()
+MODES = ('grid', 'random', 'poisson') + tuple(SEQUENCES)
+_UNKNOWN_MODE = "Mode tidak dikenal. Gunakan " + ", ".join(repr(m) for m in MODES) + "."
+
 class PointGenerator:
     """
     Class untuk menghasilkan koordinat titik 3D (X, Y, Z)
-    dalam mode 'grid' atau 'random'.
+    dalam mode 'grid', 'random', 'poisson', 'sobol' atau 'halton'.
 
     - generate() mengembalikan numpy array shape (N, 3)
-    - labels tersedia di self.labels (list of "P1", "P2", ...)
+      (generate(lazy=True) pada mode 'grid': GridPoints tanpa alokasi N x 3)
+    - labels tersedia di self.labels (PointLabels: "P1", "P2", ...)
+    - iter_chunks(chunk_size) menghasilkan titik bertahap per chunk
+
+    Mode 'random' bisa direproduksi dengan seed: titik dibagi per blok
+    _RANDOM_BLOCK, dan blok ke-i memakai sub-stream SeedSequence(seed).spawn()[i].
+    Karena itu hasilnya sama persis berapa pun jumlah worker thread-nya.
+
+    Mode 'poisson' (blue noise) menghasilkan titik acak dengan jarak minimum
+    spacing antar titik (lihat poisson.py); sumbu dengan min == max diabaikan,
+    sehingga batas Z yang datar memberi sampling 2D. num_points > 0 menjadi
+    batas atas jumlah titik, 0 berarti kotak diisi sampai penuh.
+
+    Mode 'sobol' dan 'halton' (quasi-random, lihat quasirandom.py) menyebar
+    num_points titik lebih merata daripada 'random' (discrepancy lebih kecil),
+    sehingga integrasi Monte Carlo butuh lebih sedikit titik. Titik ke-i
+    dihitung langsung dari i, jadi chunk dan shard bisa mulai di indeks mana
+    pun. Dengan scramble (default) barisan diacak dari seed; tanpa scramble
+    hasilnya barisan klasik yang tidak bergantung seed. 'sobol' paling
+    seimbang untuk num_points = 2**m.
+
+    Area bisa dibatasi dengan polygon (Polygon, lihat polygon.py): hanya titik
+    yang X, Y-nya di dalam poligon yang dihasilkan. Dengan dem (DEM, lihat
+    dem.py) nilai Z diambil dari raster ketinggian (bilinear) dan titik di luar
+    cakupan DEM dibuang; zmin/zmax tidak dipakai lagi untuk Z (mode 'grid' dan
+    'poisson' menjadi sampling 2D). Mode 'random' memakai rejection sampling
+    per batch, dengan jumlah kandidat yang menyesuaikan rasio luas poligon
+    terhadap kotak; num_points tetap jumlah titik yang dihasilkan.
+
+    Dengan cache (PointCache, lihat cache.py), generate() dan iter_chunks()
+    memakai ulang hasil sebelumnya untuk parameter yang sama (cache_key()).
+    Hasil dari cache berupa array read-only.
+
+    dtype menentukan penyimpanan hasil generate() dan iter_chunks():
+    - 'float64' (default): array float64, 24 byte per titik
+    - 'float32': array float32, 12 byte per titik (~7 digit signifikan)
+    - 'int32': QuantizedPoints (lihat quantized.py), kode int32 dengan
+      scale = resolution dan offset = (xmin, ymin, zmin), 12 byte per titik
+    Titik selalu dihitung dalam float64 per chunk lalu dikonversi, jadi nilai
+    float32/int32 sama dengan hasil float64 yang dibulatkan dan array float64
+    penuh tidak pernah dibuat. Grid lazy (GridPoints) tidak terpengaruh.
     """
 
     def __init__(self, xmin=0, xmax=1, ymin=0, ymax=1, zmin=0, zmax=1,
-                 num_points=100, mode='random', spacing=1.0):
+                 num_points=100, mode='random', spacing=1.0,
+                 seed=None, rng=None, workers=1, polygon=None, dem=None, cache=None,
+                 dtype='float64', resolution=None, scramble=True):
         # Simpan parameter batas dan mode
         self.xmin = float(xmin)
         self.xmax = float(xmax)
@@ -22,55 +87,472 @@ class PointGenerator:
         self.num_points = int(num_points)
         self.mode = mode.lower()
         self.spacing = float(spacing)
+        # Mode 'sobol'/'halton': acak barisan dari seed (lihat docstring class)
+        self.scramble = bool(scramble)
+
+        # Batasan area opsional: Polygon (X, Y) dan DEM (sumber Z)
+        self.polygon = polygon
+        self.dem = dem
+        self.cache = cache
+
+        # Kebijakan tipe penyimpanan hasil (lihat docstring class)
+        self.dtype = np.dtype(dtype).name
+        if self.dtype not in DTYPES:
+            raise ValueError(f"dtype harus salah satu dari {', '.join(DTYPES)}")
+        self.resolution = None if resolution is None else float(resolution)
+        if self.resolution is not None and self.resolution <= 0:
+            raise ValueError("resolution harus > 0")
+        if self.dtype == 'int32':
+            scale, offset = self.quantization()
+            check_range((self.xmin, self.ymin, self.zmin), (self.xmax, self.ymax, self.zmax),
+                        scale, offset)
+
+        # Sumber bilangan acak:
+        # - seed: int/SeedSequence untuk hasil yang bisa direproduksi (paralel)
+        # - rng: numpy.random.Generator milik pemanggil (dipakai berurutan, 1 thread)
+        self.seed = seed
+        self.rng = rng
+        self.workers = max(int(workers), 1)
+        if isinstance(seed, np.random.SeedSequence):
+            self.seed_sequence = seed
+        else:
+            self.seed_sequence = np.random.SeedSequence(seed)
 
         # inisialisasi container hasil
-        self.points = None      # numpy array (N,3)
-        self.labels = None      # list of labels "P1", "P2", ...
+        self.points = None      # numpy array (N,3) atau GridPoints
+        self.labels = None      # PointLabels "P1", "P2", ...
+        self._qmc = None        # barisan Sobol/Halton (dibuat saat pertama dipakai)
 
-    def generate(self):
+    @instrument.traced("generate")
+    def generate(self, progress=None, lazy=False):
         """Fungsi utama untuk menghasilkan koordinat berdasarkan mode.
-        Mengisi self.points (numpy array) dan self.labels (list) lalu mengembalikan self.points.
+        Mengisi self.points (numpy array) dan self.labels (PointLabels) lalu mengembalikan self.points.
+
+        progress: callback opsional progress(selesai, total) yang dipanggil setiap
+        chunk selesai dibuat (misalnya untuk progress bar GUI). Exception dari
+        callback menghentikan proses generate.
+
+        lazy: pada mode 'grid', self.points diisi GridPoints (lihat grid_points())
+        alih-alih array; koordinat dihitung saat diakses, memori O(1).
+        Grid yang dibatasi polygon/dem tetap berupa array.
         """
+        lazy_grid = lazy and self.mode == 'grid' and not self.constrained
+        key = None if lazy_grid or self.cache is None else self.cache_key()
+        cached = None if key is None else self.cache.get(key)
+        if cached is not None:
+            instrument.count("cache.hits")
+            if progress is not None:
+                progress(len(cached), len(cached))
+            self.points = self._wrap(cached)
+            self.labels = PointLabels(len(cached))
+            return self.points
+
         if self.mode == 'grid':
-            pts = self._generate_grid()
+            if lazy_grid:
+                grid = self.grid_points()
+                if progress is not None:
+                    progress(len(grid), len(grid))
+                self.points = grid
+                self.labels = PointLabels(len(grid))
+                return self.points
+        if self.mode not in MODES:
+            raise ValueError(_UNKNOWN_MODE)
+        if self.dtype != 'float64':
+            raw = self._generate_raw(progress)
+        elif self.mode == 'grid':
+            raw = self._generate_grid(progress)
         elif self.mode == 'random':
-            pts = self._generate_random()
+            raw = self._generate_random(progress)
+        elif self.mode in SEQUENCES:
+            raw = self._generate_qmc(progress)
         else:
-            raise ValueError("Mode tidak dikenal. Gunakan 'grid' atau 'random'.")
+            raw = self._generate_poisson(progress)
 
-        # Simpan hasil ke atribut
-        self.points = np.asarray(pts, dtype=float)
-        self.labels = [f"P{i+1}" for i in range(self.points.shape[0])]
+        # Simpan hasil ke atribut (cache menyimpan array mentah: float atau kode int32)
+        raw = np.asarray(raw, dtype=self._raw_dtype())
+        if key is not None:
+            # raw baru dibuat di sini dan tidak dipakai pihak lain: tanpa salinan
+            raw = self.cache.put(key, raw, copy=False)
+        self.points = self._wrap(raw)
+        self.labels = PointLabels(raw.shape[0])
+        instrument.count("generate.points", raw.shape[0])
         return self.points
 
-    def _generate_grid(self):
+    def cache_key(self):
+        """
+        Kunci cache: SHA-256 (hex) dari parameter yang menentukan hasil,
+        dinormalisasi (float, mode huruf kecil). workers tidak ikut karena
+        hasilnya sama; seed tidak ikut pada mode 'grid' dan sobol/halton
+        tanpa scramble. Mengembalikan None
+        jika memakai rng milik pemanggil (hasil bergantung state rng).
+        """
+        if self.rng is not None:
+            return None
+        params = {
+            "version": 1,
+            "mode": self.mode,
+            "bounds": [self.xmin, self.xmax, self.ymin, self.ymax, self.zmin, self.zmax],
+            "num_points": self.num_points,
+            "spacing": self.spacing,
+            "polygon": None if self.polygon is None else self.polygon.fingerprint(),
+            "dem": None if self.dem is None else self.dem.fingerprint(),
+        }
+        if self.mode in SEQUENCES:
+            params["scramble"] = self.scramble
+        if self.mode != 'grid' and params.get("scramble", True):
+            ss = self.seed_sequence
+            params["seed"] = [str(ss.entropy), list(ss.spawn_key), ss.pool_size]
+        if self.dtype != 'float64':
+            # Kunci lama (float64) tetap sama
+            params["dtype"] = self.dtype
+            if self.dtype == 'int32':
+                params["quantization"] = [v.tolist() for v in self.quantization()]
+        text = json.dumps(params, sort_keys=True)
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def grid_points(self):
+        """
+        Grid 3D sebagai GridPoints: array-like (N,3) yang hanya menyimpan
+        origin, jarak dan jumlah titik per sumbu. Nilainya sama persis dengan
+        np.arange(min, max + 1e-9, spacing) per sumbu, urutan meshgrid 'ij',
+        dipotong ke num_points jika num_points > 0.
+        """
+        count = self.num_points if self.num_points > 0 else None
+        return GridPoints.from_arange(
+            (self.xmin, self.ymin, self.zmin),
+            (self.xmax + 1e-9, self.ymax + 1e-9, self.zmax + 1e-9),
+            self.spacing, count=count)
+
+    @property
+    def constrained(self):
+        """True jika titik dibatasi poligon dan/atau Z diambil dari DEM."""
+        return self.polygon is not None or self.dem is not None
+
+    def _region_box(self):
+        """
+        Kotak X, Y yang perlu disampling: batas generator dipotong bounding box
+        poligon dan cakupan DEM. Mengembalikan (xmin, xmax, ymin, ymax).
+        """
+        xmin, xmax, ymin, ymax = self.xmin, self.xmax, self.ymin, self.ymax
+        for area in (self.polygon, self.dem):
+            if area is not None:
+                xmin, xmax = max(xmin, area.xmin), min(xmax, area.xmax)
+                ymin, ymax = max(ymin, area.ymin), min(ymax, area.ymax)
+        if xmin > xmax or ymin > ymax:
+            raise ValueError("Poligon/DEM tidak beririsan dengan batas X/Y")
+        return xmin, xmax, ymin, ymax
+
+    def _in_region(self, points):
+        """Mask titik (M, 3) yang berada di dalam poligon dan cakupan DEM."""
+        mask = np.ones(len(points), dtype=bool)
+        if self.polygon is not None:
+            mask &= self.polygon.contains(points)
+        if self.dem is not None:
+            d = self.dem
+            mask &= ((points[:, 0] >= d.xmin) & (points[:, 0] <= d.xmax)
+                     & (points[:, 1] >= d.ymin) & (points[:, 1] <= d.ymax))
+        return mask
+
+    def _apply_dem(self, points):
+        """Mengisi kolom Z dari DEM (jika ada), in place."""
+        if self.dem is not None:
+            points[:, 2] = self.dem.sample(points[:, 0], points[:, 1])
+        return points
+
+    def _lattice(self):
+        """Grid penuh (tanpa batas num_points) yang disaring pada mode grid + poligon/DEM."""
+        zmax = self.zmin if self.dem is not None else self.zmax
+        return GridPoints.from_arange(
+            (self.xmin, self.ymin, self.zmin),
+            (self.xmax + 1e-9, self.ymax + 1e-9, zmax + 1e-9), self.spacing)
+
+    def _iter_grid_constrained(self, chunk_size):
+        """
+        Grid yang dibatasi poligon/DEM, per chunk (maksimal chunk_size baris).
+        Grid penuh diiterasi per blok lalu disaring; num_points membatasi jumlah
+        titik setelah penyaringan. Dengan DEM hanya satu level Z yang dibuat.
+        """
+        remaining = self.num_points if self.num_points > 0 else None
+        for chunk in self._lattice().iter_chunks(chunk_size):
+            chunk = chunk[self._in_region(chunk)]
+            if remaining is not None:
+                chunk = chunk[:remaining]
+                remaining -= len(chunk)
+            if len(chunk):
+                yield self._apply_dem(chunk)
+            if remaining == 0:
+                return
+
+    @instrument.traced("generate.grid")
+    def _generate_grid(self, progress=None):
         """
         Membuat grid 3D penuh berdasarkan rentang dan jarak antar titik (spacing).
         Mengembalikan numpy array shape (N,3).
+
+        Titik dihitung per chunk dari indeks (GridPoints.block), sehingga
+        hanya array hasil (N,3) yang dialokasikan.
         """
-        # Pastikan spacing positif
-        if self.spacing <= 0:
-            raise ValueError("spacing harus > 0")
+        if self.constrained:
+            # Jumlah titik setelah penyaringan belum diketahui: kumpulkan per chunk
+            chunks = list(self._iter_grid_constrained(1_000_000))
+            points = np.concatenate(chunks) if chunks else np.empty((0, 3))
+            if progress is not None:
+                progress(len(points), len(points))
+            return points
 
-        # Buat vektor nilai X, Y, Z sesuai rentang dan jarak antar titik
-        x_vals = np.arange(self.xmin, self.xmax + 1e-9, self.spacing)
-        y_vals = np.arange(self.ymin, self.ymax + 1e-9, self.spacing)
-        z_vals = np.arange(self.zmin, self.zmax + 1e-9, self.spacing)
+        grid = self.grid_points()
+        total = len(grid)
 
-        # Jika salah satu axis hanya punya satu nilai dan num_points diminta lebih kecil,
-        # tetap hasilkan grid penuh lalu trim sesuai num_points jika perlu.
-        X, Y, Z = np.meshgrid(x_vals, y_vals, z_vals, indexing='ij')
+        points = np.empty((total, 3), dtype=float)
+        step = 1_000_000
+        for start in range(0, total, step):
+            stop = min(start + step, total)
+            grid.block(start, stop, out=points[start:stop])
+            if progress is not None:
+                progress(stop, total)
+        return points
 
-        # Flatten menjadi N x 3
-        points = np.column_stack((X.ravel(), Y.ravel(), Z.ravel()))
+    def iter_chunks(self, chunk_size=100_000):
+        """
+        Menghasilkan titik secara bertahap (generator) per chunk berukuran
+        maksimal chunk_size baris, tiap chunk berupa numpy array shape (m, 3)
+        (QuantizedPoints pada dtype 'int32').
 
-        # Jika user meminta num_points lebih sedikit, ambil subset terdepan
-        if (self.num_points is not None) and (self.num_points > 0) and (len(points) > self.num_points):
-            points = points[:self.num_points, :]
+        Pada mode 'grid' titik dihitung dari indeks sehingga grid penuh tidak
+        pernah dialokasikan; iterasi berhenti begitu num_points tercapai.
+        Pemakaian memori sebanding dengan chunk_size, bukan volume survei.
 
-        return points
+        Dengan instrumentasi, pembuatan setiap chunk tercatat sebagai span
+        generate.chunks (tanpa waktu pemakai chunk) dan counter generate.points.
+        """
+        chunk_size = int(chunk_size)
+        if chunk_size <= 0:
+            raise ValueError("chunk_size harus > 0")
+
+        key = None if self.cache is None else self.cache_key()
+        raw = (self._to_raw(c) for c in self._iter_chunks(chunk_size))
+        if key is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                instrument.count("cache.hits")
+                for start in range(0, len(cached), chunk_size):
+                    yield self._wrap(cached[start:start + chunk_size])
+                return
+            # Miss: chunk diteruskan sambil disimpan ke disk cache (jika ada)
+            raw = self.cache.store_chunks(key, raw)
+        for chunk in instrument.iter_spans("generate.chunks", raw, counter="generate.points"):
+            yield self._wrap(chunk)
 
-    def _generate_random(self):
+    def _iter_chunks(self, chunk_size):
+        """Isi iter_chunks() tanpa cache dan tanpa konversi dtype (chunk float64)."""
+        if self.mode == 'grid':
+            if self.constrained:
+                yield from self._iter_grid_constrained(chunk_size)
+            else:
+                yield from self.grid_points().iter_chunks(chunk_size)
+        elif self.mode == 'random':
+            if self.num_points <= 0:
+                raise ValueError("num_points harus > 0 untuk mode random")
+            for start in range(0, self.num_points, chunk_size):
+                m = min(chunk_size, self.num_points - start)
+                yield self._fill_random(np.empty((m, 3), dtype=float), start)
+        elif self.mode in SEQUENCES:
+            if self.constrained:
+                yield from self._iter_qmc_constrained(chunk_size)
+                return
+            self._check_num_points()
+            for start in range(0, self.num_points, chunk_size):
+                m = min(chunk_size, self.num_points - start)
+                yield self._fill_qmc(np.empty((m, 3), dtype=float), start)
+        elif self.mode == 'poisson':
+            # Poisson-disk tidak bisa dibuat per bagian: generate sekali, lalu dipotong
+            points = self._generate_poisson()
+            for start in range(0, len(points), chunk_size):
+                yield points[start:start + chunk_size]
+        else:
+            raise ValueError(_UNKNOWN_MODE)
+
+    # -----------------------
+    # Kebijakan dtype
+    # -----------------------
+    def quantization(self):
+        """
+        (scale, offset) per sumbu untuk dtype 'int32'. scale = resolution;
+        tanpa resolution: spacing pada mode 'grid' tanpa DEM (kode = indeks
+        grid, tanpa galat), selain itu _DEFAULT_RESOLUTION (milimeter).
+        """
+        if self.resolution is not None:
+            res = self.resolution
+        elif self.mode == 'grid' and self.dem is None:
+            res = self.spacing
+        else:
+            res = _DEFAULT_RESOLUTION
+        return np.full(3, res), np.array([self.xmin, self.ymin, self.zmin])
+
+    def _raw_dtype(self):
+        """Tipe array mentah yang disimpan (cache, generate): float64/float32/int32."""
+        return np.dtype(self.dtype)
+
+    def _to_raw(self, chunk, out=None):
+        """Chunk float64 -> array mentah sesuai dtype (ke out jika diberikan)."""
+        if self.dtype == 'int32':
+            scale, offset = self.quantization()
+            return quantize(chunk, scale, offset, out=out)
+        if out is None:
+            return chunk if self.dtype == 'float64' else chunk.astype(self.dtype)
+        out[...] = chunk
+        return out
+
+    def _wrap(self, raw):
+        """Array mentah -> hasil untuk pemakai (array float atau QuantizedPoints)."""
+        if self.dtype == 'int32':
+            return QuantizedPoints(raw, *self.quantization())
+        return raw
+
+    @staticmethod
+    def _unwrap(points):
+        return points.data if isinstance(points, QuantizedPoints) else points
+
+    def _generate_raw(self, progress=None):
+        """
+        generate() untuk dtype float32/int32: titik dibuat per chunk float64 lalu
+        langsung dikonversi ke array hasil, jadi tidak ada array float64 (N, 3).
+        """
+        if self.mode == 'random' or self.mode in SEQUENCES:
+            self._check_num_points()
+            total = self.num_points
+        elif self.mode == 'grid' and not self.constrained:
+            total = len(self.grid_points())
+        else:
+            # Jumlah titik belum diketahui (poisson, grid + polygon/dem)
+            parts = [self._to_raw(c) for c in self._iter_chunks(1_000_000)]
+            raw = np.concatenate(parts) if parts else np.empty((0, 3), dtype=self._raw_dtype())
+            if progress is not None:
+                progress(len(raw), len(raw))
+            return raw
+
+        raw = np.empty((total, 3), dtype=self._raw_dtype())
+        pos = 0
+        # Chunk = beberapa blok sub-stream, sehingga workers tetap paralel
+        for chunk in self._iter_chunks(4 * _RANDOM_BLOCK):
+            self._to_raw(chunk, out=raw[pos:pos + len(chunk)])
+            pos += len(chunk)
+            if progress is not None:
+                progress(pos, total)
+        return raw
+
+    # -----------------------
+    # Sharding
+    # -----------------------
+    def shard_range(self, shard_id, num_shards):
+        """
+        Rentang indeks titik (start, stop) untuk shard ke-shard_id dari num_shards.
+
+        - mode 'grid': rentang indeks grid (urutan meshgrid 'ij'); dengan
+          polygon/dem rentang indeks grid penuh sebelum disaring
+        - mode 'random': dibagi per blok sub-stream (_RANDOM_BLOCK titik), jadi
+          setiap shard memakai sub-stream seed-nya sendiri secara utuh (untuk
+          titik sedikit dibagi rata; posisi di sub-stream dilompati dengan advance)
+        - mode 'sobol'/'halton': dibagi rata per indeks barisan (tanpa polygon/dem)
+
+        Gabungan semua shard berurutan sama persis dengan generate().
+        """
+        shard_id, num_shards = int(shard_id), int(num_shards)
+        if num_shards <= 0 or not 0 <= shard_id < num_shards:
+            raise ValueError("shard_id harus 0..num_shards-1")
+        if self.mode == 'grid':
+            if self.constrained and self.num_points > 0:
+                raise ValueError("Grid dengan polygon/dem hanya bisa di-shard jika num_points = 0")
+            total = len(self._lattice() if self.constrained else self.grid_points())
+            unit = 1
+        elif self.mode == 'random':
+            if self.rng is not None:
+                raise ValueError("Sharding mode random membutuhkan seed, bukan rng")
+            if self.num_points <= 0:
+                raise ValueError("num_points harus > 0 untuk mode random")
+            total = self.num_points
+            # Dibulatkan ke blok sub-stream jika setiap shard kebagian minimal satu blok
+            unit = _RANDOM_BLOCK if total >= num_shards * _RANDOM_BLOCK else 1
+        elif self.mode in SEQUENCES:
+            if self.constrained:
+                raise ValueError(f"Mode {self.mode} dengan polygon/dem tidak bisa di-shard")
+            self._check_num_points()
+            total = self.num_points
+            unit = 1
+        else:
+            raise ValueError("Hanya mode 'grid', 'random', 'sobol' dan 'halton' yang bisa di-shard")
+
+        units = -(-total // unit)
+        start = min(units * shard_id // num_shards * unit, total)
+        stop = min(units * (shard_id + 1) // num_shards * unit, total)
+        return start, stop
+
+    def iter_shard_chunks(self, shard_id, num_shards, chunk_size=100_000):
+        """
+        Titik satu shard per chunk (maksimal chunk_size baris), tanpa
+        membuat shard lain. Hasil setiap shard bisa direproduksi sendiri:
+        hanya bergantung pada parameter, seed, shard_id dan num_shards.
+        """
+        chunk_size = int(chunk_size)
+        if chunk_size <= 0:
+            raise ValueError("chunk_size harus > 0")
+        start, stop = self.shard_range(shard_id, num_shards)
+        chunks = instrument.iter_spans("generate.chunks", self._iter_shard_raw(start, stop, chunk_size),
+                                       counter="generate.points")
+        for chunk in chunks:
+            yield self._wrap(chunk)
+
+    def _iter_shard_raw(self, start, stop, chunk_size):
+        """Isi iter_shard_chunks(): chunk mentah (sesuai dtype) titik start..stop-1."""
+        if self.mode == 'grid':
+            grid = self._lattice() if self.constrained else self.grid_points()
+            for pos in range(start, stop, chunk_size):
+                chunk = grid.block(pos, min(pos + chunk_size, stop))
+                if self.constrained:
+                    chunk = self._apply_dem(chunk[self._in_region(chunk)])
+                if len(chunk):
+                    yield self._to_raw(chunk)
+        else:
+            fill = self._fill_qmc if self.mode in SEQUENCES else self._fill_random
+            for pos in range(start, stop, chunk_size):
+                m = min(chunk_size, stop - pos)
+                yield self._to_raw(fill(np.empty((m, 3), dtype=float), pos))
+
+    def generate_shard(self, shard_id, num_shards):
+        """
+        Titik shard ke-shard_id sebagai numpy array (m, 3) (lihat shard_range),
+        mengikuti dtype seperti generate().
+        self.points / self.labels tidak diubah. Label global titik pertama
+        shard adalah P(start + 1), kecuali pada grid + polygon/dem.
+        """
+        chunks = [self._unwrap(c) for c in
+                  self.iter_shard_chunks(shard_id, num_shards, chunk_size=1_000_000)]
+        raw = np.concatenate(chunks) if chunks else np.empty((0, 3), dtype=self._raw_dtype())
+        return self._wrap(raw)
+
+    @instrument.traced("generate.poisson")
+    def _generate_poisson(self, progress=None):
+        """
+        Titik Poisson-disk (jarak minimum = spacing) di dalam batas.
+        Mengembalikan numpy array shape (N,3).
+        """
+        rng = self.rng if self.rng is not None else np.random.default_rng(self.seed_sequence)
+        if not self.constrained:
+            lo = (self.xmin, self.ymin, self.zmin)
+            hi = (self.xmax, self.ymax, self.zmax)
+            return poisson_disk(lo, hi, self.spacing, rng, max_points=self.num_points,
+                                progress=progress)
+
+        # Kandidat di luar poligon/DEM ditolak; dengan DEM sampling hanya di X, Y
+        xmin, xmax, ymin, ymax = self._region_box()
+        zmax = self.zmin if self.dem is not None else self.zmax
+        points = poisson_disk((xmin, ymin, self.zmin), (xmax, ymax, zmax), self.spacing, rng,
+                              max_points=self.num_points, progress=progress,
+                              region=self._in_region)
+        return self._apply_dem(points)
+
+    @instrument.traced("generate.random")
+    def _generate_random(self, progress=None):
         """
         Menghasilkan titik acak seragam di dalam batas (xmin..xmax, ymin..ymax, zmin..zmax)
         Mengembalikan numpy array shape (N,3).
@@ -78,9 +560,215 @@ class PointGenerator:
         if self.num_points <= 0:
             raise ValueError("num_points harus > 0 untuk mode random")
 
-        x = np.random.uniform(self.xmin, self.xmax, self.num_points)
-        y = np.random.uniform(self.ymin, self.ymax, self.num_points)
-        z = np.random.uniform(self.zmin, self.zmax, self.num_points)
+        # Satu buffer (N,3) diisi langsung, tanpa array per sumbu + column_stack
+        points = np.empty((self.num_points, 3), dtype=float)
+        if progress is None:
+            return self._fill_random(points)
 
-        points = np.column_stack((x, y, z))
+        # Dengan progress: isi per kelompok blok sub-stream (hasil tetap sama)
+        total = self.num_points
+        step = 4 * _RANDOM_BLOCK
+        for start in range(0, total, step):
+            stop = min(start + step, total)
+            self._fill_random(points[start:stop], start)
+            progress(stop, total)
         return points
+
+    def _fill_random(self, out, start=0):
+        """
+        Mengisi out (m,3) in place dengan titik acak ke-start sampai ke-(start+m-1).
+        Blok-blok sub-stream dikerjakan paralel jika workers > 1.
+        """
+        if self.rng is not None:
+            # Generator dari pemanggil: satu stream berurutan
+            if self.constrained:
+                out[:] = self._sample_region(self.rng, out.shape[0])
+                return out
+            self.rng.random(out=out)
+            self._scale_unit(out)
+            return out
+
+        # Potong rentang [start, start+m) menurut batas blok sub-stream
+        stop = start + out.shape[0]
+        tasks = []
+        pos = start
+        while pos < stop:
+            block_end = min((pos // _RANDOM_BLOCK + 1) * _RANDOM_BLOCK, stop)
+            tasks.append((pos, block_end))
+            pos = block_end
+
+        def fill(task):
+            lo, hi = task
+            self._fill_random_block(out[lo - start:hi - start], lo)
+
+        if self.workers > 1 and len(tasks) > 1:
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                list(pool.map(fill, tasks))
+        else:
+            for task in tasks:
+                fill(task)
+        return out
+
+    def _fill_random_block(self, out, start):
+        """Mengisi out dari sub-stream blok yang memuat titik ke-start."""
+        block, offset = divmod(start, _RANDOM_BLOCK)
+        ss = self.seed_sequence
+        child = np.random.SeedSequence(ss.entropy, spawn_key=ss.spawn_key + (block,),
+                                       pool_size=ss.pool_size)
+        bitgen = np.random.PCG64(child)
+        if self.constrained:
+            # Jumlah bilangan acak per titik tidak tetap (rejection), jadi
+            # titik sebelum offset di blok ini dibuat ulang lalu dibuang
+            out[:] = self._sample_region(np.random.Generator(bitgen), offset + out.shape[0])[offset:]
+            return
+        if offset:
+            # Lompati titik sebelumnya di blok ini (3 bilangan 64-bit per titik)
+            bitgen.advance(3 * offset)
+        np.random.Generator(bitgen).random(out=out)
+        self._scale_unit(out)
+
+    def _scale_unit(self, out):
+        """Mengubah nilai seragam [0,1) di out menjadi koordinat di dalam batas, in place."""
+        lo = np.array([self.xmin, self.ymin, self.zmin])
+        hi = np.array([self.xmax, self.ymax, self.zmax])
+        out *= hi - lo
+        out += lo
+
+    def _sample_region(self, rng, n):
+        """
+        n titik acak seragam di dalam poligon/DEM dengan rejection sampling per
+        batch. Ukuran batch = sisa titik / perkiraan rasio diterima (awalnya
+        luas poligon / luas kotak, lalu rasio yang teramati), sehingga biasanya
+        cukup satu atau dua batch. Mengembalikan array (n, 3).
+        """
+        xmin, xmax, ymin, ymax = self._region_box()
+        zmax = self.zmin if self.dem is not None else self.zmax
+        lo = np.array([xmin, ymin, self.zmin])
+        span = np.array([xmax, ymax, zmax]) - lo
+
+        rate = self._region_rate(xmin, xmax, ymin, ymax)
+
+        out = np.empty((n, 3), dtype=float)
+        filled = tried = accepted = 0
+        while filled < n:
+            m = min(int((n - filled) / rate * 1.1) + 16, _REJECTION_BATCH)
+            cand = rng.random((m, 3))
+            cand *= span
+            cand += lo
+            cand = cand[self._in_region(cand)][:n - filled]
+            out[filled:filled + len(cand)] = cand
+            filled += len(cand)
+
+            tried += m
+            accepted += len(cand)
+            if accepted == 0 and tried >= 64 * _REJECTION_BATCH:
+                raise ValueError("Tidak ada titik yang jatuh di dalam poligon/DEM")
+            rate = max(accepted / tried, 1e-6)
+        return self._apply_dem(out)
+
+    def _region_rate(self, xmin, xmax, ymin, ymax):
+        """Perkiraan awal rasio kandidat yang diterima: luas poligon / luas kotak."""
+        box_area = (xmax - xmin) * (ymax - ymin)
+        if self.polygon is not None and box_area > 0:
+            return min(max(self.polygon.area / box_area, 1e-3), 1.0)
+        return 1.0
+
+    # -----------------------
+    # Quasi-random (Sobol / Halton)
+    # -----------------------
+    def _check_num_points(self):
+        if self.num_points <= 0:
+            raise ValueError(f"num_points harus > 0 untuk mode {self.mode}")
+
+    def _sequence(self):
+        """Barisan quasi-random mode ini; scramble diambil sekali dari seed (atau rng)."""
+        if self._qmc is None:
+            rng = None
+            if self.scramble:
+                rng = self.rng if self.rng is not None else np.random.default_rng(self.seed_sequence)
+            self._qmc = SEQUENCES[self.mode](3, scramble=self.scramble, rng=rng)
+        return self._qmc
+
+    @instrument.traced("generate.qmc")
+    def _generate_qmc(self, progress=None):
+        """
+        Titik Sobol/Halton di dalam batas (atau poligon/DEM).
+        Mengembalikan numpy array shape (N,3).
+        """
+        self._check_num_points()
+        total = self.num_points
+        points = np.empty((total, 3), dtype=float)
+        step = 4 * _RANDOM_BLOCK
+        if self.constrained:
+            pos = 0
+            for chunk in self._iter_qmc_constrained(step):
+                points[pos:pos + len(chunk)] = chunk
+                pos += len(chunk)
+                if progress is not None:
+                    progress(pos, total)
+            return points
+
+        for start in range(0, total, step):
+            stop = min(start + step, total)
+            self._fill_qmc(points[start:stop], start)
+            if progress is not None:
+                progress(stop, total)
+        return points
+
+    def _fill_qmc(self, out, start=0):
+        """
+        Mengisi out (m,3) in place dengan titik ke-start sampai ke-(start+m-1)
+        (tanpa poligon/DEM). Dibagi per _RANDOM_BLOCK titik untuk workers.
+        """
+        seq = self._sequence()
+        stop = start + out.shape[0]
+        tasks = [(lo, min(lo + _RANDOM_BLOCK, stop)) for lo in range(start, stop, _RANDOM_BLOCK)]
+
+        def fill(task):
+            lo, hi = task
+            seq.block(lo, hi, out=out[lo - start:hi - start])
+
+        if self.workers > 1 and len(tasks) > 1:
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                list(pool.map(fill, tasks))
+        else:
+            for task in tasks:
+                fill(task)
+        self._scale_unit(out)
+        return out
+
+    def _iter_qmc_constrained(self, chunk_size):
+        """
+        num_points titik Sobol/Halton di dalam poligon/DEM, per chunk: barisan
+        disebar di kotak poligon/DEM lalu titik di luar dibuang, berurutan
+        menurut indeks barisan (hasil tidak bergantung chunk_size). Dengan DEM
+        hanya X, Y yang dipakai dan Z diambil dari raster.
+        """
+        self._check_num_points()
+        seq = self._sequence()
+        xmin, xmax, ymin, ymax = self._region_box()
+        zmax = self.zmin if self.dem is not None else self.zmax
+        lo = np.array([xmin, ymin, self.zmin])
+        span = np.array([xmax, ymax, zmax]) - lo
+
+        rate = self._region_rate(xmin, xmax, ymin, ymax)
+        remaining = self.num_points
+        pos = tried = accepted = 0
+        while remaining > 0:
+            m = min(int(remaining / rate * 1.1) + 16, _REJECTION_BATCH, seq.max_points - pos)
+            if m <= 0:
+                raise ValueError("Barisan quasi-random habis sebelum num_points titik terpenuhi")
+            cand = seq.block(pos, pos + m)
+            pos += m
+            cand *= span
+            cand += lo
+            cand = self._apply_dem(cand[self._in_region(cand)][:remaining])
+            remaining -= len(cand)
+
+            tried += m
+            accepted += len(cand)
+            if accepted == 0 and tried >= 64 * _REJECTION_BATCH:
+                raise ValueError("Tidak ada titik yang jatuh di dalam poligon/DEM")
+            rate = max(accepted / tried, 1e-6)
+            for start in range(0, len(cand), chunk_size):
+                yield cand[start:start + chunk_size]
@@ -0,0 +1,217 @@
+# gridpoints.py
+
+import math
+
+import numpy as np
+
+
+class GridPoints:
+    """
+    Grid 3D reguler yang disimpan secara analitik (origin, delta, shape).
+
+    Bertingkah seperti array numpy read-only shape (N, 3), tetapi koordinat
+    dihitung saat diminta dari indeks, sehingga memorinya O(1) berapa pun
+    ukuran grid. Urutan titik sama dengan np.meshgrid(..., indexing='ij')
+    yang di-flatten: X berubah paling lambat, Z paling cepat.
+
+    Nilai setiap sumbu identik dengan np.arange(start, stop, step):
+    start + i * ((start + step) - start).
+    """
+
+    ndim = 2
+    dtype = np.dtype(float)
+
+    def __init__(self, origin, delta, axis_sizes, count=None):
+        """
+        - origin: nilai pertama tiap sumbu (x0, y0, z0)
+        - delta: jarak antar nilai tiap sumbu
+        - axis_sizes: jumlah nilai tiap sumbu (nx, ny, nz)
+        - count: jumlah titik yang dipakai (grid dipotong), default semua
+        """
+        self.origin = np.asarray(origin, dtype=float)
+        self.delta = np.asarray(delta, dtype=float)
+        self.axis_sizes = tuple(int(n) for n in axis_sizes)
+        self.full_size = self.axis_sizes[0] * self.axis_sizes[1] * self.axis_sizes[2]
+        self.count = self.full_size if count is None else min(int(count), self.full_size)
+
+    @classmethod
+    def from_arange(cls, starts, stops, step, count=None):
+        """Grid yang sama dengan np.arange(start, stop, step) untuk tiap sumbu."""
+        step = float(step)
+        if step <= 0:
+            raise ValueError("spacing harus > 0")
+        sizes = [max(math.ceil((stop - start) / step), 0) for start, stop in zip(starts, stops)]
+        delta = [(start + step) - start for start in starts]
+        return cls(starts, delta, sizes, count)
+
+    # -----------------------
+    # Protokol array
+    # -----------------------
+    @property
+    def shape(self):
+        return (self.count, 3)
+
+    @property
+    def size(self):
+        return self.count * 3
+
+    @property
+    def nbytes(self):
+        """Ukuran jika dijadikan array float64 (bukan memori yang dipakai)."""
+        return self.size * self.dtype.itemsize
+
+    def __len__(self):
+        return self.count
+
+    def __repr__(self):
+        nx, ny, nz = self.axis_sizes
+        return f"GridPoints(n={self.count:,}, axes={nx}x{ny}x{nz}, origin={self.origin.tolist()})"
+
+    def __array__(self, dtype=None, copy=None):
+        if copy is False:
+            raise ValueError("GridPoints tidak bisa dijadikan array tanpa menyalin")
+        out = self.block(0, self.count)
+        return out if dtype is None else out.astype(dtype, copy=False)
+
+    def __iter__(self):
+        for chunk in self.iter_chunks():
+            yield from chunk
+
+    def __getitem__(self, key):
+        cols = slice(None)
+        if isinstance(key, tuple):
+            if len(key) != 2:
+                raise IndexError("GridPoints hanya punya 2 dimensi")
+            key, cols = key
+
+        if isinstance(key, slice):
+            start, stop, step = key.indices(self.count)
+            if step == 1:
+                rows = self.block(start, max(start, stop))
+            else:
+                rows = self.take(np.arange(start, stop, step))
+        elif np.ndim(key) == 0 and not isinstance(key, (bool, np.bool_)):
+            i = int(key)
+            if i < 0:
+                i += self.count
+            if not 0 <= i < self.count:
+                raise IndexError("indeks titik di luar jangkauan")
+            rows = self.take(np.array([i]))[0]
+            return rows[cols]
+        else:
+            key = np.asarray(key)
+            if key.dtype == bool:
+                if key.shape != (self.count,):
+                    raise IndexError("mask boolean harus sepanjang jumlah titik")
+                key = np.flatnonzero(key)
+            rows = self.take(key)
+        return rows[:, cols]
+
+    # -----------------------
+    # Indeks <-> koordinat
+    # -----------------------
+    def axis_index(self, idx):
+        """Memecah indeks datar menjadi (ix, iy, iz)."""
+        idx = np.asarray(idx, dtype=np.int64)
+        _, ny, nz = self.axis_sizes
+        return idx // (ny * nz), (idx // nz) % ny, idx % nz
+
+    def take(self, idx, out=None):
+        """Koordinat titik untuk array indeks datar (indeks negatif diperbolehkan)."""
+        idx = np.asarray(idx, dtype=np.int64)
+        idx = np.where(idx < 0, idx + self.count, idx)
+        if idx.size and (idx.min() < 0 or idx.max() >= self.count):
+            raise IndexError("indeks titik di luar jangkauan")
+        if out is None:
+            out = np.empty(idx.shape + (3,), dtype=float)
+        for axis, i in enumerate(self.axis_index(idx)):
+            out[..., axis] = self.origin[axis] + i * self.delta[axis]
+        return out
+
+    def block(self, start, stop, out=None):
+        """Titik ke-start sampai ke-(stop-1) sebagai array (m, 3)."""
+        return self.take(np.arange(start, stop, dtype=np.int64), out=out)
+
+    def iter_chunks(self, chunk_size=100_000):
+        """Menghasilkan titik per chunk berukuran maksimal chunk_size baris."""
+        chunk_size = int(chunk_size)
+        if chunk_size <= 0:
+            raise ValueError("chunk_size harus > 0")
+        for start in range(0, self.count, chunk_size):
+            yield self.block(start, min(start + chunk_size, self.count))
+
+    def index_of(self, coords, tol=1e-6):
+        """
+        Indeks datar titik grid untuk koordinat (shape (3,) atau (M,3)).
+        Koordinat yang tidak tepat di titik grid (selisih > tol * delta)
+        atau di luar grid menghasilkan -1.
+        """
+        coords = np.asarray(coords, dtype=float)
+        t = (coords - self.origin) / self.delta
+        i = np.rint(t)
+        sizes = np.array(self.axis_sizes)
+        ok = np.all((np.abs(t - i) <= tol) & (i >= 0) & (i < sizes), axis=-1)
+        i = np.where(ok[..., None], i, 0).astype(np.int64)
+        flat = (i[..., 0] * sizes[1] + i[..., 1]) * sizes[2] + i[..., 2]
+        return np.where(ok & (flat < self.count), flat, -1)
+
+    def nearest_index(self, coords):
+        """Indeks datar titik grid terdekat (koordinat dijepit ke dalam grid)."""
+        coords = np.asarray(coords, dtype=float)
+        sizes = np.array(self.axis_sizes)
+        i = np.clip(np.rint((coords - self.origin) / self.delta), 0, sizes - 1).astype(np.int64)
+        return (i[..., 0] * sizes[1] + i[..., 1]) * sizes[2] + i[..., 2]
+
+    def subsample_indices(self, max_points, bounds=None):
+        """
+        Indeks terurut subgrid dengan langkah seragam per sumbu, berisi paling
+        banyak max_points titik (decimation tampilan tanpa membaca semua titik).
+        bounds: opsional ((xmin, xmax), (ymin, ymax), (zmin, zmax)); hanya titik
+        grid di dalam kotak ini yang dipertimbangkan.
+        """
+        if bounds is None and self.count <= max_points:
+            return np.arange(self.count)
+        sizes = np.array(self.axis_sizes, dtype=np.int64)
+        first = np.zeros(3, dtype=np.int64)
+        last = sizes - 1
+        if self.count:
+            # Grid yang dipotong: irisan X setelah titik terakhir tidak dipakai
+            last[0] = self.axis_index(self.count - 1)[0]
+        if bounds is not None:
+            lo = np.array([b[0] for b in bounds], dtype=float)
+            hi = np.array([b[1] for b in bounds], dtype=float)
+            # Rentang indeks per sumbu (delta bisa negatif jika min > max)
+            a = (lo - self.origin) / self.delta
+            b = (hi - self.origin) / self.delta
+            first = np.maximum(np.ceil(np.minimum(a, b) - 1e-9), 0).astype(np.int64)
+            last = np.minimum(np.floor(np.maximum(a, b) + 1e-9), sizes - 1).astype(np.int64)
+        span = np.maximum(last - first + 1, 0)
+
+        stride = 1
+        if span.prod() > max_points:
+            active = span > 1
+            stride = max(1, math.floor((span.prod() / max_points) ** (1.0 / max(active.sum(), 1))))
+            while np.prod(-(-span // stride)) > max_points:
+                stride += 1
+        axes = [np.arange(f, f + n, stride, dtype=np.int64) for f, n in zip(first, span)]
+        ix, iy, iz = np.meshgrid(*axes, indexing='ij')
+        flat = ((ix * sizes[1] + iy) * sizes[2] + iz).ravel()
+        return flat[flat < self.count]
+
+    def bounds(self):
+        """(min, max) koordinat tiap sumbu dari titik yang dipakai."""
+        if self.count == 0:
+            raise ValueError("grid kosong")
+        last = self.axis_index(self.count - 1)
+        sizes = np.array(self.axis_sizes)
+        # Titik yang dipakai: sumbu X sampai last[0]; Y/Z penuh kecuali hanya
+        # satu irisan X yang dipakai
+        hi_idx = sizes - 1
+        hi_idx[0] = last[0]
+        if last[0] == 0:
+            hi_idx[1] = last[1]
+            if last[1] == 0:
+                hi_idx[2] = last[2]
+        a = self.origin
+        b = self.origin + hi_idx * self.delta
+        return np.minimum(a, b), np.maximum(a, b)
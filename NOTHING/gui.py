@@ -1,11 +1,18 @@
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
 import numpy as np
 import pandas as pd
 
+import instrument
+from cache import PointCache
 from generator import PointGenerator
+from gridpoints import GridPoints
 from visualizer import PointVisualizer
 from filemanager import FileManager
+from labels import PointLabels
+from quantized import QuantizedPoints
+from virtualtable import VirtualTable
+from worker import BackgroundJob
 
 
 class CoordinateGUI:
@@ -59,38 +66,65 @@ class CoordinateGUI:
         ttk.Combobox(
             input_frame,
             textvariable=self.mode_var,
-            values=['grid', 'random'],
-            width=6
+            values=['grid', 'random', 'poisson', 'sobol', 'halton'],
+            width=8
         ).grid(row=4, column=1)
 
+        # Seed opsional untuk mode acak: kosong = set titik baru setiap Generate,
+        # diisi = hasil bisa diulang (dan diambil dari cache)
+        tk.Label(input_frame, text="Seed").grid(row=4, column=2)
+        self.seed = tk.Entry(input_frame, width=8)
+        self.seed.grid(row=4, column=3)
+
         # Tombol aksi
         btn_frame = tk.Frame(self.root)
         btn_frame.pack(pady=5)
 
-        tk.Button(btn_frame, text="Generate", command=self.generate_points).grid(row=0, column=0, padx=5)
-        tk.Button(btn_frame, text="Plot 3D", command=self.plot_points).grid(row=0, column=1, padx=5)
-        tk.Button(btn_frame, text="Save CSV", command=self.save_points).grid(row=0, column=2, padx=5)
+        self.btn_generate = tk.Button(btn_frame, text="Generate", command=self.generate_points)
+        self.btn_plot = tk.Button(btn_frame, text="Plot 3D", command=self.plot_points)
+        self.btn_save = tk.Button(btn_frame, text="Save CSV", command=self.save_points)
+        self.btn_load = tk.Button(btn_frame, text="Load CSV", command=self.load_points)
+        self.btn_cancel = tk.Button(btn_frame, text="Cancel", command=self.cancel_job, state="disabled")
+        self.btn_generate.grid(row=0, column=0, padx=5)
+        self.btn_plot.grid(row=0, column=1, padx=5)
+        self.btn_save.grid(row=0, column=2, padx=5)
+        self.btn_load.grid(row=0, column=3, padx=5)
+        self.btn_cancel.grid(row=0, column=4, padx=5)
 
-        # Tabel hasil koordinat (dengan kolom Label)
-        self.table = ttk.Treeview(
-            self.root,
-            columns=("Label", "X", "Y", "Z"),
-            show='headings',
-            height=10
-        )
-        for col in ("Label", "X", "Y", "Z"):
-            self.table.heading(col, text=col)
-            self.table.column(col, width=100, anchor='center')
+        # Progress pekerjaan latar (generate / simpan)
+        progress_frame = tk.Frame(self.root)
+        progress_frame.pack(fill="x", padx=10)
+        self.progress = ttk.Progressbar(progress_frame, mode="determinate", maximum=100)
+        self.progress.pack(side="left", fill="x", expand=True)
+        self.status = tk.Label(progress_frame, text="Siap", width=64, anchor="w")
+        self.status.pack(side="left", padx=(8, 0))
+
+        # Tabel hasil koordinat (dengan kolom Label).
+        # Tabel virtual: hanya baris yang terlihat yang diisi dari array.
+        self.table = VirtualTable(self.root, columns=("Label", "X", "Y", "Z"), height=10)
         self.table.pack(padx=10, pady=10)
 
         # Variabel penyimpanan titik
         self.points = None   # numpy array (N,3)
-        self.labels = None   # list (N,)
+        self.labels = None   # PointLabels (N,)
+
+        # Pekerjaan latar yang sedang berjalan (BackgroundJob) atau None
+        self.job = None
+
+        # Cache hasil generate (parameter sama -> array yang sama, tanpa hitung
+        # ulang) dan visualizer terakhir (LOD-nya dipakai ulang saat plot ulang)
+        self.cache = PointCache()
+        self.visualizer = None
+
+        # Waktu per tahap (generate, simpan, plot) untuk status bar; tanpa
+        # thread sampler, RSS puncak dibaca dari getrusage
+        self.recorder = instrument.enable(sample_memory=False)
+        self._span_mark = 0
 
     def _normalize_result(self, result, gen):
         """
         Terima hasil dari PointGenerator (bisa ndarray atau pandas DataFrame).
-        Kembalikan tuple (points_ndarray, labels_list).
+        Kembalikan tuple (points: ndarray/GridPoints/QuantizedPoints, PointLabels).
         """
         # Jika pandas DataFrame
         if isinstance(result, pd.DataFrame):
@@ -101,19 +135,80 @@ class CoordinateGUI:
                 raise ValueError("DataFrame hasil generator tidak memiliki kolom X,Y,Z")
             # Ambil label jika ada
             if "Label" in result.columns:
-                labels = result["Label"].astype(str).tolist()
+                labels = PointLabels.from_sequence(result["Label"].astype(str).to_numpy())
             else:
-                labels = getattr(gen, "labels", [f"P{i+1}" for i in range(len(pts))])
+                labels = PointLabels.coerce(getattr(gen, "labels", None), len(pts))
+        elif isinstance(result, (GridPoints, QuantizedPoints)):
+            # Grid analitik / kode int32: tidak dijadikan array float64
+            # (tabel/plot/simpan membaca per blok)
+            pts = result
+            labels = PointLabels.coerce(getattr(gen, "labels", None), len(pts))
         else:
-            # Asumsikan ndarray-like
-            pts = np.asarray(result, dtype=float)
+            # Asumsikan ndarray-like; float32 dari generator tetap float32
+            pts = np.asarray(result)
+            if not np.issubdtype(pts.dtype, np.floating):
+                pts = pts.astype(float)
             if pts.ndim != 2 or pts.shape[1] != 3:
                 raise ValueError("Hasil generator harus array shape (N,3) atau DataFrame dengan kolom X,Y,Z")
-            labels = getattr(gen, "labels", [f"P{i+1}" for i in range(pts.shape[0])])
+            labels = PointLabels.coerce(getattr(gen, "labels", None), pts.shape[0])
         return pts, labels
 
+    def _start_job(self, name, func, on_done):
+        """
+        Menjalankan func(progress) di thread latar. Tombol aksi dinonaktifkan
+        selama pekerjaan berjalan agar tidak bisa diklik ulang.
+        """
+        if self.job is not None and self.job.running:
+            return False
+
+        def on_progress(done, total):
+            if total:
+                self.progress["value"] = 100.0 * done / total
+                self.status.config(text=f"{name}: {done:,}/{total:,}")
+            else:
+                self.status.config(text=f"{name}: {done:,} titik")
+
+        def on_error(e):
+            self._finish_job(f"{name} gagal")
+            messagebox.showerror("Error", f"Terjadi kesalahan: {e}")
+
+        def on_cancel():
+            self._finish_job(f"{name} dibatalkan")
+
+        def done(result):
+            self._finish_job(f"{name} selesai")
+            on_done(result)
+
+        self.job = BackgroundJob(self.root, func, done, on_error=on_error,
+                                 on_progress=on_progress, on_cancel=on_cancel)
+        for btn in (self.btn_generate, self.btn_plot, self.btn_save, self.btn_load):
+            btn.config(state="disabled")
+        self.btn_cancel.config(state="normal")
+        self.progress["value"] = 0
+        self.status.config(text=f"{name}...")
+        self._span_mark = len(self.recorder.spans)
+        self.job.start()
+        return True
+
+    def _finish_job(self, text):
+        """Mengembalikan tombol ke keadaan normal setelah pekerjaan latar selesai."""
+        for btn in (self.btn_generate, self.btn_plot, self.btn_save, self.btn_load):
+            btn.config(state="normal")
+        self.btn_cancel.config(state="disabled")
+        self.status.config(text=self._with_timing(text))
+
+    def _with_timing(self, text):
+        """text + ringkasan waktu span sejak pekerjaan terakhir dimulai."""
+        return f"{text} | {self.recorder.status_text(since=self._span_mark)}"
+
+    def cancel_job(self):
+        """Membatalkan pekerjaan latar yang sedang berjalan."""
+        if self.job is not None and self.job.running:
+            self.job.cancel()
+            self.status.config(text="Membatalkan...")
+
     def generate_points(self):
-        """Menghasilkan titik koordinat dari input pengguna."""
+        """Menghasilkan titik koordinat dari input pengguna (di thread latar)."""
         try:
             xmin = float(self.xmin.get())
             xmax = float(self.xmax.get())
@@ -127,50 +222,91 @@ class CoordinateGUI:
             spacing_text = self.spacing.get().strip()
             spacing = float(spacing_text) if spacing_text != "" else 1.0
             mode = self.mode_var.get()
+            seed_text = self.seed.get().strip()
+            seed = int(seed_text) if seed_text != "" else None
 
             # Buat objek generator
             gen = PointGenerator(
                 xmin, xmax, ymin, ymax, zmin, zmax,
                 num_points=num_points if num_points>0 else 0,
-                spacing=spacing, mode=mode
+                spacing=spacing, mode=mode, seed=seed,
+                cache=self._cache_for(mode, seed)
             )
+        except Exception as e:
+            messagebox.showerror("Error", f"Terjadi kesalahan: {e}")
+            return
 
-            raw = gen.generate()   # bisa ndarray atau DataFrame depending on generator implementation
-            pts, labels = self._normalize_result(raw, gen)
+        def on_done(raw):
+            try:
+                pts, labels = self._normalize_result(raw, gen)
+            except Exception as e:
+                messagebox.showerror("Error", f"Terjadi kesalahan: {e}")
+                return
 
             # Simpan hasil
             self.points = pts
             self.labels = labels
 
-            # Hapus tabel lama
-            for row in self.table.get_children():
-                self.table.delete(row)
-
-            # Masukkan hasil baru ke tabel
-            for label, p in zip(self.labels, self.points):
-                self.table.insert("", "end", values=(label, round(p[0], 2), round(p[1], 2), round(p[2], 2)))
+            # Tampilkan hasil baru di tabel (menggantikan isi lama)
+            self.table.set_data(self.points, self.labels)
+            stats = self.cache.stats
+            self.status.config(text=self._with_timing(
+                f"Cache: {stats['hits']} hit, {stats['misses']} miss"))
 
             messagebox.showinfo("Sukses", "Koordinat berhasil digenerate!")
 
-        except Exception as e:
-            messagebox.showerror("Error", f"Terjadi kesalahan: {e}")
+        # bisa ndarray atau DataFrame depending on generator implementation
+        # Grid dibuat lazy (GridPoints, memori O(1)); random tetap array
+        self._start_job("Generate", lambda progress: gen.generate(progress=progress, lazy=True), on_done)
+
+    def _cache_for(self, mode, seed):
+        """
+        Cache hanya dipakai jika hasilnya bisa diulang: mode 'grid', atau
+        mode acak dengan seed dari pengguna. Tanpa seed setiap Generate
+        menghasilkan set titik baru, jadi tidak ada gunanya disimpan.
+        """
+        return self.cache if mode == 'grid' or seed is not None else None
 
     def plot_points(self):
         """Menampilkan scatter plot 3D di jendela terpisah."""
         if self.points is None:
             messagebox.showwarning("Peringatan", "Generate titik terlebih dahulu!")
             return
-        vis = PointVisualizer(self.points, labels=self.labels)
-        vis.show_3d()
+        if self.job is not None and self.job.running:
+            return
+        # Matplotlib harus berjalan di thread GUI, jadi plot tidak dipindah ke thread latar
+        if self.visualizer is None or self.visualizer.points is not self.points:
+            self.visualizer = PointVisualizer(self.points, labels=self.labels)
+        self._span_mark = len(self.recorder.spans)
+        self.visualizer.show_3d()
+        self.status.config(text=self._with_timing("Plot"))
 
     def save_points(self):
-        """Menyimpan titik ke file CSV."""
+        """Menyimpan titik ke file CSV (streaming, di thread latar)."""
         if self.points is None:
             messagebox.showwarning("Peringatan", "Tidak ada data untuk disimpan!")
             return
         fm = FileManager(self.points, self.labels)
-        fm.save_to_csv("koordinat_output.csv")
-        messagebox.showinfo("Sukses", "File CSV berhasil disimpan!")
+        self._start_job(
+            "Simpan CSV",
+            lambda progress: fm.save_csv_stream("koordinat_output.csv", progress=progress),
+            lambda written: messagebox.showinfo("Sukses", "File CSV berhasil disimpan!"),
+        )
+
+    def load_points(self):
+        """Membaca titik dari file CSV/TXT (Label/Nama, X, Y[, Z]) di thread latar."""
+        path = filedialog.askopenfilename(
+            filetypes=[("CSV/TXT", "*.csv *.txt *.xyz"), ("Semua file", "*.*")]
+        )
+        if not path:
+            return
+
+        def on_done(result):
+            self.points, self.labels = result
+            self.table.set_data(self.points, self.labels)
+            self.status.config(text=f"Load: {len(self.points):,} titik")
+
+        self._start_job("Load CSV", lambda progress: FileManager.load_csv(path, progress=progress), on_done)
 
 
 # Jalankan GUI
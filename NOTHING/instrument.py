@@ -0,0 +1,411 @@
+# instrument.py
+"""
+Instrumentasi ringan: waktu per tahap (span), counter (titik, byte), memori
+puncak, serta opsional cProfile dan tracemalloc.
+
+Contoh:
+    import instrument
+    rec = instrument.enable(trace_memory=True)
+    gen.generate()
+    FileManager(gen.points).save_to_csv("a.csv")
+    instrument.disable()
+    print(rec.format_summary())
+    rec.to_chrome_trace("trace.json")     # buka di chrome://tracing / Perfetto
+    rec.to_jsonl("trace.jsonl")
+
+Di kode yang diukur:
+    with instrument.span("csv.dataframe", rows=n):
+        ...
+    instrument.count("points", n)
+
+    @instrument.traced("generate.grid")
+    def _generate_grid(...): ...
+
+    for chunk in instrument.iter_spans("generate.chunks", chunks, counter="points"):
+        ...     # span hanya waktu membuat chunk, bukan waktu pemakainya
+
+Saat instrumentasi tidak aktif, span() mengembalikan satu objek no-op yang
+sama dan count() langsung kembali, jadi biayanya hanya satu pemanggilan fungsi.
+"""
+
+import cProfile
+import functools
+import io
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+
+try:
+    import resource
+except ImportError:     # Windows
+    resource = None
+
+# Recorder aktif; None = instrumentasi mati
+_recorder = None
+
+# Interval (detik) sampling RSS di thread latar
+_SAMPLE_INTERVAL = 0.05
+
+
+def _windows_memory():
+    """(working set puncak, working set saat ini) dalam byte lewat psapi, atau None."""
+    if sys.platform != "win32":
+        return None
+    try:
+        import ctypes
+        from ctypes import wintypes
+
+        class Counters(ctypes.Structure):
+            _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD)] + [
+                (name, ctypes.c_size_t) for name in (
+                    "PeakWorkingSetSize", "WorkingSetSize", "QuotaPeakPagedPoolUsage",
+                    "QuotaPagedPoolUsage", "QuotaPeakNonPagedPoolUsage",
+                    "QuotaNonPagedPoolUsage", "PagefileUsage", "PeakPagefileUsage")]
+
+        counters = Counters()
+        counters.cb = ctypes.sizeof(Counters)
+        process = ctypes.windll.kernel32.GetCurrentProcess()
+        if not ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+            return None
+        return counters.PeakWorkingSetSize, counters.WorkingSetSize
+    except (OSError, AttributeError):
+        return None
+
+
+def _max_rss_bytes():
+    """RSS puncak proses sejak mulai (byte), atau None jika tidak tersedia."""
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss: KB di Linux, byte di macOS
+        return peak if sys.platform == "darwin" else peak * 1024
+    memory = _windows_memory()
+    return None if memory is None else memory[0]
+
+
+def _rss_bytes():
+    """
+    RSS proses saat ini (byte); dari /proc di Linux, working set di Windows,
+    selain itu RSS puncak. None jika tidak tersedia.
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    memory = _windows_memory()
+    return _max_rss_bytes() if memory is None else memory[1]
+
+
+def _peak(*values):
+    """Nilai terbesar yang bukan None (0 jika semuanya None)."""
+    return max((v for v in values if v is not None), default=0)
+
+
+class _NullSpan:
+    """Span no-op saat instrumentasi mati."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **args):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+# Tanda akhir iterable di iter_spans()
+_DONE = object()
+
+
+class _Span:
+    """Satu span aktif: mencatat waktu mulai/selesai, thread, argumen dan memori."""
+
+    def __init__(self, recorder, name, args):
+        self.recorder = recorder
+        self.name = name
+        self.args = args
+        self.start = 0
+        self.peak_alloc = 0
+
+    def set(self, **args):
+        """Menambah argumen setelah span dimulai (misalnya jumlah baris hasil)."""
+        self.args.update(args)
+
+    def __enter__(self):
+        stack = self.recorder._stack()
+        if self.recorder.trace_memory and tracemalloc.is_tracing():
+            # reset_peak bersifat global: puncak sejauh ini diteruskan ke span induk dulu
+            peak = tracemalloc.get_traced_memory()[1]
+            for parent in stack:
+                parent.peak_alloc = max(parent.peak_alloc, peak)
+            tracemalloc.reset_peak()
+        stack.append(self)
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter_ns()
+        stack = self.recorder._stack()
+        stack.pop()
+        if self.recorder.trace_memory and tracemalloc.is_tracing():
+            self.peak_alloc = max(self.peak_alloc, tracemalloc.get_traced_memory()[1])
+            if stack:
+                stack[-1].peak_alloc = max(stack[-1].peak_alloc, self.peak_alloc)
+            self.args["peak_alloc_mb"] = round(self.peak_alloc / 2**20, 3)
+        rss = _rss_bytes() if self.recorder.sample_memory else None
+        if rss is not None:
+            self.args["rss_mb"] = round(rss / 2**20, 3)
+        if exc[0] is not None:
+            self.args["error"] = exc[0].__name__
+        self.recorder._add_span(self.name, self.start, end, self.args)
+        return False
+
+
+class Recorder:
+    """
+    Kumpulan hasil instrumentasi satu sesi (dibuat oleh enable()).
+
+    - spans: list dict {name, start, dur (detik), thread, args}
+    - counters: dict nama -> total
+    - peak_rss: RSS puncak yang terlihat (byte; 0 jika tidak bisa diukur)
+    - memory: sampel (waktu, rss) dari thread sampler
+    """
+
+    def __init__(self, profile=False, trace_memory=False, sample_memory=True):
+        self.profile = profile
+        self.trace_memory = trace_memory
+        self.sample_memory = sample_memory
+        self.spans = []
+        self.counters = {}
+        self.memory = []
+        self.peak_rss = 0
+        self.origin = time.perf_counter_ns()
+        self.profiler = None
+
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._stop = threading.Event()
+        self._sampler = None
+        self._started_tracemalloc = False
+
+    def _stack(self):
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _add_span(self, name, start, end, args):
+        record = {"name": name, "start": (start - self.origin) / 1e9, "dur": (end - start) / 1e9,
+                  "thread": threading.get_ident(), "args": args}
+        with self._lock:
+            self.spans.append(record)
+
+    def _add_count(self, name, value):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    # -----------------------
+    # Mulai / berhenti
+    # -----------------------
+    def start(self):
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        if self.sample_memory:
+            self._sampler = threading.Thread(target=self._sample, daemon=True)
+            self._sampler.start()
+        if self.profile:
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+
+    def stop(self):
+        if self.profiler is not None:
+            self.profiler.disable()
+        self._stop.set()
+        if self._sampler is not None:
+            self._sampler.join()
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+        self.peak_rss = _peak(self.peak_rss, _max_rss_bytes())
+
+    def _sample(self):
+        while True:
+            rss = _rss_bytes()
+            if rss is not None:
+                self.peak_rss = max(self.peak_rss, rss)
+                self.memory.append(((time.perf_counter_ns() - self.origin) / 1e9, rss))
+            if self._stop.wait(_SAMPLE_INTERVAL):
+                break
+
+    # -----------------------
+    # Ringkasan dan ekspor
+    # -----------------------
+    def summary(self, since=0):
+        """
+        Dict nama span -> {calls, total, max} (detik), urut sesuai kemunculan
+        pertama. since: hanya span mulai indeks ini (misalnya sejak job terakhir).
+        """
+        out = {}
+        for s in self.spans[since:]:
+            entry = out.setdefault(s["name"], {"calls": 0, "total": 0.0, "max": 0.0})
+            entry["calls"] += 1
+            entry["total"] += s["dur"]
+            entry["max"] = max(entry["max"], s["dur"])
+        return out
+
+    def format_summary(self):
+        """Ringkasan teks: waktu per span, counter dan memori puncak."""
+        lines = []
+        for name, e in sorted(self.summary().items(), key=lambda kv: -kv[1]["total"]):
+            lines.append(f"  {name:<24} {e['total']:9.3f} dtk  ({e['calls']}x, maks {e['max']:.3f})")
+        for name, value in self.counters.items():
+            lines.append(f"  {name:<24} {value:>12,}")
+        peak = _peak(self.peak_rss, _max_rss_bytes())
+        if peak:
+            lines.append(f"  {'peak RSS':<24} {peak / 2**20:9.1f} MB")
+        return "\n".join(lines)
+
+    def status_text(self, limit=3, since=0):
+        """Ringkasan satu baris untuk status bar: span terlama + RSS puncak proses."""
+        top = sorted(self.summary(since).items(), key=lambda kv: -kv[1]["total"])[:limit]
+        parts = [f"{name} {e['total']:.2f}s" for name, e in top]
+        peak = _peak(self.peak_rss, _max_rss_bytes())
+        if peak:
+            parts.append(f"peak {peak / 2**20:.0f} MB")
+        return " · ".join(parts)
+
+    def profile_text(self, limit=20, sort="cumulative"):
+        """Tabel pstats teratas (hanya jika enable(profile=True))."""
+        if self.profiler is None:
+            return ""
+        out = io.StringIO()
+        pstats.Stats(self.profiler, stream=out).sort_stats(sort).print_stats(limit)
+        return out.getvalue()
+
+    def to_jsonl(self, path):
+        """Satu objek JSON per baris: span, counter, lalu sampel memori."""
+        with open(path, "w", encoding="utf-8") as f:
+            for s in self.spans:
+                f.write(json.dumps({"type": "span", **s}) + "\n")
+            for name, value in self.counters.items():
+                f.write(json.dumps({"type": "counter", "name": name, "value": value}) + "\n")
+            for t, rss in self.memory:
+                f.write(json.dumps({"type": "memory", "time": t, "rss": rss}) + "\n")
+
+    def to_chrome_trace(self, path):
+        """Format Chrome trace event (chrome://tracing, Perfetto); waktu dalam mikrodetik."""
+        pid = os.getpid()
+        events = [{"name": s["name"], "ph": "X", "ts": s["start"] * 1e6, "dur": s["dur"] * 1e6,
+                   "pid": pid, "tid": s["thread"], "args": s["args"]} for s in self.spans]
+        events += [{"name": "rss_mb", "ph": "C", "ts": t * 1e6, "pid": pid,
+                    "args": {"rss_mb": rss / 2**20}} for t, rss in self.memory]
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms",
+                       "otherData": {"counters": self.counters}}, f)
+
+    def save(self, path):
+        """Ekspor sesuai ekstensi: .jsonl -> JSON lines, selain itu Chrome trace."""
+        if path.lower().endswith(".jsonl"):
+            self.to_jsonl(path)
+        else:
+            self.to_chrome_trace(path)
+
+
+# -----------------------
+# API modul
+# -----------------------
+def enable(profile=False, trace_memory=False, sample_memory=True):
+    """
+    Mengaktifkan instrumentasi dan mengembalikan Recorder baru.
+
+    Parameters:
+    - profile: jalankan cProfile (hanya thread pemanggil)
+    - trace_memory: tracemalloc untuk alokasi puncak per span (memperlambat)
+    - sample_memory: thread latar mencatat RSS setiap _SAMPLE_INTERVAL detik
+    """
+    global _recorder
+    disable()
+    recorder = Recorder(profile, trace_memory, sample_memory)
+    recorder.start()
+    _recorder = recorder
+    return recorder
+
+
+def disable():
+    """Mematikan instrumentasi; mengembalikan Recorder yang tadi aktif (atau None)."""
+    global _recorder
+    recorder, _recorder = _recorder, None
+    if recorder is not None:
+        recorder.stop()
+    return recorder
+
+
+def enabled():
+    return _recorder is not None
+
+
+def recorder():
+    """Recorder aktif atau None."""
+    return _recorder
+
+
+def peak_rss_bytes():
+    """RSS puncak proses ini sejak mulai (byte), atau None jika tidak tersedia di platform ini."""
+    return _max_rss_bytes()
+
+
+def span(name, **args):
+    """Context manager pengukur waktu; no-op jika instrumentasi mati."""
+    rec = _recorder
+    if rec is None:
+        return _NULL_SPAN
+    return _Span(rec, name, args)
+
+
+def count(name, value=1):
+    """Menambah counter name sebesar value; no-op jika instrumentasi mati."""
+    rec = _recorder
+    if rec is not None:
+        rec._add_count(name, value)
+
+
+def traced(name):
+    """Decorator: setiap pemanggilan fungsi menjadi span name."""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            rec = _recorder
+            if rec is None:
+                return func(*args, **kwargs)
+            with _Span(rec, name, {}):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def iter_spans(name, iterable, counter=None):
+    """
+    Meneruskan item iterable; setiap pengambilan item menjadi span name, jadi
+    yang terukur hanya waktu menghasilkan item, bukan waktu pemakainya.
+    counter: nama counter yang ditambah len(item) per item (opsional).
+    """
+    it = iter(iterable)
+    while True:
+        rec = _recorder
+        if rec is None:
+            item = next(it, _DONE)
+        else:
+            with _Span(rec, name, {}):
+                item = next(it, _DONE)
+        if item is _DONE:
+            return
+        if rec is not None and counter is not None:
+            rec._add_count(counter, len(item))
+        yield item
@@ -0,0 +1,162 @@
+# labels.py
+
+import numbers
+
+import numpy as np
+
+
+class PointLabels:
+    """
+    Sequence label titik yang hemat memori.
+
+    - Label default ("P1", "P2", ...) tidak disimpan sama sekali: cukup
+      prefix, nomor awal dan jumlah, lalu string dibuat saat diminta (O(1) memori).
+    - Label kustom disimpan dalam satu buffer byte UTF-8 + array offset,
+      bukan list berisi objek string Python.
+
+    Berperilaku seperti list read-only: len(), indeks, slicing, iterasi.
+    """
+
+    def __init__(self, count, prefix="P", start=1):
+        """
+        Label default: prefix + nomor, mulai dari start.
+        Contoh: PointLabels(3) -> "P1", "P2", "P3"
+        """
+        self._count = int(count)
+        self.prefix = prefix
+        self.start = int(start)
+        # Untuk label kustom: buffer byte dan offset (panjang count + 1)
+        self._data = None
+        self._offsets = None
+
+    @classmethod
+    def from_sequence(cls, labels):
+        """Membuat PointLabels dari list/array string (label kustom)."""
+        if isinstance(labels, PointLabels):
+            return labels
+        encoded = [str(lbl).encode('utf-8') for lbl in labels]
+        lengths = np.fromiter((len(b) for b in encoded), dtype=np.int64, count=len(encoded))
+
+        obj = cls(len(encoded))
+        obj._data = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+        obj._offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=obj._offsets[1:])
+        return obj
+
+    @classmethod
+    def coerce(cls, labels, count):
+        """
+        Normalisasi label untuk count titik:
+        None -> label default, PointLabels -> dipakai apa adanya,
+        sequence lain -> PointLabels.from_sequence.
+        """
+        if labels is None:
+            return cls(count)
+        return cls.from_sequence(labels)
+
+    @property
+    def is_default(self):
+        """True jika label berupa prefix + nomor berurutan (tanpa buffer)."""
+        return self._offsets is None
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            start, stop, step = key.indices(self._count)
+            if step != 1:
+                return PointLabels.from_sequence(self[i] for i in range(start, stop, step))
+            return self._view(start, max(stop, start))
+
+        if not (isinstance(key, numbers.Integral) or np.ndim(key) == 0):
+            return self._take(key)
+
+        i = int(key)
+        if i < 0:
+            i += self._count
+        if not 0 <= i < self._count:
+            raise IndexError("indeks label di luar jangkauan")
+        if self.is_default:
+            return f"{self.prefix}{self.start + i}"
+        return self._data[self._offsets[i]:self._offsets[i + 1]].tobytes().decode('utf-8')
+
+    def __iter__(self):
+        if self.is_default:
+            prefix = self.prefix
+            return (f"{prefix}{i}" for i in range(self.start, self.start + self._count))
+        return (self[i] for i in range(self._count))
+
+    def __eq__(self, other):
+        if isinstance(other, PointLabels) and self.is_default and other.is_default:
+            return (self._count, self.prefix, self.start) == (other._count, other.prefix, other.start)
+        try:
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        except TypeError:
+            return NotImplemented
+
+    def __repr__(self):
+        if self.is_default and self._count > 0:
+            return f"PointLabels({self[0]!r} .. {self[-1]!r}, n={self._count})"
+        return f"PointLabels(n={self._count})"
+
+    def __array__(self, dtype=None, copy=None):
+        return self.block(0, self._count).astype(dtype or str)
+
+    def block(self, start, stop):
+        """Label ke-start sampai ke-(stop-1) sebagai array string numpy."""
+        start, stop = max(int(start), 0), min(int(stop), self._count)
+        if stop <= start:
+            return np.array([], dtype=str)
+        if self.is_default:
+            nums = np.arange(self.start + start, self.start + stop).astype(str)
+            return np.char.add(self.prefix, nums)
+        return np.array(self.strings(start, stop), dtype=str)
+
+    def strings(self, start, stop):
+        """
+        Label ke-start sampai ke-(stop-1) sebagai list str. Label kustom
+        dipotong dari buffer dengan map/slice (iterasi di C, tanpa indeks
+        per label), sehingga cepat untuk blok besar (misalnya writer CSV).
+        """
+        start, stop = max(int(start), 0), min(int(stop), self._count)
+        if stop <= start:
+            return []
+        if self.is_default:
+            prefix = self.prefix
+            return [f"{prefix}{i}" for i in range(self.start + start, self.start + stop)]
+        offsets = self._offsets[start:stop + 1]
+        base = int(offsets[0])
+        raw = self._data[base:int(offsets[-1])].tobytes()
+        bounds = (offsets - base).tolist()
+        return list(map(bytes.decode, map(raw.__getitem__, map(slice, bounds[:-1], bounds[1:]))))
+
+    def _take(self, key):
+        """
+        Indeks array (integer atau mask boolean): array string numpy, dihitung
+        langsung dari indeks tanpa membuat arange sepanjang count.
+        """
+        idx = np.asarray(key)
+        if idx.dtype == bool:
+            if idx.shape != (self._count,):
+                raise IndexError("mask label harus sepanjang jumlah label")
+            idx = np.flatnonzero(idx)
+        elif idx.size == 0:
+            idx = idx.astype(np.int64)
+        elif not np.issubdtype(idx.dtype, np.integer):
+            raise IndexError("indeks label harus integer, slice atau mask boolean")
+        idx = np.where(idx < 0, idx + self._count, idx)
+        if idx.size and (idx.min() < 0 or idx.max() >= self._count):
+            raise IndexError("indeks label di luar jangkauan")
+        if self.is_default:
+            return np.char.add(self.prefix, (idx + self.start).astype(str))
+        return np.array([self[j] for j in idx.ravel().tolist()], dtype=str).reshape(idx.shape)
+
+    def _view(self, start, stop):
+        """Potongan label start..stop tanpa menyalin buffer."""
+        if self.is_default:
+            return PointLabels(stop - start, self.prefix, self.start + start)
+        obj = PointLabels(stop - start)
+        obj._data = self._data
+        obj._offsets = self._offsets[start:stop + 1]
+        return obj
@@ -1,8 +1,11 @@
 # main.py
 
+import numpy as np
+
 from generator import PointGenerator
 from visualizer import PointVisualizer
 from filemanager import FileManager
+from pipeline import Pipeline
 
 def main():
     print("=== Koordinat Point Generator (Versi Terminal) ===")
@@ -15,20 +18,24 @@ def main():
     zmin = float(input("Masukkan Zmin: "))
     zmax = float(input("Masukkan Zmax: "))
 
-    mode = input("Pilih mode (grid/random): ").strip().lower()
-    num_points = int(input("Jumlah titik (untuk mode random): "))
-    spacing = float(input("Jarak antar titik (untuk mode grid): "))
+    mode = input("Pilih mode (grid/random/poisson/sobol/halton): ").strip().lower()
+    num_points = int(input("Jumlah titik (untuk mode random/sobol/halton): "))
+    spacing = float(input("Jarak antar titik (untuk mode grid/poisson): "))
 
     # Buat generator
     gen = PointGenerator(xmin, xmax, ymin, ymax, zmin, zmax,
                          num_points=num_points, spacing=spacing, mode=mode)
 
-    # Generate titik
-    points = gen.generate()
-
-    # Simpan ke file CSV
-    fm = FileManager(points)
-    fm.save_to_csv("output_koordinat.csv")
+    # Generate dan simpan ke CSV bersamaan: chunk berikutnya digenerate
+    # selagi chunk sebelumnya ditulis; writer kedua mengumpulkan titik untuk plot
+    collected = []
+    fm = FileManager(None)
+    pipe = Pipeline(gen.iter_chunks(), names=["generate", "csv", "plot"],
+                    writers=[lambda chunks: fm.save("output_koordinat.csv", chunks=chunks),
+                             lambda chunks: collected.extend(np.array(c) for c in chunks)])
+    pipe.run()
+    print(pipe.format_stats())
+    points = np.concatenate(collected) if collected else np.empty((0, 3))
 
     # Visualisasi
     vis = PointVisualizer(points)
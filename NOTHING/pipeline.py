@@ -0,0 +1,361 @@
+# pipeline.py
+"""
+Pipeline producer/consumer: generate -> transformasi -> writer, setiap tahap
+di thread sendiri dan dihubungkan antrian terbatas, sehingga CPU (generate,
+transformasi) dan disk (writer) bekerja bersamaan. Waktu total mendekati
+tahap paling lambat, bukan jumlah semua tahap.
+
+Contoh (dari folder NOTHING):
+    gen = PointGenerator(0, 1000, 0, 1000, 0, 50, num_points=10**7, seed=7)
+    fm = FileManager(None)
+    pipe = Pipeline(gen.iter_chunks(1_000_000),
+                    stages=[LocalOffset((700000, 9300000, 0)).apply],
+                    writers=[lambda chunks: fm.save("a.las", chunks=chunks),
+                             lambda chunks: fm.save("a.npy", chunks=chunks)])
+    counts = pipe.run()      # [jumlah titik a.las, jumlah titik a.npy]
+    print(pipe.format_stats())
+
+- Backpressure: setiap antrian berisi maksimal depth chunk; tahap yang lebih
+  cepat menunggu tahap berikutnya, jadi memori tetap terbatas.
+- Double buffering: tahap transformasi bekerja pada buffer dari pool yang
+  dipakai ulang (minimal 2), bukan array baru per chunk; chunk sumber
+  (misalnya memmap cache yang read-only) tidak diubah. Buffer selalu float64
+  (transformasi CRS butuh presisi penuh); tanpa stage, chunk float32 /
+  QuantizedPoints diteruskan ke writer apa adanya.
+- Error: exception di tahap mana pun menghentikan semua thread dan
+  dilempar ulang oleh run().
+"""
+
+import queue
+import threading
+import time
+
+import numpy as np
+
+from quantized import QuantizedPoints
+
+# Tanda akhir aliran di antrian
+_END = object()
+
+# Interval (detik) thread yang menunggu antrian memeriksa apakah pipeline dibatalkan
+_POLL = 0.1
+
+
+class PipelineAborted(Exception):
+    """Dilempar di dalam tahap yang masih berjalan saat tahap lain gagal."""
+
+
+class StageStats:
+    """
+    Penghitung satu tahap:
+    - chunks, rows: jumlah chunk / baris yang diproses
+    - busy: detik bekerja (tanpa menunggu antrian)
+    - wait_in: detik menunggu input (tahap sebelumnya lebih lambat)
+    - wait_out: detik menunggu tempat di antrian keluar (backpressure)
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.chunks = 0
+        self.rows = 0
+        self.busy = 0.0
+        self.wait_in = 0.0
+        self.wait_out = 0.0
+
+    @property
+    def rows_per_second(self):
+        return self.rows / self.busy if self.busy > 0 else 0.0
+
+    def as_dict(self):
+        return {"name": self.name, "chunks": self.chunks, "rows": self.rows,
+                "busy": self.busy, "wait_in": self.wait_in, "wait_out": self.wait_out,
+                "rows_per_second": self.rows_per_second}
+
+
+class _BufferPool:
+    """
+    Pool buffer float64 (n, 3) yang dipakai ulang. acquire() menunggu jika
+    semua buffer sedang dipakai (ikut menahan laju tahap sebelumnya).
+    """
+
+    def __init__(self, count, abort):
+        self._free = queue.Queue()
+        for _ in range(count):
+            self._free.put(None)     # buffer dialokasikan saat pertama dipakai
+        self._abort = abort
+
+    def acquire(self, rows):
+        while True:
+            try:
+                buf = self._free.get(timeout=_POLL)
+                break
+            except queue.Empty:
+                if self._abort.is_set():
+                    raise PipelineAborted()
+        if buf is None or len(buf) < rows:
+            buf = np.empty((rows, 3), dtype=float)
+        return buf
+
+    def release(self, buf):
+        self._free.put(buf)
+
+
+class _Lease:
+    """Buffer pool yang dipakai bersama beberapa writer; kembali ke pool setelah semua selesai."""
+
+    def __init__(self, pool, buf, users):
+        self._pool = pool
+        self._buf = buf
+        self._users = users
+        self._lock = threading.Lock()
+
+    def release(self):
+        with self._lock:
+            self._users -= 1
+            done = self._users == 0
+        if done:
+            self._pool.release(self._buf)
+
+
+class Pipeline:
+    """
+    Menjalankan source -> stages -> writers dengan satu thread per tahap.
+
+    Parameters:
+    - source: iterable chunk array (m, 3), misalnya PointGenerator.iter_chunks()
+    - stages: list callable f(chunk) -> chunk, dijalankan berurutan; chunk
+      yang diterima selalu buffer milik pipeline (boleh diubah in place),
+      contoh: crs.Transform.apply
+    - writers: list callable f(chunks) yang mengonsumsi iterable chunk
+      (misalnya lambda chunks: fm.save(path, chunks=chunks)); setiap writer
+      menerima semua chunk secara berurutan di thread sendiri. Writer harus
+      selesai memakai sebuah chunk sebelum meminta chunk berikutnya dan
+      tidak boleh mengubahnya (dipakai bersama writer lain). Writer boleh
+      berhenti sebelum chunk habis; sisa chunk untuknya dibuang
+    - depth: kapasitas setiap antrian (chunk)
+    - names: nama tahap opsional untuk statistik
+    """
+
+    def __init__(self, source, stages=(), writers=(), depth=2, names=None):
+        if not writers:
+            raise ValueError("Pipeline membutuhkan minimal satu writer")
+        if depth < 1:
+            raise ValueError("depth harus >= 1")
+        self.source = source
+        self.stages = list(stages)
+        self.writers = list(writers)
+        self.depth = int(depth)
+
+        default = (["source"] + [f"stage{i}" for i in range(len(self.stages))]
+                   + [f"writer{i}" for i in range(len(self.writers))])
+        names = list(names) if names is not None else default
+        if len(names) != len(default):
+            raise ValueError(f"names harus berisi {len(default)} nama")
+        self.stats = [StageStats(n) for n in names]
+        self.elapsed = 0.0
+
+        self._abort = threading.Event()
+        self._error = None
+        self._error_lock = threading.Lock()
+
+    # -----------------------
+    # Antrian dengan pembatalan
+    # -----------------------
+    def _put(self, q, item, stat):
+        t = time.perf_counter()
+        while True:
+            try:
+                q.put(item, timeout=_POLL)
+                break
+            except queue.Full:
+                if self._abort.is_set():
+                    raise PipelineAborted()
+        stat.wait_out += time.perf_counter() - t
+
+    def _get(self, q, stat):
+        t = time.perf_counter()
+        while True:
+            try:
+                item = q.get(timeout=_POLL)
+                break
+            except queue.Empty:
+                if self._abort.is_set():
+                    raise PipelineAborted()
+        stat.wait_in += time.perf_counter() - t
+        return item
+
+    def _fail(self, error):
+        with self._error_lock:
+            if self._error is None:
+                self._error = error
+        self._abort.set()
+
+    def _thread(self, target, *args):
+        def run():
+            try:
+                target(*args)
+            except PipelineAborted:
+                pass
+            except BaseException as e:
+                self._fail(e)
+        return threading.Thread(target=run, daemon=True)
+
+    # -----------------------
+    # Tahap
+    # -----------------------
+    def _run_source(self, out, stat, pool):
+        it = iter(self.source)
+        while True:
+            t = time.perf_counter()
+            chunk = next(it, _END)
+            if chunk is _END:
+                stat.busy += time.perf_counter() - t
+                break
+            if not isinstance(chunk, QuantizedPoints):
+                chunk = np.asarray(chunk)
+            if chunk.ndim != 2 or chunk.shape[1] != 3:
+                raise ValueError("Setiap chunk harus array shape (m,3)")
+            lease = None
+            if pool is not None:
+                # Salin ke buffer pool: stage boleh mengubah in place tanpa
+                # menyentuh data sumber (misalnya memmap cache read-only)
+                buf = pool.acquire(len(chunk))
+                view = buf[:len(chunk)]
+                if isinstance(chunk, QuantizedPoints):
+                    chunk.block(0, len(chunk), out=view)
+                else:
+                    np.copyto(view, chunk, casting='unsafe')
+                chunk, lease = view, _Lease(pool, buf, len(self.writers))
+            stat.busy += time.perf_counter() - t
+            stat.chunks += 1
+            stat.rows += len(chunk)
+            self._put(out, (chunk, lease), stat)
+        self._put(out, _END, stat)
+
+    def _run_stage(self, func, inp, out, stat):
+        while True:
+            item = self._get(inp, stat)
+            if item is _END:
+                break
+            chunk, lease = item
+            t = time.perf_counter()
+            result = func(chunk)
+            if result is not None:
+                chunk = result
+            stat.busy += time.perf_counter() - t
+            stat.chunks += 1
+            stat.rows += len(chunk)
+            self._put(out, (chunk, lease), stat)
+        self._put(out, _END, stat)
+
+    def _run_fanout(self, inp, outs, stat):
+        """Meneruskan setiap chunk ke antrian semua writer (thread ringan)."""
+        while True:
+            item = self._get(inp, stat)
+            for q in outs:
+                self._put(q, item, stat)
+            if item is _END:
+                break
+
+    def _writer_chunks(self, inp, stat, finished):
+        """
+        Iterable untuk writer: membaca antrian, mengukur waktu kerja writer per
+        chunk. finished diisi True begitu akhir aliran terbaca.
+        """
+        while True:
+            item = self._get(inp, stat)
+            if item is _END:
+                finished.append(True)
+                return
+            chunk, lease = item
+            stat.chunks += 1
+            stat.rows += len(chunk)
+            t = time.perf_counter()
+            try:
+                yield chunk
+            finally:
+                stat.busy += time.perf_counter() - t
+                if lease is not None:
+                    lease.release()
+
+    def _run_writer(self, func, inp, stat, results, index):
+        t = time.perf_counter()
+        finished = []
+        chunks = self._writer_chunks(inp, stat, finished)
+        try:
+            results[index] = func(chunks)
+        finally:
+            # Melepas lease chunk terakhir jika writer berhenti di tengah iterasi
+            chunks.close()
+        # Sisa waktu setelah chunk terakhir (menutup file, menulis header)
+        stat.busy += max(time.perf_counter() - t - stat.busy - stat.wait_in, 0.0)
+        if not finished:
+            self._drain(inp)
+
+    def _drain(self, inp):
+        """
+        Writer selesai sebelum membaca semua chunk: sisa antrian dibuang sampai
+        akhir aliran (lease dilepas), supaya tahap sebelumnya tidak tertahan.
+        """
+        stat = StageStats("drain")
+        while True:
+            item = self._get(inp, stat)
+            if item is _END:
+                return
+            lease = item[1]
+            if lease is not None:
+                lease.release()
+
+    # -----------------------
+    # Menjalankan
+    # -----------------------
+    def run(self):
+        """
+        Menjalankan pipeline sampai selesai. Mengembalikan list hasil setiap
+        writer (misalnya jumlah titik yang ditulis). Exception pertama dari
+        tahap mana pun dilempar ulang di sini setelah semua thread berhenti.
+        """
+        start = time.perf_counter()
+        n_stages = len(self.stages)
+        pool = _BufferPool(max(2, self.depth) + self.depth * (n_stages + len(self.writers)),
+                           self._abort) if n_stages else None
+
+        links = [queue.Queue(self.depth) for _ in range(n_stages + 1)]
+        writer_queues = ([links[-1]] if len(self.writers) == 1
+                         else [queue.Queue(self.depth) for _ in self.writers])
+        results = [None] * len(self.writers)
+
+        threads = [self._thread(self._run_source, links[0], self.stats[0], pool)]
+        for i, func in enumerate(self.stages):
+            threads.append(self._thread(self._run_stage, func, links[i], links[i + 1],
+                                        self.stats[i + 1]))
+        if len(self.writers) > 1:
+            threads.append(self._thread(self._run_fanout, links[-1], writer_queues,
+                                        StageStats("fanout")))
+        for i, func in enumerate(self.writers):
+            threads.append(self._thread(self._run_writer, func, writer_queues[i],
+                                        self.stats[n_stages + 1 + i], results, i))
+
+        for t in threads:
+            t.start()
+        try:
+            for t in threads:
+                t.join()
+        except KeyboardInterrupt as e:
+            self._fail(e)
+            for t in threads:
+                t.join()
+        self.elapsed = time.perf_counter() - start
+
+        if self._error is not None:
+            raise self._error
+        return results
+
+    def format_stats(self):
+        """Ringkasan teks per tahap: baris, baris/detik, waktu kerja dan tunggu."""
+        lines = [f"Pipeline selesai dalam {self.elapsed:.3f} detik"]
+        for s in self.stats:
+            lines.append(f"  {s.name:<10} {s.rows:>12,} baris  {s.rows_per_second:>14,.0f} baris/dtk  "
+                         f"kerja {s.busy:7.3f} dtk  tunggu input {s.wait_in:7.3f}  "
+                         f"tunggu output {s.wait_out:7.3f}")
+        return "\n".join(lines)
@@ -0,0 +1,399 @@
+# poisson.py
+"""
+Poisson-disk (blue noise) sampling: titik acak dengan jarak minimum radius.
+
+Algoritma Bridson (2007) dengan background grid berukuran sel radius/sqrt(d),
+sehingga setiap sel memuat paling banyak satu titik dan uji jarak hanya
+melihat sel-sel tetangga (O(1) per kandidat, O(N) total). Agar cepat di
+numpy, langkah-langkahnya dikerjakan per batch:
+
+1. Seeding: kandidat acak seragam di seluruh kotak (dart throwing) diterima
+   sekaligus, sehingga banyak "front" tumbuh bersamaan.
+2. Setiap iterasi, semua titik aktif melempar beberapa kandidat di cincin
+   [radius, 2*radius]; kandidat pertama yang lolos uji grid (tidak
+   ada titik lain dalam radius) diambil, satu per titik aktif.
+3. Konflik antar kandidat di iterasi yang sama diselesaikan dengan prioritas
+   acak: kandidat dibuang jika ada kandidat berprioritas lebih tinggi dalam
+   radius. Hasilnya selalu memenuhi jarak minimum.
+4. Titik aktif dinonaktifkan setelah k kandidat berturut-turut gagal (k=30
+   seperti Bridson), sehingga hasilnya (hampir) maksimal.
+5. 1D: kandidat acak mudah melewatkan celah yang hanya sedikit lebih lebar
+   dari 2*radius, jadi sapuan akhir mengisi setiap celah yang masih muat
+   satu titik; hasil 1D selalu maksimal (tidak ada titik yang bisa ditambah).
+
+Sumbu yang datar (min == max) diabaikan: kotak 2D menghasilkan sampling 2D.
+
+Memori: grid padat (satu int per sel) hanya dipakai sampai _DENSE_CELLS sel
+dan jika max_points tidak jauh lebih kecil dari jumlah sel; selain itu dipakai
+hash table sel (_HashGrid) yang tumbuh sesuai jumlah titik. Dengan max_points, jumlah kandidat seeding dibatasi oleh
+max_points, sehingga kotak besar dengan sedikit titik tetap murah.
+
+Biaya linear dalam jumlah titik, tetapi setiap titik menguji sekitar k
+kandidat: kira-kira 15-25 mikrodetik per titik di 2D dan 30-40 di 3D
+(satu core), jadi 1 juta titik 2D butuh sekitar 15-25 detik.
+"""
+
+import itertools
+import math
+
+import numpy as np
+
+# Kandidat per titik aktif per iterasi, dan batas jumlah kandidat per uji
+# tetangga (membatasi array sementara kandidat x sel tetangga)
+_CANDIDATES_PER_ROUND = 4
+_CHECK_BATCH = 1 << 13
+# Kandidat seeding per sel grid, kandidat seeding per max_points (jika ada
+# batas), dan jumlah kandidat seeding per batch
+_SEED_FRACTION = 0.25
+_SEED_PER_POINT = 2
+_SEED_BATCH = 1 << 20
+# Batas sel grid padat (int32 per sel, ~128 MB), dan rasio sel per max_points;
+# di atas salah satunya dipakai _HashGrid
+_DENSE_CELLS = 1 << 25
+_CELLS_PER_POINT = 64
+# Konstanta hash multiplikatif (Fibonacci hashing) untuk _HashGrid
+_HASH_MULTIPLIER = np.uint64(0x9E3779B97F4A7C15)
+
+
+def poisson_disk(lo, hi, radius, rng, k=30, max_points=0, progress=None, region=None):
+    """
+    Titik Poisson-disk di dalam kotak lo..hi (masing-masing 3 nilai).
+
+    Parameters:
+    - radius: jarak minimum antar titik (> 0)
+    - rng: numpy.random.Generator
+    - k: jumlah kandidat gagal berturut-turut sebelum titik aktif berhenti
+    - max_points: jika > 0, berhenti setelah titik sebanyak ini
+    - progress: callback opsional progress(selesai, total); total adalah
+      jumlah titik sejauh ini, selesai adalah titik yang tidak aktif lagi
+    - region: fungsi opsional region(points) -> mask boolean untuk titik (M, 3);
+      hanya kandidat dengan mask True yang diterima (misalnya Polygon.contains)
+
+    Mengembalikan numpy array shape (N, 3).
+    """
+    return _PoissonSampler(lo, hi, radius, rng, k, region).run(max_points, progress)
+
+
+class _PoissonSampler:
+    """State satu sampling: background grid, titik diterima dan daftar aktif."""
+
+    def __init__(self, lo, hi, radius, rng, k, region=None):
+        self.lo = np.asarray(lo, dtype=float)
+        self.hi = np.asarray(hi, dtype=float)
+        self.radius = float(radius)
+        if self.radius <= 0:
+            raise ValueError("spacing harus > 0")
+        self.rng = rng
+        self.k = int(k)
+        self.region = region
+
+        # Hanya sumbu yang punya rentang ikut disampling
+        self.axes = np.flatnonzero(self.hi > self.lo)
+        d = self.d = len(self.axes)
+        if d == 0:
+            return
+        self.origin = self.lo[self.axes]
+        self.extent = (self.hi - self.lo)[self.axes]
+        self.cell = self.radius / math.sqrt(d)
+        self.dims = np.maximum(np.ceil(self.extent / self.cell).astype(np.int64), 1)
+
+        # Grid diberi padding pad sel di setiap sisi, sehingga indeks tetangga
+        # tidak perlu dicek batasnya. Isi: id titik, -1 = kosong.
+        pad = self.pad = math.ceil(math.sqrt(d))
+        shape = self.dims + 2 * pad
+        self.strides = np.cumprod(np.concatenate(([1], shape[:0:-1])))[::-1].astype(np.int64)
+        self.size = math.prod(int(n) for n in shape)
+        if self.size >= 2 ** 62:
+            raise ValueError("Kotak terlalu besar untuk spacing ini (indeks sel melebihi int64)")
+        self.grid = None        # dibuat di run(), tergantung max_points
+
+        # Sel tetangga yang mungkin memuat titik berjarak < radius:
+        # jarak minimum antar sel = cell * sqrt(sum(max(|o|-1, 0)^2)) < cell * sqrt(d)
+        offsets = [o for o in itertools.product(range(-pad, pad + 1), repeat=d)
+                   if sum(max(abs(v) - 1, 0) ** 2 for v in o) < d]
+        # Dibagi dua: 3^d - 1 sel terdekat (paling sering menolak kandidat) dan
+        # sisanya, yang hanya dicek untuk kandidat yang lolos sel terdekat.
+        # Sel kandidat sendiri dicek terpisah (satu baca grid) sebelum keduanya
+        inner = [o for o in offsets if 0 < max(abs(v) for v in o) <= 1]
+        outer = [o for o in offsets if max(abs(v) for v in o) > 1]
+        self.inner = np.array(inner, dtype=np.int64).reshape(-1, d) @ self.strides
+        self.outer = np.array(outer, dtype=np.int64).reshape(-1, d) @ self.strides
+        self.neighbors = np.concatenate((self.inner, self.outer))
+
+        self.points = np.empty((1024, d))
+        self.count = 0
+
+    def run(self, max_points=0, progress=None):
+        if self.d == 0:
+            out = self.lo[None, :].copy()
+            return out if self.region is None else out[self.region(out)]
+        limit = max_points if max_points > 0 else None
+        # Grid padat hanya jika muat anggaran dan tidak jauh lebih besar dari
+        # jumlah titik yang diminta; selain itu hash table sel
+        if self.size <= _DENSE_CELLS and (limit is None or self.size <= _CELLS_PER_POINT * limit):
+            self.grid = np.full(self.size, -1, dtype=np.int32)
+        else:
+            self.grid = _HashGrid()
+
+        # 1. Seeding: kandidat seragam di seluruh kotak, per batch; dengan
+        # batas titik, kandidat secukupnya saja (bukan sebanding volume kotak)
+        n_seed = max(1, int(math.prod(int(n) for n in self.dims) * _SEED_FRACTION))
+        if limit is not None:
+            n_seed = min(n_seed, _SEED_PER_POINT * limit)
+        active = []
+        for start in range(0, n_seed, _SEED_BATCH):
+            if limit is not None and self.count >= limit:
+                break
+            m = min(_SEED_BATCH, n_seed - start)
+            seeds = self.origin + self.rng.random((m, self.d)) * self.extent
+            active.append(self._accept(seeds, limit))
+        active = np.concatenate(active)
+        misses = np.zeros(len(active), dtype=np.int64)
+
+        # 2-4. Bridson per batch titik aktif
+        m = _CANDIDATES_PER_ROUND
+        while len(active) and (limit is None or self.count < limit):
+            owner = np.repeat(np.arange(len(active)), m)
+            cand = self.points[active[owner]] + self._annulus(len(owner))
+            ok = self._free(cand, owner)
+
+            # Seperti Bridson: satu kandidat valid per titik aktif per putaran;
+            # titik aktif yang semua kandidatnya gagal mendapat tambahan miss
+            hit = np.zeros(len(active), dtype=bool)
+            hit[owner[ok]] = True
+            misses = np.where(hit, 0, misses + m)
+
+            new = self._accept(cand[ok], limit, checked=True)
+            keep = misses < self.k
+            active = np.concatenate((active[keep], new))
+            misses = np.concatenate((misses[keep], np.zeros(len(new), dtype=np.int64)))
+            if progress is not None:
+                progress(self.count - len(active), self.count)
+
+        if self.d == 1:
+            self._fill_gaps(limit)
+            if progress is not None:
+                progress(self.count, self.count)
+        return self._full(self.points[:self.count])
+
+    def _fill_gaps(self, limit):
+        """
+        Sapuan akhir 1D: setiap celah antar titik berurutan yang lebih lebar
+        dari 2*radius (atau >= radius ke ujung kotak) diberi satu titik acak di
+        bagian celah yang valid, diulang sampai tidak ada celah tersisa. Titik
+        di celah berbeda tidak bisa berkonflik, jadi satu putaran mengisi semua
+        celah sekaligus. Dengan region, berhenti setelah k putaran tanpa titik baru.
+        """
+        r = self.radius
+        lo = self.origin[0]
+        hi = lo + self.extent[0]
+        misses = 0
+        while misses < self.k and (limit is None or self.count < limit):
+            x = np.sort(self.points[:self.count, 0])
+            left = np.concatenate(([lo - r], x)) + r
+            right = np.concatenate((x, [hi + r])) - r
+            gap = np.flatnonzero(right > left)
+            if len(gap) == 0:
+                break
+            cand = left[gap] + self.rng.random(len(gap)) * (right[gap] - left[gap])
+            new = self._accept(cand[:, None], limit)
+            misses = 0 if len(new) else misses + 1
+
+    def _full(self, pts):
+        """Titik (M, d) menjadi koordinat (M, 3); sumbu datar diisi lo."""
+        out = np.empty((len(pts), 3))
+        out[:] = self.lo
+        out[:, self.axes] = pts
+        return out
+
+    def _annulus(self, n):
+        """n vektor acak seragam di cincin/kulit bola radius..2*radius."""
+        d = self.d
+        u = self.rng.random((n, 2))
+        dist = self.radius * (1.0 + u[:, 0] * (2.0 ** d - 1.0)) ** (1.0 / d)
+        if d == 1:
+            return np.where(u[:, 1] < 0.5, -dist, dist)[:, None]
+        theta = 2.0 * np.pi * u[:, 1]
+        if d == 2:
+            return np.column_stack((dist * np.cos(theta), dist * np.sin(theta)))
+        # 3D: z seragam di [-1, 1] memberi arah seragam di bola
+        z = 2.0 * self.rng.random(n) - 1.0
+        ring = dist * np.sqrt(1.0 - z * z)
+        return np.column_stack((ring * np.cos(theta), ring * np.sin(theta), dist * z))
+
+    def _cells(self, pts):
+        """Indeks datar sel grid (dengan padding) untuk setiap titik."""
+        cell = np.floor((pts - self.origin) / self.cell).astype(np.int64)
+        cell = np.clip(cell, 0, self.dims - 1) + self.pad
+        return cell @ self.strides
+
+    def _free(self, cand, owner=None):
+        """
+        Mask kandidat di dalam kotak yang tidak berjarak < radius dari titik
+        yang sudah diterima. Jika owner diberikan, paling banyak satu kandidat
+        (yang pertama lolos) per owner yang ditandai.
+
+        Sel kandidat sendiri dicek lebih dulu: sel yang sudah terisi selalu
+        menolak kandidat (diagonal sel = radius), cukup satu baca grid tanpa
+        menghitung jarak. Hanya kandidat di sel kosong yang dicek ke tetangga.
+        """
+        ok = np.all((cand >= self.origin) & (cand <= self.origin + self.extent), axis=1)
+        if self.region is not None:
+            ok[ok] = self.region(self._full(cand[ok]))
+        idx = np.flatnonzero(ok)
+        flat = self._cells(cand[idx])
+        empty = self.grid[flat] < 0
+        idx, flat = idx[empty], flat[empty]
+
+        near = self._near(cand[idx], flat, self.inner)
+        idx, flat = idx[~near], flat[~near]
+        if owner is not None:
+            _, first = np.unique(owner[idx], return_index=True)
+            idx, flat = idx[first], flat[first]
+        near = self._near(cand[idx], flat, self.outer)
+
+        ok[:] = False
+        ok[idx[~near]] = True
+        return ok
+
+    def _near(self, cand, flat, neighbors, rank=None):
+        """
+        True untuk kandidat yang punya titik berjarak < radius di sel
+        cell + neighbors (offset indeks datar).
+        Tanpa rank: dibandingkan dengan titik yang sudah diterima (id >= 0).
+        Dengan rank: dibandingkan dengan kandidat lain yang ditandai di grid
+        sebagai -2 - rank, hanya yang prioritasnya lebih tinggi (rank lebih kecil).
+        """
+        r2 = self.radius * self.radius
+        near = np.zeros(len(cand), dtype=bool)
+        if len(neighbors) == 0:
+            return near
+        for s in range(0, len(cand), _CHECK_BATCH):
+            ids = self.grid[flat[s:s + _CHECK_BATCH, None] + neighbors]
+            if rank is None:
+                rows, cols = np.nonzero(ids >= 0)
+                other = ids[rows, cols]
+                points = self.points
+            else:
+                rows, cols = np.nonzero(ids <= -2)
+                other = -2 - ids[rows, cols]
+                higher = other < rank[s + rows]
+                rows, other = rows[higher], other[higher]
+                points = cand
+            d2 = ((points[other] - cand[s + rows]) ** 2).sum(axis=1)
+            near[s + rows[d2 < r2]] = True
+        return near
+
+    def _accept(self, cand, limit, checked=False):
+        """
+        Menerima kandidat yang saling tidak berkonflik (prioritas acak) dan
+        memasukkannya ke grid. Mengembalikan id titik baru.
+        """
+        if not checked:
+            cand = cand[self._free(cand)]
+        if len(cand) == 0:
+            return np.arange(0)
+
+        # Prioritas acak; satu kandidat per sel (prioritas tertinggi)
+        cand = cand[self.rng.permutation(len(cand))]
+        flat = self._cells(cand)
+        _, first = np.unique(flat, return_index=True)
+        first.sort()
+        first = first[self.grid[flat[first]] < 0]
+        cand, flat = cand[first], flat[first]
+
+        # Konflik antar kandidat: tandai sel kandidat dengan urutan prioritasnya
+        rank = np.arange(len(cand))
+        self.grid[flat] = -2 - rank
+        near = self._near(cand, flat, self.neighbors, rank=rank)
+        self.grid[flat] = -1
+        cand, flat = cand[~near], flat[~near]
+        if limit is not None:
+            cand, flat = cand[:limit - self.count], flat[:limit - self.count]
+        # Id baru diurutkan menurut sel: titik aktif yang berdekatan di ruang
+        # juga berdekatan di memori, sehingga akses grid lebih ramah cache
+        order = np.argsort(flat)
+        cand, flat = cand[order], flat[order]
+
+        ids = np.arange(self.count, self.count + len(cand))
+        if self.count + len(cand) > len(self.points):
+            grown = np.empty((max(2 * len(self.points), self.count + len(cand)), self.d))
+            grown[:self.count] = self.points[:self.count]
+            self.points = grown
+        self.points[ids] = cand
+        self.grid[flat] = ids
+        self.count += len(cand)
+        return ids
+
+
+class _HashGrid:
+    """
+    Pengganti array grid padat untuk kotak dengan sangat banyak sel: peta
+    indeks sel -> id titik sebagai hash table open addressing (linear probing)
+    di atas array numpy. Mendukung indeks vektor yang sama seperti grid padat
+    (grid[flat] dan grid[flat] = nilai, -1 = kosong); memori sebanding jumlah
+    sel yang terisi. Key dalam satu penulisan harus unik.
+    """
+
+    def __init__(self, capacity=1 << 16):
+        self.keys = np.full(capacity, -1, dtype=np.int64)
+        self.values = np.full(capacity, -1, dtype=np.int64)
+        self.used = 0
+
+    def _hash(self, keys):
+        bits = len(self.keys).bit_length() - 1
+        return ((keys.astype(np.uint64) * _HASH_MULTIPLIER) >> np.uint64(64 - bits)).astype(np.int64)
+
+    def __getitem__(self, index):
+        index = np.asarray(index, dtype=np.int64)
+        keys = index.ravel()
+        out = np.full(len(keys), -1, dtype=np.int64)
+        mask = len(self.keys) - 1
+        todo = np.arange(len(keys))
+        slot = self._hash(keys)
+        while len(todo):
+            stored = self.keys[slot]
+            found = stored == keys[todo]
+            out[todo[found]] = self.values[slot[found]]
+            probe = ~found & (stored != -1)
+            todo, slot = todo[probe], (slot[probe] + 1) & mask
+        return out.reshape(index.shape)
+
+    def __setitem__(self, index, value):
+        keys = np.asarray(index, dtype=np.int64).ravel()
+        values = np.broadcast_to(np.asarray(value, dtype=np.int64), keys.shape)
+        if 2 * (self.used + len(keys)) > len(self.keys):
+            self._grow(self.used + len(keys))
+        mask = len(self.keys) - 1
+        todo = np.arange(len(keys))
+        slot = self._hash(keys)
+        while len(todo):
+            stored = self.keys[slot]
+            found = stored == keys[todo]
+            self.values[slot[found]] = values[todo[found]]
+            # Slot kosong: key baru ditulis, satu key per slot (sisanya mencoba
+            # lagi); key baru bernilai -1 (kosong) tidak perlu disimpan
+            empty = np.flatnonzero(stored == -1)
+            _, first = np.unique(slot[empty], return_index=True)
+            claim = empty[first]
+            claim = claim[values[todo[claim]] != -1]
+            self.keys[slot[claim]] = keys[todo[claim]]
+            self.values[slot[claim]] = values[todo[claim]]
+            self.used += len(claim)
+
+            done = found | (stored == -1) & (values[todo] == -1)
+            done[claim] = True
+            slot = np.where(found | (stored == -1), slot, (slot + 1) & mask)
+            todo, slot = todo[~done], slot[~done]
+
+    def _grow(self, needed):
+        """Memperbesar tabel (pangkat 2, terisi <= 1/4) lalu memasukkan ulang semua entri."""
+        capacity = len(self.keys)
+        while capacity < 4 * needed:
+            capacity *= 2
+        live = self.keys != -1
+        keys, values = self.keys[live], self.values[live]
+        self.keys = np.full(capacity, -1, dtype=np.int64)
+        self.values = np.full(capacity, -1, dtype=np.int64)
+        self.used = 0
+        self[keys] = values
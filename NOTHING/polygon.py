@@ -0,0 +1,323 @@
+# polygon.py
+
+import hashlib
+import json
+import os
+
+import numpy as np
+
+# Batas jumlah pasangan (titik, edge) yang diuji sekaligus di contains()
+_PAIR_BATCH = 1 << 22
+# Jumlah sel mask raster (kira-kira) di atas bounding box poligon
+_RASTER_CELLS = 1 << 18
+
+# Status sel mask raster
+_OUTSIDE, _INSIDE, _BOUNDARY = 0, 1, 2
+
+
+class Polygon:
+    """
+    Area survei 2D (X, Y) berbentuk poligon sembarang, untuk membatasi titik
+    hasil PointGenerator.
+
+    Poligon terdiri dari satu atau lebih ring (list vertex). Aturan even-odd
+    dipakai, sehingga ring di dalam ring lain menjadi lubang dan beberapa
+    ring terpisah menjadi multipolygon.
+
+    Uji titik-dalam-poligon (contains) divektorisasi dalam dua tingkat:
+    - mask raster di atas bounding box: sel yang seluruhnya di dalam atau di
+      luar poligon langsung menjawab dengan satu lookup
+    - titik di sel yang dilalui tepi poligon diuji tepat terhadap tabel edge
+      sel itu saja: status pusat sel dibalik untuk setiap edge yang memotong
+      jalur dari titik ke pusat sel (lihat _inside_exact)
+    """
+
+    def __init__(self, rings):
+        """
+        Parameters:
+        - rings: list array (K, 2) berisi vertex X, Y setiap ring
+          (ring boleh tertutup atau tidak; vertex pertama tidak perlu diulang)
+        """
+        self.rings = []
+        for ring in rings:
+            ring = np.asarray(ring, dtype=float)[:, :2]
+            if len(ring) > 1 and np.array_equal(ring[0], ring[-1]):
+                ring = ring[:-1]
+            if len(ring) < 3:
+                raise ValueError("Setiap ring poligon harus punya minimal 3 vertex")
+            self.rings.append(ring)
+        if not self.rings:
+            raise ValueError("Poligon tidak punya ring")
+
+        allv = np.concatenate(self.rings)
+        self.xmin, self.ymin = allv.min(axis=0)
+        self.xmax, self.ymax = allv.max(axis=0)
+        self._build_edges()
+        self._build_raster()
+        self.area = self._area()
+
+    # -----------------------
+    # Pembacaan dari file
+    # -----------------------
+    @classmethod
+    def from_file(cls, path):
+        """Membaca poligon dari file GeoJSON (.geojson/.json) atau CSV vertex (.csv)."""
+        if path.lower().endswith(".csv"):
+            return cls.from_csv(path)
+        return cls.from_geojson(path)
+
+    @classmethod
+    def from_geojson(cls, source):
+        """
+        Membaca Polygon/MultiPolygon dari GeoJSON: path file, string JSON, atau dict.
+        Feature dan FeatureCollection diterima (semua poligonnya digabung).
+        Koordinat dipakai apa adanya (tanpa transformasi CRS).
+        """
+        if isinstance(source, str):
+            if os.path.exists(source):
+                with open(source, encoding="utf-8") as f:
+                    source = json.load(f)
+            else:
+                source = json.loads(source)
+
+        rings = []
+
+        def collect(obj):
+            kind = obj.get("type")
+            if kind == "FeatureCollection":
+                for feature in obj["features"]:
+                    collect(feature)
+            elif kind == "Feature":
+                if obj.get("geometry"):
+                    collect(obj["geometry"])
+            elif kind == "GeometryCollection":
+                for geom in obj["geometries"]:
+                    collect(geom)
+            elif kind == "Polygon":
+                rings.extend(np.asarray(r, dtype=float) for r in obj["coordinates"])
+            elif kind == "MultiPolygon":
+                for poly in obj["coordinates"]:
+                    rings.extend(np.asarray(r, dtype=float) for r in poly)
+
+        collect(source)
+        if not rings:
+            raise ValueError("GeoJSON tidak berisi Polygon/MultiPolygon")
+        return cls(rings)
+
+    @classmethod
+    def from_csv(cls, path):
+        """
+        Membaca vertex dari CSV dengan kolom X,Y (pemisah koma, titik koma atau spasi).
+        Header opsional. Jika ada kolom 'ring' (atau 'part'), vertex dikelompokkan
+        per nilai kolom tersebut; tanpa kolom itu semua vertex membentuk satu ring.
+        """
+        with open(path, encoding="utf-8-sig") as f:
+            first = f.readline()
+        delimiter = "," if "," in first else ";" if ";" in first else None
+
+        fields = [c.strip().lower() for c in first.split(delimiter)]
+        try:
+            [float(c) for c in fields if c]
+            header = None
+        except ValueError:
+            header = fields
+
+        data = np.loadtxt(path, delimiter=delimiter, skiprows=0 if header is None else 1,
+                          ndmin=2, encoding="utf-8-sig")
+        if header is None:
+            ix, iy, iring = 0, 1, None
+        else:
+            def column(*names):
+                for name in names:
+                    if name in header:
+                        return header.index(name)
+                return None
+            ix = column("x", "easting", "lon", "longitude")
+            iy = column("y", "northing", "lat", "latitude")
+            iring = column("ring", "part")
+            if ix is None or iy is None:
+                ix, iy = 0, 1
+
+        xy = data[:, [ix, iy]]
+        if iring is None:
+            return cls([xy])
+        ring_id = data[:, iring]
+        # Urutan ring mengikuti kemunculan pertama di file
+        _, first_pos = np.unique(ring_id, return_index=True)
+        return cls([xy[ring_id == ring_id[i]] for i in np.sort(first_pos)])
+
+    # -----------------------
+    # Tabel edge, mask raster dan luas
+    # -----------------------
+    def _build_edges(self):
+        """Menyiapkan array edge (x0, y0) -> (x1, y1) dari semua ring."""
+        starts = np.concatenate(self.rings)
+        ends = np.concatenate([np.roll(r, -1, axis=0) for r in self.rings])
+        self.x0, self.y0 = starts[:, 0], starts[:, 1]
+        self.x1, self.y1 = ends[:, 0], ends[:, 1]
+
+    def _build_raster(self):
+        """
+        Mask raster di atas bounding box: status setiap sel (di luar, di dalam,
+        atau dilalui tepi), status pusat setiap sel, dan daftar edge per sel
+        yang dilalui tepi (format CSR: cell_start/cell_count -> cell_edges).
+        """
+        width = max(self.xmax - self.xmin, 1e-300)
+        height = max(self.ymax - self.ymin, 1e-300)
+        nx = int(np.clip(round(np.sqrt(_RASTER_CELLS * width / height)), 1, _RASTER_CELLS))
+        ny = int(np.clip(_RASTER_CELLS // nx, 1, _RASTER_CELLS))
+        self.nx, self.ny = nx, ny
+        self.cell_w, self.cell_h = width / nx, height / ny
+
+        # Status pusat sel dengan scanline: untuk setiap baris sel, hitung
+        # perpotongan edge di sebelah kanan pusat sel (ganjil = di dalam).
+        # Aturan setengah terbuka ymin <= y < ymax seperti ray casting biasa.
+        ylo = np.minimum(self.y0, self.y1)
+        yhi = np.maximum(self.y0, self.y1)
+        row_lo = np.maximum(np.ceil((ylo - self.ymin) / self.cell_h - 0.5).astype(np.int64), 0)
+        row_hi = np.minimum(np.ceil((yhi - self.ymin) / self.cell_h - 0.5).astype(np.int64) - 1, ny - 1)
+        edge, row = _expand(row_lo, np.maximum(row_hi - row_lo + 1, 0))
+        cy = self.ymin + (row + 0.5) * self.cell_h
+        x = self.x0[edge] + (cy - self.y0[edge]) * (self.x1[edge] - self.x0[edge]) / (self.y1[edge] - self.y0[edge])
+        # Kunci baris*2 + posisi relatif [0,1]: satu array terurut untuk semua baris
+        keys = np.sort(row * 2.0 + np.clip((x - self.xmin) / width, 0.0, 1.0))
+        cx = (np.arange(nx) + 0.5) / nx
+        rows = np.arange(ny)[:, None]
+        right = (np.searchsorted(keys, rows * 2.0 + 1.5)
+                 - np.searchsorted(keys, rows * 2.0 + cx[None, :], side="right"))
+        self.center_inside = (right % 2 == 1).ravel()
+
+        # Sel yang dilalui edge: sampel di sepanjang edge (langkah <= setengah
+        # sel), lalu diperlebar satu sel ke 8 tetangga, sehingga setiap sel yang
+        # disentuh sebuah edge pasti memuat edge itu di daftarnya
+        step = 0.5 * min(self.cell_w, self.cell_h)
+        n = np.ceil(np.hypot(self.x1 - self.x0, self.y1 - self.y0) / step).astype(np.int64) + 1
+        edge, k = _expand(np.zeros(len(n), dtype=np.int64), n)
+        t = k / np.maximum(n - 1, 1)[edge]
+        col = self._cell_col(self.x0[edge] + t * (self.x1[edge] - self.x0[edge]))
+        row = self._cell_row(self.y0[edge] + t * (self.y1[edge] - self.y0[edge]))
+        pairs = [np.unique((row * nx + col) * len(n) + edge)]
+        for dy in (-1, 0, 1):
+            for dx in (-1, 0, 1):
+                r, c = row + dy, col + dx
+                ok = (r >= 0) & (r < ny) & (c >= 0) & (c < nx) & ((dy != 0) | (dx != 0))
+                pairs.append((r[ok] * nx + c[ok]) * len(n) + edge[ok])
+        pairs = np.unique(np.concatenate(pairs))
+        cell, self.cell_edges = np.divmod(pairs, len(n))
+        self.cell_count = np.bincount(cell, minlength=nx * ny)
+        self.cell_start = np.cumsum(self.cell_count) - self.cell_count
+
+        state = np.where(self.center_inside, _INSIDE, _OUTSIDE).astype(np.uint8)
+        state[self.cell_count > 0] = _BOUNDARY
+        self.raster = state
+
+    def _cell_col(self, x):
+        return np.clip(np.floor((x - self.xmin) / self.cell_w), 0, self.nx - 1).astype(np.int64)
+
+    def _cell_row(self, y):
+        return np.clip(np.floor((y - self.ymin) / self.cell_h), 0, self.ny - 1).astype(np.int64)
+
+    def _area(self):
+        """Luas area (aturan even-odd) untuk ring yang tidak saling memotong."""
+        area = 0.0
+        for i, ring in enumerate(self.rings):
+            x, y = ring[:, 0], ring[:, 1]
+            ring_area = 0.5 * abs(np.dot(x, np.roll(y, -1)) - np.dot(y, np.roll(x, -1)))
+            # Kedalaman ring = jumlah ring lain yang memuatnya; ganjil = lubang
+            depth = sum(Polygon._ring_contains(other, ring[0])
+                        for j, other in enumerate(self.rings) if j != i)
+            area += -ring_area if depth % 2 else ring_area
+        return area
+
+    @staticmethod
+    def _ring_contains(ring, point):
+        x0, y0 = ring[:, 0], ring[:, 1]
+        x1, y1 = np.roll(x0, -1), np.roll(y0, -1)
+        px, py = point
+        cross = (y0 > py) != (y1 > py)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            xint = x0 + (py - y0) * (x1 - x0) / (y1 - y0)
+        return bool(np.count_nonzero(cross & (px < xint)) % 2)
+
+    def fingerprint(self):
+        """Hash SHA-256 (hex) dari vertex semua ring, untuk kunci cache."""
+        h = hashlib.sha256()
+        for ring in self.rings:
+            h.update(np.int64(len(ring)).tobytes())
+            h.update(np.ascontiguousarray(ring, dtype='<f8').tobytes())
+        return h.hexdigest()
+
+    # -----------------------
+    # Query
+    # -----------------------
+    @property
+    def bounds(self):
+        """(xmin, xmax, ymin, ymax) dari semua vertex."""
+        return self.xmin, self.xmax, self.ymin, self.ymax
+
+    def contains(self, points):
+        """
+        Mask boolean titik yang berada di dalam poligon.
+        points: array (M, 2) atau (M, 3); hanya kolom X dan Y yang dipakai.
+        """
+        points = np.asarray(points, dtype=float)
+        inside = np.zeros(len(points), dtype=bool)
+        idx = np.flatnonzero((points[:, 0] >= self.xmin) & (points[:, 0] <= self.xmax)
+                             & (points[:, 1] >= self.ymin) & (points[:, 1] <= self.ymax))
+        if len(idx) == 0:
+            return inside
+
+        # Mask raster; hanya titik di sel yang dilalui tepi yang diuji tepat
+        cell = self._cell_row(points[idx, 1]) * self.nx + self._cell_col(points[idx, 0])
+        state = self.raster[cell]
+        inside[idx] = state == _INSIDE
+        boundary = state == _BOUNDARY
+        idx, cell = idx[boundary], cell[boundary]
+
+        # Potong per batch agar jumlah pasangan (titik, edge) terbatas
+        count = self.cell_count[cell]
+        cum = np.cumsum(count)
+        s = 0
+        while s < len(idx):
+            e = max(int(np.searchsorted(cum, cum[s] - count[s] + _PAIR_BATCH, side="right")), s + 1)
+            inside[idx[s:e]] = self._inside_exact(points[idx[s:e]], cell[s:e])
+            s = e
+        return inside
+
+    def _inside_exact(self, pts, cell):
+        """
+        Status titik di sel yang dilalui tepi: status pusat sel, dibalik untuk
+        setiap edge yang memotong jalur titik -> (cx, py) -> pusat sel. Jalur ini
+        berada di dalam sel, jadi cukup edge di daftar sel itu yang diuji.
+        """
+        count = self.cell_count[cell]
+        owner, k = _expand(np.zeros(len(pts), dtype=np.int64), count)
+        edge = self.cell_edges[self.cell_start[cell][owner] + k]
+
+        px, py = pts[owner, 0], pts[owner, 1]
+        cx = self.xmin + (cell % self.nx + 0.5)[owner] * self.cell_w
+        cy = self.ymin + (cell // self.nx + 0.5)[owner] * self.cell_h
+        x0, y0, x1, y1 = self.x0[edge], self.y0[edge], self.x1[edge], self.y1[edge]
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            # Ruas horizontal px..cx pada y = py (aturan ray casting ke kanan)
+            hcross = (y0 > py) != (y1 > py)
+            xint = x0 + (py - y0) * (x1 - x0) / (y1 - y0)
+            hcross &= (xint > np.minimum(px, cx)) & (xint <= np.maximum(px, cx))
+            # Ruas vertikal py..cy pada x = cx
+            vcross = (x0 > cx) != (x1 > cx)
+            yint = y0 + (cx - x0) * (y1 - y0) / (x1 - x0)
+            vcross &= (yint > np.minimum(py, cy)) & (yint <= np.maximum(py, cy))
+
+        flips = np.bincount(owner[hcross ^ vcross], minlength=len(pts))
+        return self.center_inside[cell] ^ (flips % 2 == 1)
+
+
+def _expand(start, count):
+    """
+    Untuk setiap i, pasangan (i, start[i] + 0..count[i]-1) sebagai dua array
+    datar, tanpa loop Python.
+    """
+    owner = np.repeat(np.arange(len(count)), count)
+    k = np.arange(int(count.sum())) - np.repeat(np.cumsum(count) - count, count)
+    return owner, np.repeat(start, count) + k
@@ -0,0 +1,178 @@
+# quantized.py
+
+import numpy as np
+
+# Jangkauan kode int32 yang dipakai (nilai = offset + kode * scale)
+_INT32 = np.iinfo(np.int32)
+
+
+class QuantizedPoints:
+    """
+    Titik (N, 3) fixed-point: kode int32 + scale dan offset per sumbu,
+    koordinat = offset + kode * scale. Memakai 12 byte per titik (float64: 24).
+
+    Bertingkah seperti array numpy read-only shape (N, 3) bertipe float
+    (seperti GridPoints): indeks, slicing dan np.asarray() menghasilkan
+    koordinat float64 hanya untuk baris yang diminta. Kode mentah ada di
+    data; writer yang mendukung integer (LAS, Parquet/Arrow) menulisnya
+    langsung tanpa konversi.
+    """
+
+    ndim = 2
+    dtype = np.dtype(float)
+
+    def __init__(self, data, scale, offset):
+        """
+        - data: array int32 (N, 3) berisi kode
+        - scale: resolusi per sumbu (skalar atau 3 nilai), > 0
+        - offset: koordinat untuk kode 0 (skalar atau 3 nilai)
+        """
+        data = np.asarray(data)
+        if data.ndim != 2 or data.shape[1] != 3 or data.dtype != np.int32:
+            raise ValueError("data harus array int32 shape (N, 3)")
+        self.data = data
+        self.scale = np.broadcast_to(np.asarray(scale, dtype=float), (3,)).copy()
+        self.offset = np.broadcast_to(np.asarray(offset, dtype=float), (3,)).copy()
+        if not np.all(self.scale > 0):
+            raise ValueError("scale harus > 0")
+
+    @classmethod
+    def from_points(cls, points, scale, offset):
+        """Mengkuantisasi array float (N, 3); galat maksimal scale / 2 per sumbu."""
+        scale = np.broadcast_to(np.asarray(scale, dtype=float), (3,))
+        offset = np.broadcast_to(np.asarray(offset, dtype=float), (3,))
+        return cls(quantize(points, scale, offset), scale, offset)
+
+    @staticmethod
+    def concatenate(parts, scale, offset):
+        """Menggabungkan beberapa QuantizedPoints dengan scale/offset yang sama."""
+        datas = []
+        for p in parts:
+            if not (np.array_equal(p.scale, scale) and np.array_equal(p.offset, offset)):
+                raise ValueError("scale/offset QuantizedPoints berbeda")
+            datas.append(p.data)
+        data = np.concatenate(datas) if datas else np.empty((0, 3), dtype=np.int32)
+        return QuantizedPoints(data, scale, offset)
+
+    # -----------------------
+    # Protokol array
+    # -----------------------
+    @property
+    def shape(self):
+        return self.data.shape
+
+    @property
+    def size(self):
+        return self.data.size
+
+    @property
+    def nbytes(self):
+        """Memori yang benar-benar dipakai (kode int32)."""
+        return self.data.nbytes
+
+    def __len__(self):
+        return len(self.data)
+
+    def __repr__(self):
+        return (f"QuantizedPoints(n={len(self):,}, scale={self.scale.tolist()}, "
+                f"offset={self.offset.tolist()})")
+
+    def __array__(self, dtype=None, copy=None):
+        if copy is False:
+            raise ValueError("QuantizedPoints tidak bisa dijadikan array float tanpa menyalin")
+        out = self.block(0, len(self))
+        return out if dtype is None else out.astype(dtype, copy=False)
+
+    def __iter__(self):
+        for chunk in self.iter_chunks():
+            yield from np.asarray(chunk)
+
+    def __getitem__(self, key):
+        cols = slice(None)
+        if isinstance(key, tuple):
+            if len(key) != 2:
+                raise IndexError("QuantizedPoints hanya punya 2 dimensi")
+            key, cols = key
+        rows = self.data[key]
+        if rows.ndim == 1:
+            return (self.offset + rows * self.scale)[cols]
+        return self._dequantize(rows)[:, cols]
+
+    # -----------------------
+    # Blok
+    # -----------------------
+    def _dequantize(self, codes, out=None):
+        if out is None:
+            out = np.empty(codes.shape, dtype=float)
+        np.multiply(codes, self.scale, out=out)
+        out += self.offset
+        return out
+
+    def block(self, start, stop, out=None):
+        """Koordinat float64 titik ke-start sampai ke-(stop-1) sebagai array (m, 3)."""
+        return self._dequantize(self.data[start:stop], out)
+
+    def take(self, idx, out=None):
+        """Koordinat float64 untuk array indeks."""
+        return self._dequantize(self.data[np.asarray(idx, dtype=np.int64)], out)
+
+    def view(self, start, stop):
+        """QuantizedPoints untuk baris start..stop-1 (berbagi data, tanpa salinan)."""
+        return QuantizedPoints(self.data[start:stop], self.scale, self.offset)
+
+    def iter_chunks(self, chunk_size=100_000):
+        """
+        Menghasilkan QuantizedPoints per chunk (view, tanpa salinan), sehingga
+        writer yang mendukung integer tetap menerima kode mentah.
+        """
+        chunk_size = int(chunk_size)
+        if chunk_size <= 0:
+            raise ValueError("chunk_size harus > 0")
+        for start in range(0, len(self), chunk_size):
+            yield self.view(start, start + chunk_size)
+
+    def bounds(self):
+        """(min, max) koordinat tiap sumbu, dihitung dari kode int32."""
+        if len(self) == 0:
+            raise ValueError("QuantizedPoints kosong")
+        lo = self.offset + self.data.min(axis=0) * self.scale
+        hi = self.offset + self.data.max(axis=0) * self.scale
+        return lo, hi
+
+    @property
+    def decimals(self):
+        """Jumlah digit desimal yang cukup untuk menulis koordinat (misalnya CSV)."""
+        return max(_decimals(v) for v in np.concatenate((self.scale, self.offset)))
+
+
+def _decimals(value, limit=15):
+    """Digit desimal terkecil yang menuliskan value tanpa galat berarti."""
+    value = float(value)
+    for d in range(limit):
+        if abs(round(value, d) - value) <= 1e-9 * max(1.0, abs(value)):
+            return d
+    return limit
+
+
+def quantize(points, scale, offset, out=None):
+    """
+    Kode int32 (N, 3) = round((points - offset) / scale).
+    ValueError jika ada koordinat di luar jangkauan int32 atau NaN.
+    """
+    points = np.asarray(points, dtype=float)
+    codes = np.rint((points - offset) / scale)
+    if codes.size and not (np.isfinite(codes).all()
+                           and codes.min() >= _INT32.min and codes.max() <= _INT32.max):
+        raise ValueError("Koordinat di luar jangkauan int32; perbesar resolution")
+    if out is None:
+        return codes.astype(np.int32)
+    out[...] = codes
+    return out
+
+
+def check_range(lo, hi, scale, offset):
+    """ValueError jika kotak lo..hi tidak muat di kode int32 dengan scale/offset ini."""
+    lo = (np.asarray(lo, dtype=float) - offset) / scale
+    hi = (np.asarray(hi, dtype=float) - offset) / scale
+    if np.minimum(lo, hi).min() < _INT32.min or np.maximum(lo, hi).max() > _INT32.max:
+        raise ValueError("Batas koordinat tidak muat di int32 dengan resolution ini; perbesar resolution")
@@ -0,0 +1,271 @@
+# quasirandom.py
+"""
+Barisan low-discrepancy (quasi-random) Sobol dan Halton di kubus [0, 1)^dim,
+dipakai mode 'sobol' dan 'halton' PointGenerator.
+
+Titik ke-i hanya bergantung pada i (dan parameter scramble), jadi blok
+start..stop bisa dibuat langsung tanpa membuat titik sebelumnya (skip-ahead):
+chunk, shard dan worker paralel menghasilkan titik yang sama persis dengan
+generate() sekaligus.
+
+Contoh:
+    seq = Sobol(3, scramble=True, rng=np.random.default_rng(7))
+    a = seq.block(0, 1024)             # 1024 titik pertama (1024, 3)
+    b = seq.block(10**9, 10**9 + 10)   # langsung mulai dari indeks 1e9
+    centered_discrepancy(a)            # makin kecil makin merata
+"""
+
+import numpy as np
+
+# Bit per koordinat Sobol; indeks maksimal 2**32 - 1
+_SOBOL_BITS = 32
+
+# Bilangan arah Joe & Kuo (new-joe-kuo-6.21201) untuk dimensi 2..8:
+# (s, a, m_1..m_s). Dimensi 1 adalah van der Corput basis 2.
+_JOE_KUO = (
+    (1, 0, (1,)),
+    (2, 1, (1, 3)),
+    (3, 1, (1, 3, 1)),
+    (3, 2, (1, 1, 1)),
+    (4, 1, (1, 1, 3, 3)),
+    (4, 4, (1, 3, 5, 13)),
+    (5, 2, (1, 1, 5, 5, 17)),
+)
+
+# Basis Halton per dimensi
+_PRIMES = (2, 3, 5, 7, 11, 13, 17, 19)
+
+# Digit Halton: basis**digit <= 2**_HALTON_PRECISION (integer tepat di float64)
+_HALTON_PRECISION = 52
+# Ukuran maksimal tabel kelompok digit Halton (basis**k nilai per kelompok)
+_HALTON_GROUP = 1024
+
+
+def _direction_numbers(dim):
+    """Bilangan arah Sobol (dim, _SOBOL_BITS) sebagai uint64, bit 31 = digit biner pertama."""
+    bits = _SOBOL_BITS
+    v = np.zeros((dim, bits), dtype=np.uint64)
+    v[0] = [1 << (bits - 1 - k) for k in range(bits)]
+    for d in range(1, dim):
+        s, a, m_init = _JOE_KUO[d - 1]
+        m = list(m_init)
+        for k in range(s, bits):
+            value = m[k - s] ^ (m[k - s] << s)
+            for j in range(1, s):
+                if (a >> (s - 1 - j)) & 1:
+                    value ^= m[k - j] << j
+            m.append(value)
+        v[d] = [m[k] << (bits - 1 - k) for k in range(bits)]
+    return v
+
+
+def _trailing_zeros(idx):
+    """Jumlah bit 0 di ujung kanan setiap indeks (uint64 > 0)."""
+    low = idx & (~idx + np.uint64(1))
+    # low adalah pangkat 2: eksponen frexp tepat untuk semua nilai uint64
+    return np.frexp(low.astype(float))[1] - 1
+
+
+class Sobol:
+    """
+    Barisan Sobol berurutan kode Gray, maksimal 2**32 titik, dim <= 8.
+
+    Dengan scramble, bilangan arah diacak dengan matriks segitiga bawah
+    biner acak (linear matrix scrambling) lalu digeser XOR acak per dimensi
+    (digital shift). Sifat net tetap terjaga: 2**m titik pertama tetap
+    terbagi rata ke setiap sel elementer, tapi tidak lagi ada titik di 0
+    dan pola grid yang kaku hilang. Keseimbangan terbaik pada N = 2**m.
+
+    Parameters:
+    - dim: jumlah dimensi (1..8)
+    - scramble: acak bilangan arah + digital shift
+    - rng: numpy.random.Generator untuk scramble (wajib jika scramble)
+    """
+
+    max_points = 1 << _SOBOL_BITS
+
+    def __init__(self, dim=3, scramble=False, rng=None):
+        if not 1 <= dim <= len(_JOE_KUO) + 1:
+            raise ValueError(f"Sobol mendukung dim 1..{len(_JOE_KUO) + 1}")
+        self.dim = dim
+        self.scramble = scramble
+        self.v = _direction_numbers(dim)
+        self.shift = np.zeros(dim, dtype=np.uint64)
+        if scramble:
+            if rng is None:
+                raise ValueError("scramble membutuhkan rng")
+            self._scramble(rng)
+
+    def _scramble(self, rng):
+        bits = _SOBOL_BITS
+        weights = np.uint64(1) << np.arange(bits - 1, -1, -1, dtype=np.uint64)
+        for d in range(self.dim):
+            # Baris r = digit ke-r (dari yang paling signifikan); diagonal 1
+            lower = np.tril(rng.integers(0, 2, size=(bits, bits)), -1) + np.eye(bits, dtype=int)
+            digits = ((self.v[d][:, None] >> (bits - 1 - np.arange(bits, dtype=np.uint64))) & 1).astype(int)
+            scrambled = (digits @ lower.T) % 2
+            self.v[d] = (scrambled.astype(np.uint64) * weights).sum(axis=1)
+        self.shift = rng.integers(0, 1 << bits, size=self.dim, dtype=np.uint64)
+
+    def _first(self, start):
+        """Kode integer titik ke-start (dim,): XOR bilangan arah pada bit kode Gray."""
+        gray = start ^ (start >> 1)
+        x = self.shift.copy()
+        for k in range(_SOBOL_BITS):
+            if (gray >> k) & 1:
+                x ^= self.v[:, k]
+        return x
+
+    def block(self, start, stop, out=None):
+        """Titik ke-start sampai ke-(stop-1) sebagai array float64 (m, dim) di [0, 1)."""
+        start, stop = int(start), int(stop)
+        if not 0 <= start <= stop <= self.max_points:
+            raise ValueError(f"Indeks Sobol harus di rentang 0..{self.max_points}")
+        m = stop - start
+        if out is None:
+            out = np.empty((m, self.dim), dtype=float)
+        if m == 0:
+            return out
+        # Titik berurutan kode Gray berbeda satu bit: x[i] = x[i-1] ^ v[ctz(i)]
+        idx = np.arange(start + 1, stop, dtype=np.uint64)
+        ctz = _trailing_zeros(idx)
+        first = self._first(start)
+        codes = np.empty(m, dtype=np.uint64)
+        for d in range(self.dim):
+            codes[0] = first[d]
+            codes[1:] = self.v[d][ctz]
+            np.bitwise_xor.accumulate(codes, out=codes)
+            np.multiply(codes, 2.0 ** -_SOBOL_BITS, out=out[:, d])
+        return out
+
+
+class Halton:
+    """
+    Barisan Halton (basis prima 2, 3, 5, ... per dimensi), indeks tanpa batas
+    praktis, dim <= 8.
+
+    Dengan scramble, setiap posisi digit memakai permutasi acak digit
+    sendiri (random digit permutation), yang menghilangkan korelasi antar
+    dimensi basis besar dan titik di 0.
+
+    Parameters:
+    - dim: jumlah dimensi (1..8)
+    - scramble: permutasi digit acak
+    - rng: numpy.random.Generator untuk scramble (wajib jika scramble)
+    """
+
+    max_points = 1 << 62
+
+    def __init__(self, dim=3, scramble=False, rng=None):
+        if not 1 <= dim <= len(_PRIMES):
+            raise ValueError(f"Halton mendukung dim 1..{len(_PRIMES)}")
+        self.dim = dim
+        self.scramble = scramble
+        self.bases = _PRIMES[:dim]
+        if scramble and rng is None:
+            raise ValueError("scramble membutuhkan rng")
+        # Radical inverse dihitung sebagai integer (tepat, urutan penjumlahan
+        # tidak berpengaruh) lalu dibagi basis**ndigits sekali. Digit diproses
+        # per kelompok k digit (basis b**k <= _HALTON_GROUP) lewat tabel:
+        # tables[d][J][D] = kontribusi kelompok digit ke-J bernilai D.
+        # tails[d][n] = kontribusi kelompok ke-n ke atas saat semua digitnya 0
+        # (tidak 0 jika scramble, karena digit 0 ikut dipermutasi).
+        self.groups = []
+        self.tables = []
+        self.tails = []
+        for b in self.bases:
+            ndigits = 1
+            while b ** (ndigits + 1) <= 1 << _HALTON_PRECISION:
+                ndigits += 1
+            k = 1
+            while b ** (k + 1) <= _HALTON_GROUP:
+                k += 1
+            ngroups = -(-ndigits // k)
+            weights = np.zeros(ngroups * k, dtype=np.int64)
+            weights[:ndigits] = [b ** (ndigits - 1 - j) for j in range(ndigits)]
+            if scramble:
+                perms = np.array([rng.permutation(b) for _ in range(ngroups * k)])
+            else:
+                perms = np.tile(np.arange(b), (ngroups * k, 1))
+            digit_values = perms * weights[:, None]
+
+            values = np.arange(b ** k)
+            table = np.zeros((ngroups, b ** k), dtype=np.int64)
+            for t in range(k):
+                digit = values // b ** t % b
+                table += digit_values[t::k][:, digit]
+            self.groups.append((b ** k, ngroups, float(b ** ndigits)))
+            self.tables.append(table)
+            self.tails.append(np.concatenate((np.cumsum(table[::-1, 0])[::-1], [0])))
+
+    def block(self, start, stop, out=None):
+        """Titik ke-start sampai ke-(stop-1) sebagai array float64 (m, dim) di [0, 1)."""
+        start, stop = int(start), int(stop)
+        if not 0 <= start <= stop <= self.max_points:
+            raise ValueError(f"Indeks Halton harus di rentang 0..{self.max_points}")
+        m = stop - start
+        if out is None:
+            out = np.empty((m, self.dim), dtype=float)
+        if m == 0:
+            return out
+        idx = np.arange(start, stop, dtype=np.int64)
+        rest = np.empty_like(idx)
+        digit = np.empty_like(idx)
+        acc = np.empty_like(idx)
+        for d in range(self.dim):
+            base, ngroups, scale = self.groups[d]
+            table = self.tables[d]
+            # Kelompok digit yang dipakai indeks terbesar; di atasnya semua digit 0
+            used = 1
+            while used < ngroups and base ** used < stop:
+                used += 1
+            acc.fill(self.tails[d][used])
+            rest[:] = idx
+            for j in range(used):
+                np.divmod(rest, base, out=(rest, digit))
+                acc += table[j][digit]
+            # acc < basis**ndigits <= 2**52: konversi float tepat, hasil < 1
+            np.divide(acc, scale, out=out[:, d])
+        return out
+
+
+# Barisan per nama mode PointGenerator
+SEQUENCES = {
+    'sobol': Sobol,
+    'halton': Halton,
+}
+
+
+def centered_discrepancy(points, block_size=1 << 20):
+    """
+    Centered L2 discrepancy kuadrat (Hickernell) titik di [0, 1]^d: ukuran
+    ketidakrataan sebaran, makin kecil makin merata. Biaya O(N^2 d), dihitung
+    per blok baris (sekitar block_size elemen per array sementara); pakai
+    untuk N sampai ~1e4.
+    """
+    x = np.asarray(points, dtype=float)
+    n, dim = x.shape
+    if n == 0:
+        raise ValueError("points kosong")
+    c = np.abs(x - 0.5)
+    term1 = (13.0 / 12.0) ** dim
+    term2 = np.prod(1 + 0.5 * c - 0.5 * c ** 2, axis=1).sum() * 2.0 / n
+
+    rows = max(1, block_size // n)
+    term3 = 0.0
+    prod = np.empty((rows, n))
+    tmp = np.empty((rows, n))
+    for start in range(0, n, rows):
+        stop = min(start + rows, n)
+        p, t = prod[:stop - start], tmp[:stop - start]
+        p.fill(1.0)
+        for k in range(dim):
+            # 1 + |xi - 0.5| / 2 + |xj - 0.5| / 2 - |xi - xj| / 2
+            np.subtract.outer(x[start:stop, k], x[:, k], out=t)
+            np.abs(t, out=t)
+            np.subtract(np.add.outer(c[start:stop, k], c[:, k]), t, out=t)
+            t *= 0.5
+            t += 1.0
+            p *= t
+        term3 += p.sum()
+    return term1 - term2 + term3 / n ** 2
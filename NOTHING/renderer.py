@@ -0,0 +1,157 @@
+# renderer.py
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from mpl_toolkits.mplot3d import Axes3D  # memastikan mode 3D aktif
+
+import instrument
+from gridpoints import GridPoints
+from quantized import QuantizedPoints
+from visualizer import PointVisualizer
+
+
+class HeadlessRenderer:
+    """
+    Merender plot titik ke file gambar (PNG/PDF/...) tanpa layar (backend Agg).
+
+    Satu Figure/Axes dipakai ulang untuk setiap render(); hanya data scatter
+    yang diganti (_offsets3d untuk 3D, set_offsets untuk 2D), sehingga tidak
+    ada biaya membuat figure baru per gambar. Titik di-decimate dengan
+    PointVisualizer.decimate() sebelum digambar.
+    """
+
+    def __init__(self, dims=3, figsize=(6, 5), dpi=100, max_points=20_000,
+                 label_threshold=200, lod_method='voxel'):
+        if dims not in (2, 3):
+            raise ValueError("dims harus 2 atau 3")
+        self.dims = dims
+        self.max_points = max_points
+        self.label_threshold = label_threshold
+        self.lod_method = lod_method
+
+        # Figure tanpa pyplot: tidak butuh display maupun event loop GUI
+        self.fig = Figure(figsize=figsize, dpi=dpi)
+        FigureCanvasAgg(self.fig)
+        if dims == 3:
+            self.ax = self.fig.add_subplot(111, projection='3d')
+            self.scatter = self.ax.scatter([], [], [], c='royalblue', s=30, depthshade=True)
+            self.ax.set_zlabel("Z")
+        else:
+            self.ax = self.fig.add_subplot(111)
+            self.scatter = self.ax.scatter([], [], c='royalblue', s=40)
+            self.ax.grid(True)
+            self.ax.set_aspect('equal', adjustable='datalim')
+        self.ax.set_xlabel("X")
+        self.ax.set_ylabel("Y")
+        self._texts = []
+
+    @instrument.traced("render")
+    def render(self, points, filename, labels=None, title=None, label_indices=None):
+        """
+        Menggambar points (array N x 3, atau N x 2 untuk dims=2) ke filename.
+        Format file mengikuti ekstensi (png, pdf, svg, ...).
+        GridPoints / QuantizedPoints tidak diubah menjadi array; hanya titik
+        tampil yang dihitung.
+        """
+        if not isinstance(points, (GridPoints, QuantizedPoints)):
+            points = np.asarray(points)
+        if points.ndim != 2 or points.shape[1] < self.dims:
+            raise ValueError(f"points harus array shape (N,{self.dims})")
+
+        # PointVisualizer membutuhkan (N,3); untuk 2D kolom Z diisi nol
+        if points.shape[1] == 2:
+            points = np.column_stack((points, np.zeros(len(points))))
+        vis = PointVisualizer(points, labels=labels, max_points=self.max_points,
+                              label_threshold=self.label_threshold, lod_method=self.lod_method)
+        idx = vis.decimate()
+        shown = np.asarray(vis.points[idx], dtype=float)
+
+        self._set_data(shown)
+        self.scatter.set_sizes([30 if len(idx) <= 1000 else 4])
+
+        # Label: ganti artist teks lama
+        for text in self._texts:
+            text.remove()
+        self._texts = []
+        if label_indices is None:
+            label_indices = idx if len(idx) <= self.label_threshold else []
+        for i in np.asarray(label_indices, dtype=np.int64):
+            p = vis.points[i]
+            lbl = vis.labels[int(i)]
+            if self.dims == 3:
+                self._texts.append(self.ax.text(p[0], p[1], p[2], lbl, fontsize=8, color='darkred'))
+            else:
+                self._texts.append(self.ax.text(p[0], p[1], f" {lbl}", fontsize=9,
+                                                va="bottom", ha="left"))
+
+        if title is None:
+            title = "Scatter Plot 3D - Koordinat Titik" if self.dims == 3 else "Plot Titik Koordinat 2D"
+        self.ax.set_title(title)
+        self.fig.savefig(filename, bbox_inches="tight")
+        return filename
+
+    def _set_data(self, shown):
+        """Mengganti data scatter yang sudah ada dan menyesuaikan batas sumbu."""
+        if len(shown) == 0:
+            lo = np.zeros(3)
+            hi = np.ones(3)
+        else:
+            lo = shown.min(axis=0)
+            hi = shown.max(axis=0)
+        # Beri margin 5% (dan rentang minimal untuk sumbu yang datar)
+        pad = np.where(hi > lo, (hi - lo) * 0.05, 0.5)
+        lo, hi = lo - pad, hi + pad
+
+        if self.dims == 3:
+            self.scatter._offsets3d = (shown[:, 0], shown[:, 1], shown[:, 2])
+            self.ax.set_xlim(lo[0], hi[0])
+            self.ax.set_ylim(lo[1], hi[1])
+            self.ax.set_zlim(lo[2], hi[2])
+        else:
+            # Aspek 'equal' mengatur batas sendiri; cukup perbarui data limits
+            self.scatter.set_offsets(shown[:, :2])
+            self.ax.ignore_existing_data_limits = True
+            self.ax.update_datalim(np.vstack((lo[:2], hi[:2])))
+            self.ax.autoscale_view()
+
+
+# Renderer per proses pekerja (dibuat sekali oleh initializer)
+_worker_renderer = None
+
+
+def _init_worker(renderer_kwargs):
+    global _worker_renderer
+    _worker_renderer = HeadlessRenderer(**renderer_kwargs)
+
+
+def _render_job(job):
+    """Merender satu job dict di proses pekerja."""
+    points = job["points"]
+    if isinstance(points, str):
+        # Path .npy dibuka sebagai memmap agar tidak perlu dikirim antar proses
+        points = np.load(points, mmap_mode='r')
+    return _worker_renderer.render(points, job["filename"], labels=job.get("labels"),
+                                   title=job.get("title"))
+
+
+def render_many(jobs, processes=None, chunksize=16, **renderer_kwargs):
+    """
+    Merender banyak plot sekaligus dengan process pool.
+
+    jobs: iterable dict berisi
+      - points: array (N,3) atau path file .npy
+      - filename: file gambar tujuan
+      - labels, title: opsional
+    Setiap proses pekerja memakai satu HeadlessRenderer untuk semua job-nya.
+    Mengembalikan list nama file yang ditulis, sesuai urutan jobs.
+    """
+    if processes == 1:
+        _init_worker(renderer_kwargs)
+        return [_render_job(job) for job in jobs]
+
+    with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker,
+                             initargs=(renderer_kwargs,)) as pool:
+        return list(pool.map(_render_job, jobs, chunksize=chunksize))
@@ -0,0 +1,311 @@
+# shard.py
+"""
+Generate titik per shard (bagian) secara paralel, satu file per shard, plus
+manifest untuk membaca kembali seluruh dataset tanpa menggabungkan file.
+
+Contoh (dari folder NOTHING):
+    gen = PointGenerator(0, 1e4, 0, 1e4, 0, 100, num_points=10**9, seed=7)
+    run_shards(gen, 64, "survei_shards")                 # semua shard, lokal
+    run_shards(gen, 64, "survei_shards", shard_ids=range(0, 32))   # node A
+    run_shards(gen, 64, "survei_shards", shard_ids=range(32, 64))  # node B
+    ds = ShardedDataset("survei_shards")
+    FileManager(None).save("gabungan.las", chunks=ds.iter_chunks())
+
+Setiap shard hanya bergantung pada parameter generator, seed, shard_id dan
+num_shards (PointGenerator.shard_range), jadi shard bisa dibuat di node
+mana pun dan dibuat ulang sendiri. Setiap shard yang selesai menulis file
+entri shard-XXXXX.json; manifest.json ditulis begitu semua entri lengkap.
+"""
+
+import copy
+import glob
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from filemanager import FileManager
+from labels import PointLabels
+from quantized import QuantizedPoints
+
+MANIFEST = "manifest.json"
+
+# Ukuran blok baca saat menghitung checksum file
+_HASH_BLOCK = 1 << 24
+
+
+def run_shards(gen, num_shards, directory, fmt='npy', shard_ids=None, processes=None,
+               chunk_size=1_000_000, **save_kwargs):
+    """
+    Menjalankan shard di process pool dan menulis satu file per shard.
+
+    Parameters:
+    - gen: PointGenerator (mode 'grid' atau 'random' dengan seed)
+    - num_shards: jumlah shard total
+    - directory: folder keluaran (file shard, entri dan manifest)
+    - fmt: format file shard (lihat filemanager.WRITERS), default 'npy'
+    - shard_ids: shard yang dijalankan di sini (default semua); shard lain
+      boleh dijalankan di node lain dengan folder bersama
+    - processes: jumlah proses (default jumlah CPU)
+    - save_kwargs: diteruskan ke writer FileManager (precision, transform, ...)
+
+    Mengembalikan path manifest jika semua shard sudah lengkap, selain itu None.
+    """
+    spec = _spec(gen)
+    os.makedirs(directory, exist_ok=True)
+    ids = range(num_shards) if shard_ids is None else shard_ids
+    tasks = [(spec, int(i), num_shards, directory, fmt, chunk_size, save_kwargs) for i in ids]
+
+    if processes == 1 or len(tasks) <= 1:
+        for task in tasks:
+            _run_shard(task)
+    else:
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            list(pool.map(_run_shard, tasks))
+    return write_manifest(directory)
+
+
+def write_manifest(directory):
+    """
+    Menggabungkan entri shard-*.json menjadi manifest.json jika semua shard
+    dari run yang sama sudah ada. Mengembalikan path manifest atau None.
+    """
+    entries = []
+    for path in sorted(glob.glob(os.path.join(directory, "shard-*.json"))):
+        with open(path, encoding="utf-8") as f:
+            entries.append(json.load(f))
+    if not entries:
+        return None
+
+    first = entries[0]
+    for e in entries:
+        if (e["key"], e["num_shards"]) != (first["key"], first["num_shards"]):
+            raise ValueError(f"Folder {directory} berisi shard dari run yang berbeda")
+    if len(entries) < first["num_shards"]:
+        return None
+
+    entries.sort(key=lambda e: e["id"])
+    nonempty = [e["bounds"] for e in entries if e["count"]]
+    bounds = None
+    if nonempty:
+        b = np.array(nonempty)
+        bounds = [float(v) for pair in zip(b[:, 0::2].min(axis=0), b[:, 1::2].max(axis=0)) for v in pair]
+
+    manifest = {
+        "version": 1,
+        "key": first["key"],
+        "params": first["params"],
+        "num_shards": first["num_shards"],
+        "format": first["format"],
+        "total": sum(e["count"] for e in entries),
+        "bounds": bounds,
+        "shards": [{k: v for k, v in e.items() if k not in ("key", "params", "num_shards")}
+                   for e in entries],
+    }
+    path = os.path.join(directory, MANIFEST)
+    _write_json(path, manifest)
+    return path
+
+
+def file_sha256(path):
+    """Checksum SHA-256 (hex) isi file, dibaca per blok."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(_HASH_BLOCK), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _spec(gen):
+    """Salinan generator yang aman dikirim ke proses lain (tanpa hasil dan cache)."""
+    if gen.rng is not None:
+        raise ValueError("Sharding membutuhkan seed, bukan rng")
+    spec = copy.copy(gen)
+    spec.points = None
+    spec.labels = None
+    spec.cache = None
+    return spec
+
+
+def _params(gen):
+    """Parameter generator yang dicatat di manifest (untuk membuat ulang shard)."""
+    ss = gen.seed_sequence
+    return {
+        "mode": gen.mode,
+        "bounds": [gen.xmin, gen.xmax, gen.ymin, gen.ymax, gen.zmin, gen.zmax],
+        "num_points": gen.num_points,
+        "spacing": gen.spacing,
+        "dtype": gen.dtype,
+        "scramble": gen.scramble,
+        "seed": {"entropy": str(ss.entropy), "spawn_key": list(ss.spawn_key)},
+        "polygon": None if gen.polygon is None else gen.polygon.fingerprint(),
+        "dem": None if gen.dem is None else gen.dem.fingerprint(),
+    }
+
+
+def _run_shard(task):
+    """Dijalankan di proses pekerja: generate satu shard, tulis file dan entrinya."""
+    gen, shard_id, num_shards, directory, fmt, chunk_size, save_kwargs = task
+    start, stop = gen.shard_range(shard_id, num_shards)
+    filename = f"shard-{shard_id:05d}.{fmt}"
+    path = os.path.join(directory, filename)
+
+    lo = np.full(3, np.inf)
+    hi = np.full(3, -np.inf)
+
+    def tracked():
+        nonlocal lo, hi
+        for chunk in gen.iter_shard_chunks(shard_id, num_shards, chunk_size):
+            if isinstance(chunk, QuantizedPoints):
+                clo, chi = chunk.bounds()
+            else:
+                clo, chi = chunk.min(axis=0), chunk.max(axis=0)
+            lo = np.minimum(lo, clo)
+            hi = np.maximum(hi, chi)
+            yield chunk
+
+    # Label global: titik pertama shard adalah P(start + 1)
+    fm = FileManager(None, PointLabels(stop - start, start=start + 1))
+    count = fm.save(path, fmt=fmt, chunks=tracked(), **save_kwargs)
+    if "transform" in save_kwargs and save_kwargs["transform"] is not None:
+        lo = hi = None      # batas koordinat asli, bukan koordinat file
+
+    entry = {
+        "id": shard_id,
+        "num_shards": num_shards,
+        "key": gen.cache_key(),
+        "params": _params(gen),
+        "file": filename,
+        "format": fmt,
+        "start": start,
+        "stop": stop,
+        "count": count,
+        "label_start": start + 1,
+        "bounds": None if not count or lo is None else [float(v) for pair in zip(lo, hi) for v in pair],
+        "sha256": file_sha256(path),
+    }
+    _write_json(os.path.join(directory, f"shard-{shard_id:05d}.json"), entry)
+    return entry
+
+
+def _write_json(path, data):
+    """Menulis JSON lewat file sementara + os.replace (pembaca tidak melihat file setengah jadi)."""
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp, path)
+
+
+class ShardedDataset:
+    """
+    Dataset hasil run_shards, dibaca lazy lewat manifest: file shard baru
+    dibuka saat dibutuhkan (npy/ply sebagai memmap), tidak pernah digabung.
+
+    - len(ds), ds.total, ds.bounds
+    - ds.shard(i): titik shard ke-i (array (m, 3))
+    - ds.iter_chunks(chunk_size): semua titik berurutan, per chunk; bisa
+      langsung diberikan ke FileManager.save(chunks=...)
+    - ds.labels / ds.shard_labels(i): PointLabels global / per shard
+    - ds.verify(): daftar shard yang checksum-nya tidak cocok
+    """
+
+    def __init__(self, path):
+        """path: folder run_shards atau path manifest.json."""
+        if os.path.isdir(path):
+            path = os.path.join(path, MANIFEST)
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Manifest tidak ditemukan: {path} (apakah semua shard sudah selesai?)")
+        with open(path, encoding="utf-8") as f:
+            self.manifest = json.load(f)
+        self.directory = os.path.dirname(os.path.abspath(path))
+        self.shards = self.manifest["shards"]
+        self.total = self.manifest["total"]
+
+    def __len__(self):
+        return self.total
+
+    @property
+    def shape(self):
+        return (self.total, 3)
+
+    @property
+    def bounds(self):
+        """[xmin, xmax, ymin, ymax, zmin, zmax] seluruh dataset (None jika kosong)."""
+        return self.manifest["bounds"]
+
+    @property
+    def labels(self):
+        """
+        PointLabels global P1 .. PN. Pada grid + polygon/dem label shard
+        mengikuti indeks grid penuh (tidak bersambung), pakai shard_labels().
+        """
+        expected = 1
+        for entry in self.shards:
+            if entry["count"] and entry["label_start"] != expected:
+                raise ValueError("Label shard tidak bersambung; gunakan shard_labels(i)")
+            expected += entry["count"]
+        return PointLabels(self.total)
+
+    def shard_labels(self, i):
+        """PointLabels yang tertulis di file shard ke-i."""
+        entry = self.shards[i]
+        return PointLabels(entry["count"], start=entry["label_start"])
+
+    def _path(self, i):
+        return os.path.join(self.directory, self.shards[i]["file"])
+
+    def shard(self, i):
+        """Titik shard ke-i sebagai array (m, 3)."""
+        entry = self.shards[i]
+        path = self._path(i)
+        fmt = entry["format"]
+        if entry["count"] == 0:
+            return np.empty((0, 3))
+        if fmt == "npy":
+            return FileManager.load_npy(path)
+        if fmt == "ply":
+            return FileManager.load_ply(path)
+        if fmt == "las":
+            records, header = FileManager.load_las(path)
+            points = np.column_stack((records['X'], records['Y'], records['Z'])).astype(float)
+            return points * header['scale'] + header['offset']
+        if fmt == "csv":
+            return FileManager.load_csv(path)[0]
+        if fmt == "parquet":
+            return FileManager.load_parquet(path)[0]
+        if fmt in ("arrow", "feather"):
+            return FileManager.load_arrow(path)[0]
+        raise ValueError(f"Format shard tidak didukung: {fmt!r}")
+
+    def iter_chunks(self, chunk_size=1_000_000):
+        """Semua titik berurutan (shard 0, 1, ...) per chunk maksimal chunk_size baris."""
+        chunk_size = int(chunk_size)
+        if chunk_size <= 0:
+            raise ValueError("chunk_size harus > 0")
+        for i, entry in enumerate(self.shards):
+            if entry["count"] == 0:
+                continue
+            if entry["format"] == "csv":
+                for points, _ in FileManager.iter_csv(self._path(i)):
+                    yield points
+                continue
+            points = self.shard(i)
+            for start in range(0, len(points), chunk_size):
+                yield points[start:start + chunk_size]
+
+    def __array__(self, dtype=None, copy=None):
+        """Menggabungkan semua shard (memakai memori N x 3)."""
+        chunks = list(self.iter_chunks())
+        out = np.concatenate(chunks) if chunks else np.empty((0, 3))
+        return out if dtype is None else out.astype(dtype, copy=False)
+
+    def verify(self):
+        """Id shard yang file-nya hilang atau checksum-nya tidak cocok dengan manifest."""
+        bad = []
+        for i, entry in enumerate(self.shards):
+            path = self._path(i)
+            if not os.path.exists(path) or file_sha256(path) != entry["sha256"]:
+                bad.append(entry["id"])
+        return bad
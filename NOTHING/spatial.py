@@ -0,0 +1,314 @@
+# spatial.py
+"""
+Indeks spasial untuk titik hasil PointGenerator: k-nearest neighbour dan
+pencarian radius, dijawab untuk banyak titik query sekaligus (vektorisasi).
+
+- GridIndex: untuk mode 'grid'. Posisi titik grid diketahui secara analitik
+  (origin + i * delta), jadi indeks tetangga dihitung langsung tanpa struktur data.
+- KDTree: untuk titik sembarang (mode 'random'). Pohon seimbang yang disimpan
+  sebagai array; query berjalan level demi level untuk semua query sekaligus.
+
+build_index(gen) memilih indeks yang sesuai untuk sebuah PointGenerator.
+
+Konvensi hasil mengikuti scipy.spatial.cKDTree:
+- query(q, k) -> (dist, idx); untuk k=1 shape (Q,), selain itu (Q, k).
+  Jika titik kurang dari k, sisa dist = inf dan idx = N.
+- query_radius(q, r) -> list berisi array indeks (terurut) per query.
+"""
+
+import math
+
+import numpy as np
+
+# Jumlah query yang diproses per batch (membatasi memori sementara)
+_QUERY_BATCH = 2048
+
+
+def build_index(gen, leafsize=32):
+    """
+    Membuat indeks spasial untuk hasil PointGenerator.
+    Grid penuh (tidak dipotong num_points) -> GridIndex analitik;
+    selain itu KDTree atas gen.points (generate() dipanggil jika perlu).
+    """
+    if gen.mode == 'grid':
+        grid = gen.grid_points()
+        if grid.count == grid.full_size:
+            return GridIndex(grid)
+    points = gen.points if gen.points is not None else gen.generate()
+    return KDTree(points, leafsize=leafsize)
+
+
+def _as_queries(q):
+    q = np.asarray(q, dtype=float)
+    single = q.ndim == 1
+    q = np.atleast_2d(q)
+    if q.shape[1] != 3:
+        raise ValueError("Titik query harus shape (3,) atau (Q,3)")
+    return q, single
+
+
+def _finish_query(dist, idx, k, single):
+    """Menyesuaikan shape hasil query dengan konvensi cKDTree."""
+    if k == 1:
+        dist, idx = dist[:, 0], idx[:, 0]
+    if single:
+        dist, idx = dist[0], idx[0]
+    return dist, idx
+
+
+class GridIndex:
+    """
+    Indeks analitik untuk grid reguler hasil mode 'grid'.
+
+    Titik ke-i = (x[ix], y[iy], z[iz]) dengan i = (ix * ny + iy) * nz + iz,
+    sama seperti urutan GridPoints / PointGenerator._generate_grid().
+    """
+
+    def __init__(self, grid):
+        """grid: GridPoints, misalnya dari PointGenerator.grid_points()."""
+        self.origin = grid.origin.copy()
+        self.delta = grid.delta.copy()
+        self.shape = np.array(grid.axis_sizes, dtype=np.int64)
+        self.n = int(np.prod(self.shape))
+
+    def _flat(self, ix, iy, iz):
+        return (ix * self.shape[1] + iy) * self.shape[2] + iz
+
+    def _axis_nearest(self, q, axis, k):
+        """
+        k indeks terdekat pada satu sumbu untuk setiap query.
+        Mengembalikan (indeks (Q, k'), jarak^2 (Q, k')) dengan k' = min(k, n_axis).
+        """
+        n = self.shape[axis]
+        kk = min(k, n)
+        t = (q[:, axis] - self.origin[axis]) / self.delta[axis]
+        center = np.clip(np.rint(t), 0, n - 1).astype(np.int64)
+
+        # Jendela [center - kk, center + kk] pasti memuat kk indeks terdekat;
+        # indeks di luar grid diberi jarak tak hingga
+        window = center[:, None] + np.arange(-kk, kk + 1)
+        valid = (window >= 0) & (window < n)
+        window = np.clip(window, 0, n - 1)
+        d2 = ((self.origin[axis] + window * self.delta[axis]) - q[:, axis, None]) ** 2
+        d2 = np.where(valid, d2, np.inf)
+
+        pick = np.argpartition(d2, kk - 1, axis=1)[:, :kk]
+        rows = np.arange(len(q))[:, None]
+        return window[rows, pick], d2[rows, pick]
+
+    def query(self, q, k=1):
+        """k titik grid terdekat untuk setiap query (lihat docstring modul)."""
+        q, single = _as_queries(q)
+        k = int(k)
+        dist = np.full((len(q), k), np.inf)
+        idx = np.full((len(q), k), self.n, dtype=np.int64)
+        kk = min(k, self.n)
+
+        for s in range(0, len(q), _QUERY_BATCH):
+            qb = q[s:s + _QUERY_BATCH]
+            # Jarak terpisah per sumbu: k terdekat 3D pasti tersusun dari
+            # k terdekat di masing-masing sumbu
+            ix, dx = self._axis_nearest(qb, 0, k)
+            iy, dy = self._axis_nearest(qb, 1, k)
+            iz, dz = self._axis_nearest(qb, 2, k)
+            d2 = (dx[:, :, None, None] + dy[:, None, :, None] + dz[:, None, None, :]).reshape(len(qb), -1)
+            flat = self._flat(ix[:, :, None, None], iy[:, None, :, None], iz[:, None, None, :]).reshape(len(qb), -1)
+
+            pick = np.argpartition(d2, kk - 1, axis=1)[:, :kk]
+            rows = np.arange(len(qb))[:, None]
+            d2, flat = d2[rows, pick], flat[rows, pick]
+            order = np.argsort(d2, axis=1, kind='stable')
+            dist[s:s + len(qb), :kk] = np.sqrt(d2[rows, order])
+            idx[s:s + len(qb), :kk] = flat[rows, order]
+
+        return _finish_query(dist, idx, k, single)
+
+    def query_radius(self, q, r):
+        """Indeks semua titik grid dengan jarak <= r dari setiap query."""
+        q, single = _as_queries(q)
+        r = float(r)
+
+        # Rentang indeks per sumbu yang mungkin berada di dalam bola radius r
+        lo = np.ceil((q - r - self.origin) / self.delta - 1e-9).astype(np.int64)
+        hi = np.floor((q + r - self.origin) / self.delta + 1e-9).astype(np.int64)
+        lo = np.clip(lo, 0, self.shape - 1)
+        hi = np.clip(hi, -1, self.shape - 1)
+        span = int(max(np.max(hi - lo + 1, initial=0), 0))
+
+        results = []
+        if span == 0:
+            results = [np.arange(0)] * len(q)
+        else:
+            offsets = np.arange(span)
+            batch = max(1, _QUERY_BATCH * 64 // span ** 3)
+            for s in range(0, len(q), batch):
+                qb, lob, hib = q[s:s + batch], lo[s:s + batch], hi[s:s + batch]
+                ii = lob[:, None, :] + offsets[None, :, None]          # (B, span, 3)
+                ok = ii <= hib[:, None, :]
+                coord = self.origin + ii * self.delta
+                d = (coord - qb[:, None, :]) ** 2
+                d2 = (d[:, :, None, None, 0] + d[:, None, :, None, 1] + d[:, None, None, :, 2])
+                inside = (ok[:, :, None, None, 0] & ok[:, None, :, None, 1] & ok[:, None, None, :, 2]
+                          & (d2 <= r * r))
+                flat = self._flat(ii[:, :, None, None, 0], ii[:, None, :, None, 1], ii[:, None, None, :, 2])
+                # Kelompokkan per query tanpa loop Python: urutkan (query, indeks)
+                row = np.nonzero(inside)[0]
+                vals = flat[inside]
+                order = np.lexsort((vals, row))
+                cuts = np.searchsorted(row[order], np.arange(1, len(qb)))
+                results.extend(np.split(vals[order], cuts))
+
+        return results[0] if single else results
+
+
+class KDTree:
+    """
+    KD-tree seimbang dalam bentuk array numpy.
+
+    Node disusun seperti heap (root = 1, anak = 2i dan 2i+1). Setiap level
+    membagi segmen titik di median sumbu dengan sebaran terbesar, sehingga
+    semua daun memuat paling banyak leafsize titik. Query k-NN dan radius
+    diproses per level untuk satu batch query sekaligus: pasangan
+    (query, node) yang bounding box-nya terlalu jauh langsung dibuang.
+    """
+
+    def __init__(self, points, leafsize=32):
+        self.points = np.asarray(points, dtype=float)
+        if self.points.ndim != 2 or self.points.shape[1] != 3:
+            raise ValueError("points harus array shape (N,3)")
+        n = self.n = self.points.shape[0]
+        self.leafsize = max(int(leafsize), 1)
+        self.depth = max(0, math.ceil(math.log2(n / self.leafsize))) if n > self.leafsize else 0
+        n_nodes = 2 ** (self.depth + 1)
+
+        self.split_dim = np.zeros(n_nodes, dtype=np.int64)
+        self.split_val = np.zeros(n_nodes)
+        perm = np.arange(n)
+        pts = self.points.copy()
+        bounds = np.array([0, n], dtype=np.int64)
+
+        for level in range(self.depth):
+            nodes = 2 ** level
+            starts, sizes = bounds[:-1], np.diff(bounds)
+            seg_lo = np.minimum.reduceat(pts, starts, axis=0)
+            spread = np.maximum.reduceat(pts, starts, axis=0) - seg_lo
+            dim = np.argmax(spread, axis=1)
+
+            # Urutkan titik di dalam tiap segmen menurut sumbu pembaginya.
+            # Kunci gabungan: 2*segmen + posisi relatif [0, 1] di segmen itu
+            # (satu argsort float, jauh lebih cepat dari lexsort dua kunci).
+            seg = np.repeat(np.arange(nodes), sizes)
+            rows = np.arange(nodes)
+            width = np.where(spread[rows, dim] > 0, spread[rows, dim], 1.0)
+            key = pts[np.arange(n), dim[seg]]
+            order = np.argsort(2.0 * seg + (key - seg_lo[rows, dim][seg]) / width[seg])
+            perm = perm[order]
+            pts = pts[order]
+            key = key[order]
+
+            mids = starts + sizes // 2
+            node_ids = nodes + rows
+            self.split_dim[node_ids] = dim
+            self.split_val[node_ids] = key[mids]
+            bounds = np.empty(2 * nodes + 1, dtype=np.int64)
+            bounds[0:-1:2] = starts
+            bounds[1::2] = mids
+            bounds[-1] = n
+
+        # Data daun dengan padding (titik pad = inf, indeks pad = n)
+        n_leaves = 2 ** self.depth
+        sizes = np.diff(bounds)
+        width = max(int(sizes.max()), 1)
+        slot = np.arange(width)
+        valid = slot[None, :] < sizes[:, None]
+        self.leaf_idx = np.full((n_leaves, width), n, dtype=np.int64)
+        self.leaf_idx[valid] = perm
+        self.leaf_pts = np.full((n_leaves, width, 3), np.inf)
+        self.leaf_pts[valid] = pts
+
+        # Bounding box setiap node, dari daun ke atas
+        self.box_lo = np.full((n_nodes, 3), np.inf)
+        self.box_hi = np.full((n_nodes, 3), -np.inf)
+        if n > 0:
+            pts = self.leaf_pts
+            self.box_lo[n_leaves:] = np.where(valid[:, :, None], pts, np.inf).min(axis=1)
+            self.box_hi[n_leaves:] = np.where(valid[:, :, None], pts, -np.inf).max(axis=1)
+        for level in range(self.depth - 1, -1, -1):
+            ids = np.arange(2 ** level, 2 ** (level + 1))
+            self.box_lo[ids] = np.minimum(self.box_lo[2 * ids], self.box_lo[2 * ids + 1])
+            self.box_hi[ids] = np.maximum(self.box_hi[2 * ids], self.box_hi[2 * ids + 1])
+
+    def _leaf_of(self, q):
+        """Daun tempat setiap query berada (turun mengikuti bidang pembagi)."""
+        node = np.ones(len(q), dtype=np.int64)
+        for _ in range(self.depth):
+            go_right = q[np.arange(len(q)), self.split_dim[node]] >= self.split_val[node]
+            node = 2 * node + go_right
+        return node - 2 ** self.depth
+
+    def _candidates(self, q, bound2):
+        """
+        Semua pasangan (query, daun) yang bounding box-nya berjarak^2 <= bound2[query].
+        Mengembalikan (qid, d2, idx) untuk titik-titik di daun tersebut yang lolos bound.
+        """
+        qid = np.arange(len(q))
+        node = np.ones(len(q), dtype=np.int64)
+        for level in range(self.depth + 1):
+            gap = np.maximum(self.box_lo[node] - q[qid], 0) + np.maximum(q[qid] - self.box_hi[node], 0)
+            keep = (gap * gap).sum(axis=1) <= bound2[qid]
+            qid, node = qid[keep], node[keep]
+            if level < self.depth:
+                qid = np.repeat(qid, 2)
+                node = (2 * node[:, None] + np.array([0, 1])).ravel()
+
+        leaf = node - 2 ** self.depth
+        d2 = ((self.leaf_pts[leaf] - q[qid, None, :]) ** 2).sum(axis=2)
+        idx = self.leaf_idx[leaf]
+        qid = np.broadcast_to(qid[:, None], d2.shape)
+        ok = d2 <= bound2[qid]
+        return qid[ok], d2[ok], idx[ok]
+
+    def query(self, q, k=1):
+        """k titik terdekat untuk setiap query (lihat docstring modul)."""
+        q, single = _as_queries(q)
+        k = int(k)
+        dist = np.full((len(q), k), np.inf)
+        idx = np.full((len(q), k), self.n, dtype=np.int64)
+        if self.n == 0:
+            return _finish_query(dist, idx, k, single)
+
+        for s in range(0, len(q), _QUERY_BATCH):
+            qb = q[s:s + _QUERY_BATCH]
+
+            # Batas awal: jarak ke-k di daun query sendiri (inf jika daun < k titik)
+            leaf_d2 = ((self.leaf_pts[self._leaf_of(qb)] - qb[:, None, :]) ** 2).sum(axis=2)
+            if leaf_d2.shape[1] >= k:
+                bound2 = np.partition(leaf_d2, k - 1, axis=1)[:, k - 1]
+            else:
+                bound2 = np.full(len(qb), np.inf)
+
+            qid, d2, cand = self._candidates(qb, bound2)
+
+            # Ambil k terkecil per query: urutkan menurut (query, jarak)
+            order = np.lexsort((cand, d2, qid))
+            qid, d2, cand = qid[order], d2[order], cand[order]
+            first = np.searchsorted(qid, np.arange(len(qb)))
+            rank = np.arange(len(qid)) - first[qid]
+            sel = rank < k
+            dist[s + qid[sel], rank[sel]] = np.sqrt(d2[sel])
+            idx[s + qid[sel], rank[sel]] = cand[sel]
+
+        return _finish_query(dist, idx, k, single)
+
+    def query_radius(self, q, r):
+        """Indeks semua titik dengan jarak <= r dari setiap query."""
+        q, single = _as_queries(q)
+        results = []
+        for s in range(0, len(q), _QUERY_BATCH):
+            qb = q[s:s + _QUERY_BATCH]
+            qid, _, cand = self._candidates(qb, np.full(len(qb), float(r) ** 2))
+            order = np.lexsort((cand, qid))
+            qid, cand = qid[order], cand[order]
+            cuts = np.searchsorted(qid, np.arange(1, len(qb)))
+            results.extend(np.split(cand, cuts))
+        return results[0] if single else results
@@ -0,0 +1,81 @@
+# test_regression.py
+#
+# Uji regresi kecil untuk jalur yang hasilnya harus sama persis dengan
+# implementasi acuan sederhana. Jalankan dari folder ini: python -m pytest -q
+
+import numpy as np
+import pytest
+
+from crs import UTMToWGS84, WGS84ToUTM
+from generator import PointGenerator, _RANDOM_BLOCK
+from polygon import Polygon
+from quasirandom import Halton, Sobol
+from shard import ShardedDataset, run_shards
+from spatial import KDTree
+
+
+def _ray_casting(rings, points):
+    """Acuan point-in-polygon: ray casting even-odd per titik."""
+    inside = np.zeros(len(points), dtype=bool)
+    for i, (x, y) in enumerate(points[:, :2]):
+        for ring in rings:
+            for (x1, y1), (x2, y2) in zip(ring, np.roll(ring, -1, axis=0)):
+                if (y1 > y) != (y2 > y) and x < x1 + (y - y1) * (x2 - x1) / (y2 - y1):
+                    inside[i] = not inside[i]
+    return inside
+
+
+def test_kdtree_matches_brute_force():
+    rng = np.random.default_rng(0)
+    points = rng.random((5000, 3))
+    queries = rng.random((300, 3)) * 1.2 - 0.1
+    dist, idx = KDTree(points, leafsize=16).query(queries, k=5)
+
+    d_all = np.linalg.norm(queries[:, None, :] - points[None, :, :], axis=2)
+    expected = np.sort(d_all, axis=1)[:, :5]
+    np.testing.assert_allclose(dist, expected, rtol=0, atol=1e-12)
+    np.testing.assert_allclose(np.take_along_axis(d_all, idx, axis=1), expected, rtol=0, atol=1e-12)
+
+
+def test_polygon_contains_matches_ray_casting():
+    # Bentuk L cekung dengan lubang segitiga (aturan even-odd)
+    outer = np.array([[0, 0], [10, 0], [10, 4], [4, 4], [4, 10], [0, 10]], dtype=float)
+    hole = np.array([[1, 1], [3, 1], [2, 3]], dtype=float)
+    poly = Polygon([outer, hole])
+    points = np.random.default_rng(1).random((4000, 2)) * 12 - 1
+
+    np.testing.assert_array_equal(poly.contains(points), _ray_casting([outer, hole], points))
+
+
+@pytest.mark.parametrize("cls", [Sobol, Halton])
+def test_quasirandom_blocks_concatenate(cls):
+    seq = cls(dim=3, scramble=True, rng=np.random.default_rng(2))
+    whole = seq.block(0, 3000)
+    cuts = [0, 1, 7, 1024, 1025, 2999, 3000]
+    parts = [seq.block(a, b) for a, b in zip(cuts[:-1], cuts[1:])]
+    np.testing.assert_array_equal(np.concatenate(parts), whole)
+
+
+@pytest.mark.parametrize("zone", ["49S", "31N"])
+def test_utm_round_trip(zone):
+    rng = np.random.default_rng(3)
+    lon0 = 6.0 * int(zone[:-1]) - 183.0
+    lonlat = np.column_stack((lon0 + rng.uniform(-3, 3, 1000),
+                              rng.uniform(-80, 0, 1000) if zone.endswith("S") else rng.uniform(0, 84, 1000),
+                              rng.uniform(0, 100, 1000)))
+    utm = WGS84ToUTM(zone).apply(lonlat.copy())
+    back = UTMToWGS84(zone).apply(utm.copy())
+    np.testing.assert_allclose(back, lonlat, rtol=0, atol=1e-9)
+
+
+@pytest.mark.parametrize("mode", ["random", "sobol", "grid"])
+def test_shards_concatenate_to_generate(mode, tmp_path):
+    num_points = 3 * _RANDOM_BLOCK + 1234 if mode == "random" else 5000
+    gen = PointGenerator(0, 100, 0, 50, 0, 10, num_points=num_points, mode=mode, spacing=5.0, seed=4)
+    expected = np.asarray(gen.generate())
+
+    parts = [np.concatenate(list(gen.iter_shard_chunks(i, 3))) for i in range(3)]
+    np.testing.assert_array_equal(np.concatenate(parts), expected)
+
+    run_shards(gen, 3, str(tmp_path), processes=1)
+    np.testing.assert_array_equal(np.asarray(ShardedDataset(str(tmp_path))), expected)
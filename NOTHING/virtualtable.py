@@ -0,0 +1,123 @@
+# virtualtable.py
+
+import tkinter as tk
+from tkinter import ttk
+
+
+class VirtualTable:
+    """
+    Tabel (ttk.Treeview) virtual untuk hasil koordinat berukuran besar.
+
+    Treeview hanya berisi `height` baris tetap; saat di-scroll, isi baris
+    tersebut diganti dari array numpy (points) dan label mulai dari indeks
+    self.top. Biaya update GUI konstan berapa pun jumlah titiknya.
+    """
+
+    def __init__(self, master, columns=("Label", "X", "Y", "Z"), height=10, decimals=2):
+        self.columns = columns
+        self.height = int(height)
+        self.decimals = decimals
+
+        # Data yang ditampilkan (tidak disalin)
+        self.points = None
+        self.labels = None
+        self.top = 0
+
+        self.frame = tk.Frame(master)
+        self.tree = ttk.Treeview(self.frame, columns=columns, show='headings', height=self.height)
+        for col in columns:
+            self.tree.heading(col, text=col)
+            self.tree.column(col, width=100, anchor='center')
+
+        self.scrollbar = ttk.Scrollbar(self.frame, orient="vertical", command=self._on_scrollbar)
+        self.tree.grid(row=0, column=0, sticky="nsew")
+        self.scrollbar.grid(row=0, column=1, sticky="ns")
+        self.frame.grid_rowconfigure(0, weight=1)
+        self.frame.grid_columnconfigure(0, weight=1)
+
+        # Baris tetap: iid "0".."height-1", isinya diganti saat scroll
+        for i in range(self.height):
+            self.tree.insert("", "end", iid=str(i), values=())
+
+        # Scroll dengan mouse wheel (Windows/macOS dan X11) serta keyboard
+        self.tree.bind("<MouseWheel>", self._on_mousewheel)
+        self.tree.bind("<Button-4>", lambda e: self.scroll(-3))
+        self.tree.bind("<Button-5>", lambda e: self.scroll(3))
+        self.tree.bind("<Prior>", lambda e: self.scroll(-self.height))
+        self.tree.bind("<Next>", lambda e: self.scroll(self.height))
+
+        self._refresh()
+
+    def pack(self, **kwargs):
+        self.frame.pack(**kwargs)
+
+    def __len__(self):
+        return 0 if self.points is None else len(self.points)
+
+    def set_data(self, points, labels):
+        """Mengganti data tabel (array N x 3 dan label) lalu kembali ke baris pertama."""
+        self.points = points
+        self.labels = labels
+        self.top = 0
+        self._refresh()
+
+    def clear(self):
+        """Mengosongkan tabel; hanya `height` baris yang dikosongkan."""
+        self.points = None
+        self.labels = None
+        self.top = 0
+        self._refresh()
+
+    def scroll(self, rows):
+        """Menggeser jendela tampilan sejauh rows baris (negatif = ke atas)."""
+        self.scroll_to(self.top + int(rows))
+        return "break"
+
+    def scroll_to(self, index):
+        """Menjadikan baris ke-index sebagai baris teratas yang terlihat."""
+        max_top = max(len(self) - self.height, 0)
+        self.top = min(max(int(index), 0), max_top)
+        self._refresh()
+
+    def selected_index(self):
+        """Indeks data dari baris yang sedang dipilih, atau None."""
+        focus = self.tree.focus()
+        if focus == "":
+            return None
+        index = self.top + int(focus)
+        return index if index < len(self) else None
+
+    def _refresh(self):
+        """Mengisi ulang baris yang terlihat dari data mulai self.top."""
+        n = len(self)
+        stop = min(self.top + self.height, n)
+        if stop > self.top:
+            block = self.points[self.top:stop]
+            labels = self.labels[self.top:stop]
+            rows = [
+                (label, *(round(float(v), self.decimals) for v in p))
+                for label, p in zip(labels, block)
+            ]
+        else:
+            rows = []
+
+        for i in range(self.height):
+            self.tree.item(str(i), values=rows[i] if i < len(rows) else ())
+
+        if n > 0:
+            self.scrollbar.set(self.top / n, stop / n)
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def _on_scrollbar(self, *args):
+        """Callback ttk.Scrollbar: ('moveto', fraksi) atau ('scroll', n, 'units'/'pages')."""
+        if args[0] == "moveto":
+            self.scroll_to(round(float(args[1]) * len(self)))
+        elif args[0] == "scroll":
+            step = int(args[1])
+            if args[2] == "pages":
+                step *= self.height
+            self.scroll(step)
+
+    def _on_mousewheel(self, event):
+        return self.scroll(-3 if event.delta > 0 else 3)
@@ -0,0 +1,214 @@
+import numpy as np
+import matplotlib.pyplot as plt
+from mpl_toolkits.mplot3d import Axes3D  # memastikan mode 3D aktif
+import pandas as pd
+
+import instrument
+from gridpoints import GridPoints
+from quantized import QuantizedPoints
+from labels import PointLabels
+
+class PointVisualizer:
+    """
+    Menampilkan plot 3D dari kumpulan koordinat.
+
+    Untuk awan titik besar, show_3d() lebih dulu melakukan decimation
+    (level-of-detail) sehingga jumlah titik yang digambar paling banyak
+    max_points. Label hanya digambar jika jumlah titik tampil <= label_threshold,
+    atau untuk subset titik yang dipilih (label_indices).
+    """
+
+    def __init__(self, points, labels=None, max_points=20_000, label_threshold=200,
+                 lod_method='voxel'):
+        """
+        points: numpy array (N,3) float64/float32, GridPoints, QuantizedPoints,
+                atau pandas DataFrame dengan kolom X,Y,Z
+        labels: optional list of strings atau PointLabels
+        max_points: batas jumlah titik yang digambar
+        label_threshold: label digambar hanya jika titik tampil <= nilai ini
+        lod_method: 'voxel' (satu titik per sel voxel) atau 'random' (sampling bertingkat)
+        """
+        # Normalisasi points menjadi numpy array Nx3
+        if isinstance(points, pd.DataFrame):
+            if set(["X","Y","Z"]).issubset(points.columns):
+                self.points = points[["X","Y","Z"]].values
+            else:
+                raise ValueError("DataFrame harus memiliki kolom X,Y,Z")
+        elif isinstance(points, (GridPoints, QuantizedPoints)):
+            # Grid analitik / kode int32 dipakai apa adanya: hanya titik tampil yang dihitung
+            self.points = points
+        else:
+            # float32 tetap float32 (tanpa salinan float64)
+            self.points = np.asarray(points)
+            if not np.issubdtype(self.points.dtype, np.floating):
+                self.points = self.points.astype(float)
+
+        if self.points.ndim != 2 or self.points.shape[1] != 3:
+            raise ValueError("points harus array shape (N,3) atau DataFrame dengan kolom X,Y,Z")
+
+        self.labels = PointLabels.coerce(labels, self.points.shape[0])
+
+        self.max_points = int(max_points)
+        self.label_threshold = int(label_threshold)
+        self.lod_method = lod_method
+
+        # Cache hasil decimation per tampilan: (max_points, method, bounds) -> indeks
+        self._lod_cache = {}
+
+    def decimate(self, max_points=None, method=None, bounds=None):
+        """
+        Memilih paling banyak max_points indeks titik untuk digambar.
+
+        - method 'voxel': ruang dibagi menjadi ~max_points sel voxel, diambil
+          satu titik (indeks terkecil) per sel yang terisi
+        - method 'random': indeks dibagi menjadi max_points strata sama besar,
+          diambil satu titik acak per strata (seed tetap)
+        - GridPoints: selalu subgrid dengan langkah seragam (tanpa membaca titik)
+        - bounds: opsional ((xmin, xmax), (ymin, ymax), (zmin, zmax)) untuk zoom
+
+        Hasil (array indeks terurut) di-cache per tampilan.
+        """
+        max_points = self.max_points if max_points is None else int(max_points)
+        method = self.lod_method if method is None else method
+        if bounds is not None:
+            bounds = tuple(tuple(float(v) for v in b) for b in bounds)
+
+        key = (max_points, method, bounds)
+        if key not in self._lod_cache and isinstance(self.points, GridPoints):
+            self._lod_cache[key] = self.points.subsample_indices(max_points, bounds)
+        if key not in self._lod_cache:
+            # idx None berarti semua titik (tanpa membuat array indeks sebesar N)
+            idx = self._points_in_bounds(bounds)
+            count = self.points.shape[0] if idx is None else len(idx)
+            if count <= max_points:
+                idx = np.arange(count) if idx is None else idx
+            elif method == 'voxel':
+                idx = self._voxel_indices(idx, max_points)
+            elif method == 'random':
+                idx = self._stratified_indices(count, max_points)
+                idx = idx if bounds is None else self._points_in_bounds(bounds)[idx]
+            else:
+                raise ValueError("lod_method harus 'voxel' atau 'random'")
+            self._lod_cache[key] = idx
+        return self._lod_cache[key]
+
+    def _iter_subset(self, idx, chunk=1_000_000):
+        """Menghasilkan (indeks, blok titik) per chunk; idx None = semua titik."""
+        if idx is None:
+            for start in range(0, self.points.shape[0], chunk):
+                block = self.points[start:start + chunk]
+                yield np.arange(start, start + block.shape[0]), block
+        else:
+            for start in range(0, len(idx), chunk):
+                sub = idx[start:start + chunk]
+                yield sub, self.points[sub]
+
+    def _points_in_bounds(self, bounds):
+        """Indeks titik di dalam bounds, atau None (semua titik) jika bounds None."""
+        if bounds is None:
+            return None
+        lo = np.array([b[0] for b in bounds])
+        hi = np.array([b[1] for b in bounds])
+        parts = [np.arange(0)]
+        for sub, block in self._iter_subset(None):
+            inside = np.all((block >= lo) & (block <= hi), axis=1)
+            parts.append(sub[inside])
+        return np.concatenate(parts)
+
+    def _voxel_indices(self, idx, max_points):
+        """Satu titik per sel voxel; ukuran voxel dipilih agar jumlah sel ~ max_points."""
+        lo = np.full(3, np.inf)
+        hi = np.full(3, -np.inf)
+        for _, block in self._iter_subset(idx):
+            lo = np.minimum(lo, block.min(axis=0))
+            hi = np.maximum(hi, block.max(axis=0))
+
+        # Ukuran voxel dari volume (atau luas/panjang untuk sumbu yang datar)
+        extent = hi - lo
+        active = extent > 0
+        voxel = (np.prod(extent[active]) / max_points) ** (1.0 / max(active.sum(), 1))
+        cells = np.where(active, np.floor(extent / voxel).astype(np.int64) + 1, 1)
+
+        keys_all, first_all = [], []
+        for sub, block in self._iter_subset(idx):
+            cell = np.minimum(((block - lo) / voxel).astype(np.int64), cells - 1)
+            keys = (cell[:, 0] * cells[1] + cell[:, 1]) * cells[2] + cell[:, 2]
+            keys, first = np.unique(keys, return_index=True)
+            keys_all.append(keys)
+            first_all.append(sub[first])
+
+        # Gabungkan antar chunk: chunk awal didahulukan (indeks terkecil per sel)
+        _, first = np.unique(np.concatenate(keys_all), return_index=True)
+        chosen = np.sort(np.concatenate(first_all)[first])
+
+        # Pembulatan jumlah sel bisa sedikit melebihi max_points
+        if len(chosen) > max_points:
+            chosen = chosen[self._stratified_indices(len(chosen), max_points)]
+        return chosen
+
+    @staticmethod
+    def _stratified_indices(count, max_points):
+        """
+        Satu posisi acak per strata: 0..count-1 dibagi menjadi max_points
+        strata sama besar (seed tetap, hasil terurut tanpa duplikat).
+        """
+        rng = np.random.default_rng(0)
+        edges = np.linspace(0, count, max_points + 1)
+        pick = np.floor(edges[:-1] + rng.random(max_points) * np.diff(edges)).astype(np.int64)
+        return np.unique(np.minimum(pick, count - 1))
+
+    def show_3d(self, max_points=None, method=None, bounds=None, label_indices=None):
+        """
+        Menampilkan scatter plot 3D dengan label per titik.
+
+        Titik di-decimate menjadi paling banyak max_points (lihat decimate()).
+        label_indices: opsional indeks titik yang labelnya tetap digambar.
+        """
+        with instrument.span("show_3d.decimate") as sp:
+            idx = self.decimate(max_points, method, bounds)
+            shown = self.points[idx]
+            sp.set(points=len(idx))
+
+        # plt.show() menunggu jendela ditutup, jadi tidak ikut diukur
+        with instrument.span("show_3d.draw"):
+            fig = plt.figure()
+            ax = fig.add_subplot(111, projection='3d')
+
+            # Pisahkan komponen koordinat
+            xs, ys, zs = shown[:, 0], shown[:, 1], shown[:, 2]
+
+            # Plot titik (marker diperkecil untuk awan titik yang padat)
+            size = 30 if len(idx) <= 1000 else 4
+            ax.scatter(xs, ys, zs, c='royalblue', s=size, depthshade=True)
+
+            # Tambahkan label nama titik (P1, P2, P3, ...)
+            if label_indices is None:
+                label_indices = idx if len(idx) <= self.label_threshold else []
+            for i in np.asarray(label_indices, dtype=np.int64):
+                x, y, z = self.points[i]
+                ax.text(x, y, z, self.labels[int(i)], fontsize=8, color='darkred')
+
+            # Label sumbu
+            ax.set_xlabel("X")
+            ax.set_ylabel("Y")
+            ax.set_zlabel("Z")
+
+            ax.set_title("Scatter Plot 3D - Koordinat Titik")
+            plt.tight_layout()
+        plt.show()
+
+    def save_3d(self, filename, max_points=None, label_indices=None):
+        """
+        Menyimpan scatter plot 3D ke file gambar (PNG/PDF) tanpa layar,
+        memakai renderer.HeadlessRenderer (backend Agg).
+        """
+        from renderer import HeadlessRenderer
+
+        renderer = HeadlessRenderer(
+            dims=3,
+            max_points=self.max_points if max_points is None else max_points,
+            label_threshold=self.label_threshold,
+            lod_method=self.lod_method,
+        )
+        return renderer.render(self.points, filename, labels=self.labels,
+                               label_indices=label_indices)
@@ -0,0 +1,97 @@
+# worker.py
+
+import queue
+import threading
+
+
+class JobCancelled(Exception):
+    """Dilempar dari callback progress saat pekerjaan dibatalkan pengguna."""
+
+
+class BackgroundJob:
+    """
+    Menjalankan satu pekerjaan berat (generate / ekspor) di thread latar.
+
+    Thread pekerja tidak pernah menyentuh widget Tk; ia hanya mengirim pesan
+    ke antrian. Thread GUI membaca antrian tersebut lewat root.after(),
+    lalu memanggil on_progress / on_done / on_error / on_cancel.
+
+    func dipanggil sebagai func(progress), dengan progress(selesai, total)
+    yang harus dipanggil per chunk; progress melempar JobCancelled jika
+    cancel() sudah diminta.
+    """
+
+    def __init__(self, root, func, on_done, on_error=None, on_progress=None,
+                 on_cancel=None, poll_ms=100):
+        self.root = root
+        self.func = func
+        self.on_done = on_done
+        self.on_error = on_error
+        self.on_progress = on_progress
+        self.on_cancel = on_cancel
+        self.poll_ms = poll_ms
+
+        self._messages = queue.Queue()
+        self._cancel = threading.Event()
+        self._thread = None
+        self.running = False
+
+    def start(self):
+        """Memulai thread pekerja dan polling antrian di thread GUI."""
+        if self.running:
+            raise RuntimeError("Pekerjaan sudah berjalan")
+        self.running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        self.root.after(self.poll_ms, self._poll)
+
+    def cancel(self):
+        """Meminta pekerjaan berhenti pada chunk berikutnya."""
+        self._cancel.set()
+
+    def _progress(self, done, total):
+        """Dipanggil dari thread pekerja setiap chunk selesai."""
+        if self._cancel.is_set():
+            raise JobCancelled()
+        self._messages.put(("progress", (done, total)))
+
+    def _run(self):
+        try:
+            result = self.func(self._progress)
+        except JobCancelled:
+            self._messages.put(("cancelled", None))
+        except Exception as e:
+            self._messages.put(("error", e))
+        else:
+            self._messages.put(("done", result))
+
+    def _poll(self):
+        """Membaca pesan dari thread pekerja (berjalan di thread GUI)."""
+        last_progress = None
+        finished = None
+        try:
+            while True:
+                kind, payload = self._messages.get_nowait()
+                if kind == "progress":
+                    last_progress = payload
+                else:
+                    finished = (kind, payload)
+        except queue.Empty:
+            pass
+
+        # Hanya progress terakhir yang perlu digambar
+        if last_progress is not None and self.on_progress is not None:
+            self.on_progress(*last_progress)
+
+        if finished is None:
+            self.root.after(self.poll_ms, self._poll)
+            return
+
+        self.running = False
+        kind, payload = finished
+        if kind == "done":
+            self.on_done(payload)
+        elif kind == "error" and self.on_error is not None:
+            self.on_error(payload)
+        elif kind == "cancelled" and self.on_cancel is not None:
+            self.on_cancel()